@@ -0,0 +1,410 @@
+# ace_tools.py
+
+"""
+Validation of ACER output files and generation of an MCNP xsdir.
+
+Each ACE file is memory-mapped and only its header is decoded: the
+ZAID, AWR, kT and comment lines, and the NXS and JXS arrays (both the
+legacy type-1 header and the 2.0.x header). The XSS array is never
+parsed; its length is only checked against NXS(1) through the file
+size, which catches truncated files. Files are scanned on a thread
+pool, so thousands of tables take seconds even on network storage.
+
+With a workflow, every table is checked against the ACER modules that
+should have produced it: ZA from matd, the ZAID suffix from suff and
+kT from tempd. The xsdir lists one table per ZAID, with paths relative
+to the xsdir (or to --datapath).
+
+Usage:
+    python ace_tools.py results/ -w workflow.jsonl -o results/xsdir -j 16
+    python ace_tools.py results/ -w workflow.jsonl --isotopes U235 Pu239 --temperatures 293.6 600
+"""
+
+import argparse
+import math
+import mmap
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from batch import apply_case, is_temperature, read_list_file
+from fileio import atomic_open
+from model import load_isotope_table
+from renderer import fan_out_materials, material_numbers
+from tracing import span
+from workflow import load_workflow
+
+# Boltzmann constant in MeV/K: ACE headers give the temperature as kT
+BOLTZMANN_MEV = 8.617333262e-11
+# kT is printed with five significant digits
+KT_TOLERANCE = 1e-3
+
+# Class letter of the ZAID for each ACER run type (iopt) we can check;
+# thermal (2) tables are named after the moderator, not matd
+ZAID_CLASSES = {"1": "c", "3": "y", "4": "p", "5": "u"}
+
+HEADER_LINES = 12
+XSS_FIELD_WIDTH = 20
+XSS_PER_LINE = 4
+XSS_LINE_BYTES = XSS_FIELD_WIDTH * XSS_PER_LINE + 1
+
+VERSION_RE = re.compile(r"^\d+\.\d+\.\d+$")
+ZAID_RE = re.compile(r"^(\w+)\.(\d+)([a-z]*)$")
+# Names the scan of a directory never opens
+SKIPPED_SUFFIXES = (".json", ".jsonl", ".gz", ".njoy", ".idx.json")
+SKIPPED_NAMES = ("input", "output", "stdout", "xsdir")
+
+
+class AceFormatError(ValueError):
+    """Raised when a file does not start with an ACE header."""
+
+
+def split_zaid(zaid):
+    """Return (ZA or None, suffix value, class letters) of a ZAID such as '92235.80c'."""
+    match = ZAID_RE.match(zaid)
+    if match is None:
+        return None, None, ""
+    name, digits, letters = match.groups()
+    za = int(name) if name.isdigit() else None
+    return za, float("0." + digits), letters
+
+
+def header_lines(mm, count, offset=0):
+    """Return the next count lines from offset and the offset after them."""
+    lines = []
+    for _ in range(count):
+        end = mm.find(b"\n", offset)
+        if end < 0:
+            raise AceFormatError("header ends early")
+        lines.append(mm[offset:end].decode("ascii", "replace").rstrip("\r"))
+        offset = end + 1
+    return lines, offset
+
+
+def int_fields(lines):
+    """Return the 9-column integers of NXS/JXS lines (8i9)."""
+    return [int(line[i:i + 9]) for line in lines for i in range(0, 72, 9)]
+
+
+def read_ace_header(filepath):
+    """
+    Return the header of an ACE file as a dict.
+
+    Keys: path, zaid, awr, kt, temperature (K), date, comment, mat,
+    version, nxs, jxs, complete. Only the first table of a file is read.
+    """
+    with open(filepath, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            raise AceFormatError("empty file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            (first, second), offset = header_lines(mm, 2)
+            tokens = first.split()
+            version = None
+            if tokens and VERSION_RE.match(tokens[0]):
+                # 2.0.x: VERS SZAID SOURCE / AWR kT DATE N / N comment lines
+                version = tokens[0]
+                values = second.split()
+                try:
+                    count = int(values[3])
+                except (IndexError, ValueError):
+                    raise AceFormatError("malformed 2.0 header")
+                comments, offset = header_lines(mm, count, offset)
+                if len(comments) >= 2 and ZAID_RE.match((comments[0].split() or [""])[0]):
+                    # NJOY repeats the legacy header lines as the comments
+                    first, second = comments[:2]
+                else:
+                    first = " ".join([tokens[1]] + values[:3])
+                    second = comments[0] if comments else ""
+                tokens = first.split()
+            try:
+                zaid = tokens[0]
+                awr = float(tokens[1])
+                kt = float(tokens[2])
+            except (IndexError, ValueError):
+                raise AceFormatError("not an ACE header")
+            if ZAID_RE.match(zaid) is None:
+                raise AceFormatError(f"bad ZAID '{zaid}'")
+            arrays, offset = header_lines(mm, HEADER_LINES - 2, offset)
+            try:
+                nxs = int_fields(arrays[4:6])
+                jxs = int_fields(arrays[6:10])
+            except ValueError:
+                raise AceFormatError("malformed NXS/JXS arrays")
+    # XSS is written four 20-column numbers to a line (4e20.11); the last
+    # line is short unless NXS(1) is a multiple of four
+    full_lines, rest = divmod(nxs[0], XSS_PER_LINE)
+    xss_bytes = full_lines * XSS_LINE_BYTES + (rest * XSS_FIELD_WIDTH + 1 if rest else 0)
+    return {
+        "path": filepath,
+        "zaid": zaid,
+        "awr": awr,
+        "kt": kt,
+        "temperature": kt / BOLTZMANN_MEV,
+        "date": tokens[3] if len(tokens) > 3 else "",
+        "comment": second[:70].strip(),
+        "mat": second[70:].strip(),
+        "version": version,
+        "nxs": nxs,
+        "jxs": jxs,
+        # Less one byte: the final newline may be missing
+        "complete": size >= offset + xss_bytes - 1,
+    }
+
+
+def scan_one(filepath):
+    """Read one header on a worker; returns (path, header, error)."""
+    try:
+        return filepath, read_ace_header(filepath), None
+    except (OSError, ValueError) as e:
+        return filepath, None, str(e)
+
+
+def iter_ace_paths(paths):
+    """Yield the given files and, recursively, the candidate files of the given directories."""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name in SKIPPED_NAMES or name.endswith(SKIPPED_SUFFIXES):
+                    continue
+                yield os.path.join(root, name)
+
+
+def scan_ace_files(paths, processes=None, progress=None):
+    """
+    Read the headers of the ACE files under paths on a thread pool.
+
+    Returns (tables, errors): header dicts in path order and (path,
+    message) for explicitly named files that are not ACE. Files found by
+    walking a directory that are not ACE are skipped silently.
+    """
+    explicit = {path for path in paths if not os.path.isdir(path)}
+    filepaths = list(iter_ace_paths(paths))
+    tables = []
+    errors = []
+    with span("scan_ace_files", "io"), ThreadPoolExecutor(max_workers=processes) as pool:
+        for done, (filepath, header, error) in enumerate(pool.map(scan_one, filepaths), 1):
+            if header is not None:
+                tables.append(header)
+            elif filepath in explicit:
+                errors.append((filepath, error))
+            if progress is not None:
+                progress(done, len(filepaths))
+    return tables, errors
+
+
+def expected_zaid(za, suffix, zaid_class):
+    if suffix is None:
+        return f"{za}.*"
+    return f"{za}.{round(suffix * 100):02d}{zaid_class or ''}"
+
+
+def expected_tables(modules, isotopes):
+    """
+    Return what the ACER modules of a chain will write, one dict per table.
+
+    Keys: symbol, zas (accepted ZA values), suffix (None when suff < 0
+    keeps the old ZAID), zaid_class, temperature.
+    """
+    expected = []
+    for mod in fan_out_materials(modules):
+        if mod["name"] != "ACER":
+            continue
+        p = mod["parameters"]
+        zaid_class = ZAID_CLASSES.get(str(p.get("iopt", "1")))
+        if zaid_class is None:
+            continue
+        suff = p.get("suff", 0.0)
+        # Same truncation as the rendered card
+        suffix = int(suff * 100) / 100 if suff >= 0 else None
+        symbols, _ = material_numbers(isotopes, p.get("matd", "U235"))
+        for symbol in symbols:
+            za = isotopes.za(symbol)
+            if zaid_class == "p":
+                zas = (za // 1000 * 1000,)
+            else:
+                meta = isotopes.meta[isotopes.row(symbol)]
+                # NJOY keeps the ENDF ZA; MCNP names isomers ZA + 300 + 100*m
+                zas = (za, za + 300 + 100 * meta) if meta else (za,)
+            expected.append({"symbol": symbol, "zas": zas, "suffix": suffix,
+                             "zaid_class": zaid_class, "temperature": float(p.get("tempd", 300))})
+    return expected
+
+
+def same_temperature(kt, temperature):
+    expected = temperature * BOLTZMANN_MEV
+    return math.isclose(kt, expected, rel_tol=KT_TOLERANCE, abs_tol=1e-14)
+
+
+def validate_tables(tables, expected=None):
+    """
+    Check the tables against each other and, if given, against expected_tables().
+
+    Returns a list of (path or None, message).
+    """
+    problems = []
+    seen = {}
+    for table in tables:
+        if not table["complete"]:
+            problems.append((table["path"], f"shorter than NXS(1) = {table['nxs'][0]} words; "
+                                            "truncated?"))
+        other = seen.setdefault(table["zaid"], table)
+        if other is not table:
+            problems.append((table["path"], f"duplicate ZAID {table['zaid']} (also {other['path']})"))
+    if expected is None:
+        return problems
+
+    by_za = {}
+    for entry in expected:
+        for za in entry["zas"]:
+            by_za.setdefault(za, []).append(entry)
+    matched = set()
+    for table in tables:
+        za, suffix, letters = split_zaid(table["zaid"])
+        candidates = by_za.get(za, [])
+        if not candidates:
+            problems.append((table["path"], f"ZAID {table['zaid']} is not produced by the workflow"))
+            continue
+        candidates = [e for e in candidates
+                      if (e["suffix"] is None or abs(e["suffix"] - suffix) < 0.005)
+                      and letters.endswith(e["zaid_class"])]
+        if not candidates:
+            wanted = ", ".join(sorted({expected_zaid(za, e["suffix"], e["zaid_class"])
+                                       for e in by_za[za]}))
+            problems.append((table["path"], f"ZAID {table['zaid']} does not match the workflow "
+                                            f"suffix ({wanted})"))
+            continue
+        hits = [e for e in candidates if same_temperature(table["kt"], e["temperature"])]
+        if not hits:
+            wanted = ", ".join(f"{e['temperature']:g}" for e in candidates)
+            problems.append((table["path"], f"{table['zaid']} is at {table['temperature']:.1f} K "
+                                            f"(kT {table['kt']:.4E}); the workflow expects {wanted} K"))
+            continue
+        matched.update(id(e) for e in hits)
+    for entry in expected:
+        if id(entry) not in matched:
+            zaid = expected_zaid(entry["zas"][0], entry["suffix"], entry["zaid_class"])
+            problems.append((None, f"no ACE file for {entry['symbol']} at "
+                                   f"{entry['temperature']:g} K ({zaid})"))
+    return problems
+
+
+def xsdir_line(table, filename):
+    """The directory entry NJOY writes on its ndir unit, for a type-1 table."""
+    line = (f"{table['zaid']:>10} {table['awr']:12.6f} {filename} 0 1 1 "
+            f"{table['nxs'][0]:9d} 0 0 {table['kt']:10.4E}")
+    # JXS(23) locates the unresolved-range probability tables
+    if table["jxs"][22] != 0:
+        line += " ptable"
+    return line
+
+
+def xsdir_text(tables, xsdir_dir, datapath=None):
+    """Return a consolidated xsdir; the first table of each ZAID wins."""
+    base = datapath or xsdir_dir
+    entries = {}
+    for table in tables:
+        entries.setdefault(table["zaid"], table)
+    ordered = sorted(entries.values(), key=lambda t: (split_zaid(t["zaid"])[0] or 0, t["zaid"]))
+
+    lines = [f"datapath={datapath}"] if datapath else []
+    lines.append("atomic weight ratios")
+    awrs = {}
+    for table in ordered:
+        za = split_zaid(table["zaid"])[0]
+        if za is not None:
+            awrs.setdefault(za, table["awr"])
+    lines.extend(f"{za:>10} {awr:12.6f}" for za, awr in sorted(awrs.items()))
+    lines.append("directory")
+    for table in ordered:
+        try:
+            filename = os.path.relpath(os.path.abspath(table["path"]), os.path.abspath(base))
+        except ValueError:
+            # Another drive on Windows
+            filename = os.path.abspath(table["path"])
+        lines.append(xsdir_line(table, filename.replace(os.sep, "/")))
+    return "\n".join(lines) + "\n"
+
+
+def write_xsdir(filepath, tables, datapath=None):
+    with atomic_open(filepath) as f:
+        f.write(xsdir_text(tables, os.path.dirname(os.path.abspath(filepath)), datapath))
+
+
+def check_ace_files(paths, modules=None, isotopes=None, processes=None, progress=None):
+    """Scan paths and validate against a chain; returns (tables, problems)."""
+    tables, errors = scan_ace_files(paths, processes, progress)
+    expected = expected_tables(modules, isotopes) if modules is not None else None
+    return tables, errors + validate_tables(tables, expected)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate ACE files and write a consolidated xsdir.")
+    parser.add_argument("paths", nargs="+", help="ACE files or directories searched recursively")
+    parser.add_argument("-w", "--workflow", help="Workflow whose ACER modules produced the files")
+    parser.add_argument("--isotopes", nargs="*", default=[],
+                        help="Isotopes the workflow was run for (as in batch.py)")
+    parser.add_argument("--isotopes-file", help="File with whitespace-separated isotope symbols")
+    parser.add_argument("--temperatures", nargs="*", default=[], help="Temperatures in K (as in batch.py)")
+    parser.add_argument("--temperatures-file", help="File with whitespace-separated temperatures")
+    parser.add_argument("-o", "--output", help="xsdir file to write")
+    parser.add_argument("--datapath", help="Directory the xsdir paths are relative to")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of reader threads")
+    args = parser.parse_args(argv)
+
+    isotopes_arg = list(args.isotopes)
+    if args.isotopes_file:
+        isotopes_arg.extend(read_list_file(args.isotopes_file))
+    temperatures = list(args.temperatures)
+    if args.temperatures_file:
+        temperatures.extend(read_list_file(args.temperatures_file))
+    if bool(isotopes_arg) != bool(temperatures):
+        parser.error("--isotopes and --temperatures go together")
+    if isotopes_arg and not args.workflow:
+        parser.error("--isotopes and --temperatures need --workflow")
+    bad = [temperature for temperature in temperatures if not is_temperature(temperature)]
+    if bad:
+        parser.error("invalid temperatures: " + " ".join(bad))
+
+    isotopes = load_isotope_table()
+    expected = None
+    if args.workflow:
+        try:
+            modules = load_workflow(args.workflow)
+        except (OSError, ValueError) as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 1
+        if isotopes_arg:
+            cases = [apply_case(modules, isotope, temperature)
+                     for isotope in isotopes_arg for temperature in temperatures]
+        else:
+            cases = [modules]
+        try:
+            expected = [entry for case in cases for entry in expected_tables(case, isotopes)]
+        except LookupError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 1
+
+    tables, errors = scan_ace_files(args.paths, args.jobs)
+    problems = errors + validate_tables(tables, expected)
+    for path, message in problems:
+        print(f"{path}: {message}" if path else message)
+    print(f"Read {len(tables)} ACE tables; {len(problems)} problems")
+
+    if args.output:
+        try:
+            write_xsdir(args.output, tables, args.datapath)
+        except OSError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 1
+        print(f"Wrote {args.output}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+# batch.py
+
+"""
+Headless generation of NJOY input decks for isotope x temperature matrices.
+
+Usage:
+    python batch.py workflow.json -o decks --isotopes U235 U238 --temperatures 293.6 600 900
+
+With --multi-material every isotope goes into one deck per temperature,
+so RECONR and BROADR read the ENDF/PENDF tapes once for all of them.
+"""
+
+import argparse
+import math
+import os
+import sys
+from multiprocessing import Pool
+
+from chain import optimize_chain
+from model import isotope_parameters, load_isotope_table
+from renderer import RenderCache, RenderError
+from workflow import load_workflow
+
+# Temperature parameter driven by the temperature grid, per module
+TEMPERATURE_PARAMETERS = {
+    "BROADR": "temp2",
+    "PURR": "temp",
+    "UNRESR": "temp",
+    "ACER": "tempd",
+}
+
+# State shared by every worker, set once by init_worker
+_worker_state = {}
+
+
+def apply_case(modules, isotope, temperature):
+    """
+    Return a copy of the workflow with the material and temperature replaced.
+
+    Only the parameter dictionaries are copied; schemas are shared.
+    """
+    case_modules = []
+    for mod in modules:
+        parameters = dict(mod["parameters"])
+        for p_name in isotope_parameters(mod["name"]):
+            if p_name in parameters:
+                parameters[p_name] = isotope
+
+        temp_param = TEMPERATURE_PARAMETERS.get(mod["name"])
+        if temp_param:
+            if temp_param == "tempd":
+                parameters[temp_param] = float(temperature)
+            else:
+                parameters[temp_param] = str(temperature)
+
+        case_mod = dict(mod)
+        case_mod["parameters"] = parameters
+        case_modules.append(case_mod)
+    return case_modules
+
+
+def deck_filename(isotope, temperature):
+    if isinstance(isotope, list):
+        isotope = "multi"
+    return f"{isotope}_{temperature}K.njoy"
+
+
+def iter_cases(isotopes, temperatures, multi_material=False):
+    if multi_material:
+        # One case per temperature carrying the whole isotope list
+        for temperature in temperatures:
+            yield list(isotopes), temperature
+        return
+    for isotope in isotopes:
+        for temperature in temperatures:
+            yield isotope, temperature
+
+
+def init_worker(modules, isotopes, output_dir):
+    _worker_state["modules"] = modules
+    _worker_state["isotopes"] = isotopes
+    _worker_state["output_dir"] = output_dir
+    # Modules that do not depend on the case (MODER, GASPR, ...) render once per worker
+    _worker_state["cache"] = RenderCache()
+
+
+def render_case(case):
+    """Render one deck and write it straight to disk. Runs in a worker."""
+    isotope, temperature = case
+    modules = apply_case(_worker_state["modules"], isotope, temperature)
+    deck = _worker_state["cache"].render_deck(modules, _worker_state["isotopes"])
+
+    filepath = os.path.join(_worker_state["output_dir"], deck_filename(isotope, temperature))
+    with open(filepath, 'w') as f:
+        f.write(deck)
+        f.write("\n")
+    return filepath
+
+
+def generate_decks(modules, isotopes, temperatures, output_dir, processes=None, chunksize=16,
+                   multi_material=False):
+    """
+    Render every isotope x temperature deck in a worker pool.
+
+    Decks are written by the workers as soon as they are rendered, so only
+    the file paths travel back to the caller. Yields each written path.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    isotope_table = load_isotope_table()
+
+    with Pool(processes, initializer=init_worker,
+              initargs=(modules, isotope_table, output_dir)) as pool:
+        for filepath in pool.imap_unordered(render_case, iter_cases(isotopes, temperatures, multi_material),
+                                           chunksize):
+            yield filepath
+
+
+def read_list_file(filepath):
+    with open(filepath, 'r') as f:
+        return [token for line in f for token in line.split()]
+
+
+def is_temperature(text):
+    try:
+        value = float(text)
+    except ValueError:
+        return False
+    return math.isfinite(value) and value >= 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate NJOY decks for an isotope x temperature matrix.")
+    parser.add_argument("workflow", help="Workflow JSON written by 'Save Workflow'")
+    parser.add_argument("-o", "--output-dir", required=True, help="Directory for the generated decks")
+    parser.add_argument("--isotopes", nargs="*", default=[], help="Isotope symbols, e.g. U235 Pu239")
+    parser.add_argument("--isotopes-file", help="File with whitespace-separated isotope symbols")
+    parser.add_argument("--temperatures", nargs="*", default=[], help="Temperatures in K")
+    parser.add_argument("--temperatures-file", help="File with whitespace-separated temperatures")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--prune", action="store_true",
+                        help="Drop dead and duplicate stages before rendering")
+    parser.add_argument("--multi-material", action="store_true",
+                        help="Process all isotopes in one deck per temperature")
+    args = parser.parse_args(argv)
+
+    isotopes = list(args.isotopes)
+    if args.isotopes_file:
+        isotopes.extend(read_list_file(args.isotopes_file))
+    temperatures = list(args.temperatures)
+    if args.temperatures_file:
+        temperatures.extend(read_list_file(args.temperatures_file))
+
+    if not isotopes or not temperatures:
+        parser.error("at least one isotope and one temperature are required")
+
+    _, unknown = load_isotope_table().resolve(isotopes)
+    if unknown:
+        parser.error("unknown isotopes: " + " ".join(unknown))
+    # Kept as text for the deck names; checked here rather than in the workers
+    bad = [temperature for temperature in temperatures if not is_temperature(temperature)]
+    if bad:
+        parser.error("invalid temperatures: " + " ".join(bad))
+
+    modules = load_workflow(args.workflow)
+    if args.prune:
+        pruned, report = optimize_chain(modules)
+        for line in report.lines(modules):
+            print(f"prune: {line}")
+        modules = pruned
+    count = 0
+    try:
+        for _ in generate_decks(modules, isotopes, temperatures, args.output_dir, args.jobs,
+                                multi_material=args.multi_material):
+            count += 1
+    except RenderError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(f"Wrote {count} decks to {args.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
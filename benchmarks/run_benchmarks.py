@@ -0,0 +1,218 @@
+# run_benchmarks.py
+
+"""
+Benchmarks for the hot paths: deck rendering, schema loading, workflow
+save/load and the parameter dialogs.
+
+Usage:
+    python benchmarks/run_benchmarks.py -o bench.json
+    python benchmarks/run_benchmarks.py --thresholds benchmarks/thresholds.json
+    python benchmarks/run_benchmarks.py --baseline old.json --max-regression 1.25
+
+Every result is the min and median wall time in milliseconds over
+--repeat runs. GUI benchmarks use the offscreen Qt platform and are
+skipped (and reported as skipped) when PyQt5 is not installed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from model import create_module, load_isotope_table, load_isotopes, load_module, registry
+from renderer import RenderCache, render_deck
+from workflow import load_workflow, save_workflow
+
+MODULE_NAMES = ["MODER", "RECONR", "BROADR", "HEATR", "PURR", "UNRESR", "GASPR", "ACER", "VIEWR"]
+CHAIN_SIZES = (1, 10, 100, 1000)
+DEFAULT_THRESHOLDS = os.path.join(BENCHMARKS_DIR, "thresholds.json")
+
+
+def measure(func, repeat, setup=None):
+    """Return {"min_ms", "median_ms", "repeat"} for func, running setup before each call."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"min_ms": min(times), "median_ms": statistics.median(times), "repeat": repeat}
+
+
+def make_chain(size):
+    return [create_module(MODULE_NAMES[i % len(MODULE_NAMES)]) for i in range(size)]
+
+
+def bench_rendering(results, repeat):
+    isotopes = load_isotope_table()
+    for size in CHAIN_SIZES:
+        modules = make_chain(size)
+        results[f"render.deck.{size}"] = measure(lambda: render_deck(modules, isotopes), repeat)
+
+        # What update_preview does after one edit: re-render one block, re-join the rest
+        cache = RenderCache()
+        cache.render_lines(modules, isotopes)
+        edited = modules[size // 2]
+
+        def edit():
+            edited["parameters"] = dict(edited["parameters"], benchmark_edit=time.perf_counter())
+
+        results[f"render.preview_edit.{size}"] = measure(
+            lambda: cache.render_lines(modules, isotopes), repeat, setup=edit
+        )
+
+
+def bench_schema(results, repeat):
+    def load_all_modules():
+        for name in MODULE_NAMES:
+            load_module(name)
+
+    results["schema.load_module.cold"] = measure(load_all_modules, repeat, setup=registry.clear)
+    results["schema.load_module.warm"] = measure(load_all_modules, repeat)
+    results["schema.load_isotopes.cold"] = measure(load_isotopes, repeat, setup=registry.clear)
+    results["schema.isotope_table.cold"] = measure(load_isotope_table, repeat, setup=registry.clear)
+    results["schema.isotope_table.warm"] = measure(load_isotope_table, repeat)
+
+
+def bench_workflow_files(results, repeat):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in (100, 1000):
+            modules = make_chain(size)
+            for suffix in ("jsonl", "jsonl.gz"):
+                path = os.path.join(tmp_dir, f"bench.{suffix}")
+                label = "gz" if suffix.endswith("gz") else "plain"
+                results[f"workflow.save.{label}.{size}"] = measure(
+                    lambda: save_workflow(path, modules), repeat
+                )
+                results[f"workflow.load.{label}.{size}"] = measure(
+                    lambda: load_workflow(path), repeat
+                )
+
+
+def bench_gui(results, repeat):
+    """Dialog and preview benchmarks; returns a reason string if skipped."""
+    try:
+        from PyQt5.QtWidgets import QApplication
+    except ImportError as e:
+        return f"PyQt5 not available: {e}"
+
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    from gui.main_window import MainWindow
+    from gui.parameter_dialog import ParameterDialog
+
+    for name in MODULE_NAMES:
+        mod = create_module(name)
+        dialogs = []
+
+        def construct():
+            dialogs.append(ParameterDialog(name, mod["cards"], mod["parameters"], None, mod["description"]))
+
+        results[f"dialog.construct.{name}"] = measure(construct, repeat)
+        dialog = dialogs[-1]
+        results[f"dialog.bind.{name}"] = measure(lambda: dialog.bind(mod["parameters"]), repeat)
+        results[f"dialog.accept.{name}"] = measure(dialog.accept_parameters, repeat)
+        for d in dialogs:
+            d.deleteLater()
+        app.processEvents()
+
+    window = MainWindow(MODULE_NAMES)
+    for size in CHAIN_SIZES:
+        modules = make_chain(size)
+
+        def reset():
+            window.added_modules = list(modules)
+            window.module_model.set_modules(window.added_modules)
+            window.render_cache.clear()
+            window.preview_lines = []
+            window.preview_text.clear()
+
+        results[f"gui.refresh_preview.{size}"] = measure(window.refresh_preview, repeat, setup=reset)
+    window.deleteLater()
+    app.processEvents()
+    return None
+
+
+def check(results, thresholds=None, baseline=None, max_regression=None):
+    """Return a list of failure messages for threshold and baseline checks."""
+    failures = []
+    for name, limit_ms in (thresholds or {}).items():
+        result = results.get(name)
+        if result is not None and result["median_ms"] > limit_ms:
+            failures.append(f"{name}: {result['median_ms']:.3f} ms > threshold {limit_ms} ms")
+    if baseline and max_regression:
+        for name, previous in baseline.items():
+            result = results.get(name)
+            if result is None or "median_ms" not in previous:
+                continue
+            if result["median_ms"] > previous["median_ms"] * max_regression:
+                failures.append(f"{name}: {result['median_ms']:.3f} ms vs baseline "
+                                f"{previous['median_ms']:.3f} ms (> x{max_regression})")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the hot paths of the NJOY input builder.")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="JSON results file")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per benchmark")
+    parser.add_argument("--thresholds", default=DEFAULT_THRESHOLDS,
+                        help="JSON {benchmark: max median ms}; use '' to disable")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--max-regression", type=float, default=1.25,
+                        help="Allowed slowdown factor relative to --baseline")
+    parser.add_argument("--no-gui", action="store_true", help="Skip the Qt benchmarks")
+    args = parser.parse_args(argv)
+
+    results = {}
+    bench_rendering(results, args.repeat)
+    bench_schema(results, args.repeat)
+    bench_workflow_files(results, args.repeat)
+    skipped = {}
+    if args.no_gui:
+        skipped["gui"] = "--no-gui"
+    else:
+        reason = bench_gui(results, args.repeat)
+        if reason:
+            skipped["gui"] = reason
+
+    thresholds = None
+    if args.thresholds:
+        with open(args.thresholds, 'r') as f:
+            thresholds = json.load(f)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)["results"]
+    failures = check(results, thresholds, baseline, args.max_regression)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "repeat": args.repeat,
+        "results": results,
+        "skipped": skipped,
+        "failures": failures,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    for name, result in results.items():
+        print(f"{name:<32} {result['median_ms']:10.3f} ms  (min {result['min_ms']:.3f})")
+    for group, reason in skipped.items():
+        print(f"skipped {group}: {reason}")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+# chain.py
+
+"""
+Dataflow analysis of a module chain through its tape units.
+
+Every module reads and writes the tapes named on its card 1 (see
+model.TAPE_UNITS). From those edges the chain is checked for:
+
+- duplicate stages: a module identical to an earlier one reading the same
+  tapes; its readers are pointed at the earlier output instead;
+- dead stages: modules none of whose output tapes reach a final product.
+  Final products are ACER and VIEWR output; a chain with neither keeps
+  its last module's output.
+
+Usage:
+    python chain.py workflow.jsonl [-o pruned.jsonl]
+"""
+
+import argparse
+import json
+import sys
+
+from model import module_units
+
+# Modules whose output is a final product of the chain
+SINK_MODULES = ("ACER", "VIEWR")
+
+
+class ChainReport:
+    """What optimize_chain found and changed, by index into the input chain."""
+
+    def __init__(self):
+        # [(index, original index)] for modules repeating earlier work
+        self.duplicates = []
+        # [(index, parameter, old unit, new unit)] for redirected readers
+        self.rewired = []
+        # [(index, reason)] for modules whose output is never used
+        self.dead = []
+
+    @property
+    def removed(self):
+        return sorted({i for i, _ in self.duplicates} | {i for i, _ in self.dead})
+
+    def __bool__(self):
+        return bool(self.duplicates or self.dead)
+
+    def lines(self, modules):
+        """Human-readable description of each finding."""
+        lines = []
+        for index, original in self.duplicates:
+            lines.append(f"{modules[index]['name']} [{index}] repeats {modules[original]['name']} [{original}]")
+        for index, p_name, old, new in self.rewired:
+            lines.append(f"{modules[index]['name']} [{index}] {p_name}: {old} -> {new}")
+        for index, reason in self.dead:
+            lines.append(f"{modules[index]['name']} [{index}] {reason}")
+        return lines
+
+
+def tape_edges(mod):
+    """Return (inputs, outputs) of a module as lists of absolute units."""
+    inputs = []
+    outputs = []
+    for _, direction, unit in module_units(mod):
+        (inputs if direction == "in" else outputs).append(abs(unit))
+    return inputs, outputs
+
+
+def stage_key(mod, producers):
+    """Identity of a stage's work: its settings and the stages feeding it."""
+    output_names = {p_name for p_name, direction, _ in module_units(mod) if direction == "out"}
+    settings = {k: v for k, v in mod["parameters"].items() if k not in output_names}
+    return (mod["name"], json.dumps(settings, sort_keys=True, default=str), tuple(producers))
+
+
+def find_duplicates(modules, report):
+    """
+    Record duplicate stages and the reader redirections that replace them.
+
+    Returns {index: {parameter: new unit}} for the rewired readers.
+    """
+    rewires = {}
+    writer = {}      # unit -> index of the module that last wrote it
+    alias = {}       # duplicate output unit -> (original unit, signed unit to use)
+    seen = {}        # stage key -> index of the first module doing that work
+
+    for i, mod in enumerate(modules):
+        units = module_units(mod)
+
+        # Redirect reads of a duplicate's output to the original tape
+        for p_name, direction, unit in units:
+            if direction == "in" and abs(unit) in alias:
+                new_unit = alias[abs(unit)][1]
+                rewires.setdefault(i, {})[p_name] = new_unit
+                report.rewired.append((i, p_name, unit, new_unit))
+
+        producers = []
+        for p_name, direction, unit in units:
+            if direction == "in":
+                target = abs(rewires.get(i, {}).get(p_name, unit))
+                producers.append((target, writer.get(target)))
+
+        key = stage_key(mod, producers)
+        original = seen.get(key)
+        outputs = [(p_name, unit) for p_name, direction, unit in units if direction == "out"]
+        if original is not None:
+            original_outputs = [unit for p_name, direction, unit in module_units(modules[original])
+                                if direction == "out"]
+            # The original's tapes must still hold its output
+            intact = all(writer.get(abs(unit)) == original for unit in original_outputs)
+            if intact and len(original_outputs) == len(outputs):
+                report.duplicates.append((i, original))
+                for (_, unit), original_unit in zip(outputs, original_outputs):
+                    if abs(unit) != abs(original_unit):
+                        alias[abs(unit)] = (abs(original_unit), original_unit)
+                continue
+        else:
+            seen[key] = i
+
+        for _, unit in outputs:
+            writer[abs(unit)] = i
+            alias.pop(abs(unit), None)
+            # The original tape now holds other data and can no longer stand in
+            for duplicate_unit in [u for u, (target, _) in alias.items() if target == abs(unit)]:
+                del alias[duplicate_unit]
+    return rewires
+
+
+def find_dead(modules, skip, report):
+    """Record modules (outside skip) whose outputs never reach a final product."""
+    indices = [i for i in range(len(modules)) if i not in skip]
+    has_sink = any(modules[i]["name"] in SINK_MODULES for i in indices)
+    needed = set()
+    for i in reversed(indices):
+        inputs, outputs = tape_edges(modules[i])
+        if modules[i]["name"] in SINK_MODULES or (not has_sink and i == indices[-1]):
+            live = True
+        else:
+            live = any(unit in needed for unit in outputs)
+        if not live:
+            units = " ".join(str(unit) for unit in outputs) or "none"
+            report.dead.append((i, f"output tape(s) {units} never read"))
+            continue
+        needed.difference_update(outputs)
+        needed.update(inputs)
+    report.dead.sort()
+
+
+def analyze_chain(modules):
+    """Return (report, rewires) without changing the chain."""
+    report = ChainReport()
+    rewires = find_duplicates(modules, report)
+    rewired = [
+        dict(mod, parameters=dict(mod["parameters"], **rewires[i])) if i in rewires else mod
+        for i, mod in enumerate(modules)
+    ]
+    find_dead(rewired, {i for i, _ in report.duplicates}, report)
+    return report, rewires
+
+
+def optimize_chain(modules):
+    """
+    Return (pruned modules, report).
+
+    Dead and duplicate modules are dropped and readers of a duplicate are
+    pointed at the original tape. Untouched modules are shared with the
+    input list; rewired ones are copies.
+    """
+    report, rewires = analyze_chain(modules)
+    removed = set(report.removed)
+    pruned = []
+    for i, mod in enumerate(modules):
+        if i in removed:
+            continue
+        if i in rewires:
+            mod = dict(mod, parameters=dict(mod["parameters"], **rewires[i]))
+        pruned.append(mod)
+    return pruned, report
+
+
+def main(argv=None):
+    from workflow import load_workflow, save_workflow
+
+    parser = argparse.ArgumentParser(description="Find dead and duplicate stages in a workflow.")
+    parser.add_argument("workflow", help="Workflow file")
+    parser.add_argument("-o", "--output", help="Write the pruned workflow here")
+    args = parser.parse_args(argv)
+
+    modules = load_workflow(args.workflow)
+    pruned, report = optimize_chain(modules)
+    for line in report.lines(modules):
+        print(line)
+    print(f"{len(modules) - len(pruned)} of {len(modules)} modules can be removed")
+    if args.output:
+        save_workflow(args.output, pruned)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,10 @@
 # config.py
 
+import os
+import sys
+from functools import lru_cache
+
+from PyQt5.QtCore import QT_VERSION_STR
 from PyQt5.QtGui import QFont, QColor
 
 # Base Font Configuration
@@ -17,6 +22,15 @@ LABEL_FONT_SIZE = 11
 
 PREVIEW_FONT_FAMILY = "Courier New"
 PREVIEW_FONT_SIZE = 14
+PREVIEW_DEBOUNCE_MS = 50  # Delay used to coalesce preview refreshes
+PROGRESS_DIALOG_DELAY_MS = 400  # Background file operations show progress after this
+MANUAL_INDEX_DELAY_MS = 2000  # Manual search index is loaded this long after startup
+
+# NJOY run monitor
+RUN_WORK_DIR = "work"  # Each GUI run gets its own gui_<timestamp>_* directory in here
+RUN_LOG_MAX_LINES = 20000  # Lines kept per log view; older lines are dropped
+RUN_TAIL_INTERVAL_MS = 500  # How often the output file and timers are refreshed
+RUN_TAIL_CHUNK_BYTES = 1 << 20  # Most of the output file read per refresh
 
 DIALOG_FONT_FAMILY = "Arial"
 DIALOG_FONT_SIZE = 11
@@ -25,27 +39,35 @@ HELP_BUTTON_FONT_FAMILY = "Arial"
 HELP_BUTTON_FONT_SIZE = 10
 
 # Function to get fonts
+# Fonts are built once and shared; widgets copy them in setFont, so callers
+# must not modify the returned objects.
+@lru_cache(maxsize=None)
 def get_base_font():
     return QFont(BASE_FONT_FAMILY, BASE_FONT_SIZE)
 
+@lru_cache(maxsize=None)
 def get_button_font():
     font = QFont(BUTTON_FONT_FAMILY, BUTTON_FONT_SIZE)  # Use the defined constants
     font.setBold(False)
     return font
 
+@lru_cache(maxsize=None)
 def get_large_button_font():
     font = QFont()
     font.setPointSize(LARGE_BUTTON_FONT_SIZE)
     return font
 
+@lru_cache(maxsize=None)
 def get_dialog_element_font():
     font = QFont()
     font.setPointSize(DIALOG_ELEMENT_FONT_SIZE)
     return font
 
+@lru_cache(maxsize=None)
 def get_label_font():
     return QFont(LABEL_FONT_FAMILY, LABEL_FONT_SIZE)
 
+@lru_cache(maxsize=None)
 def get_preview_font():
     """Return a larger font for the preview text area."""
     font = QFont()
@@ -53,21 +75,14 @@ def get_preview_font():
     font.setFamily("Courier")  # Use monospace font for code
     return font
 
+@lru_cache(maxsize=None)
 def get_dialog_font():
     return QFont(DIALOG_FONT_FAMILY, DIALOG_FONT_SIZE)
 
+@lru_cache(maxsize=None)
 def get_help_button_font():
     return QFont(HELP_BUTTON_FONT_FAMILY, HELP_BUTTON_FONT_SIZE)
 
-def get_button_style():
-    """Return the style sheet for buttons with hover effect."""
-    hover_color = BUTTON_HOVER_COLOR.name()
-    return f"""
-        QPushButton:hover {{
-            background-color: {hover_color};
-        }}
-    """
-
 # Color Configurations
 BASE_COLOR = QColor("#f8f8f2")
 BUTTON_BACKGROUND_COLOR = QColor("#44475a")
@@ -94,4 +109,127 @@ def get_preview_background_color():
     return PREVIEW_BACKGROUND_COLOR
 
 def get_preview_text_color():
-    return PREVIEW_TEXT_COLOR
\ No newline at end of file
+    return PREVIEW_TEXT_COLOR
+
+
+# Theme
+# Widgets opt into the application stylesheet through the "themeRole"
+# dynamic property instead of carrying their own stylesheets.
+THEME_ROLE_PROPERTY = "themeRole"
+ACTION_BUTTON = "action"    # Dialog buttons with the hover highlight
+OPTION_BUTTON = "option"    # Checkable option buttons, highlighted while checked
+MODULE_BUTTON = "module"    # Entries of the module selection list
+
+def set_theme_role(widget, role):
+    """Tag a widget so the application stylesheet styles it. Call before it is shown."""
+    widget.setProperty(THEME_ROLE_PROPERTY, role)
+
+@lru_cache(maxsize=None)
+def get_theme_stylesheet():
+    """Return the application-level rules for every themed widget, built once."""
+    hover_color = get_button_hover_color().name()
+    return f"""
+        QPushButton[{THEME_ROLE_PROPERTY}="{ACTION_BUTTON}"]:hover,
+        QPushButton[{THEME_ROLE_PROPERTY}="{OPTION_BUTTON}"]:hover,
+        QPushButton[{THEME_ROLE_PROPERTY}="{OPTION_BUTTON}"]:checked {{
+            background-color: {hover_color};
+        }}
+        QPushButton[{THEME_ROLE_PROPERTY}="{MODULE_BUTTON}"] {{
+            background-color: {get_button_background_color().name()};
+            color: {get_base_color().name()};
+            border: none;
+            border-radius: 3px;
+            padding: 10px;
+        }}
+        QPushButton[{THEME_ROLE_PROPERTY}="{MODULE_BUTTON}"]:hover {{
+            background-color: {hover_color};
+        }}
+        QToolTip {{
+            background-color: #333333;
+            color: white;
+            border: none;
+            padding: 5px;
+        }}
+    """
+
+
+# Stylesheet cache
+STYLESHEET_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "njoygui"
+)
+
+def load_app_stylesheet():
+    """
+    Return the application stylesheet: qdarkstyle plus the theme rules.
+
+    The processed qdarkstyle part is cached between runs in a file keyed
+    by the qdarkstyle and Qt versions and the platform, since qdarkstyle
+    patches its output for each of them.
+    """
+    return load_qdarkstyle() + get_theme_stylesheet()
+
+def palette_colors(palette):
+    """Return {(group, role): rgba} for every color of a QPalette."""
+    from PyQt5.QtGui import QPalette
+
+    return {(group, role): palette.color(group, QPalette.ColorRole(role)).rgba()
+            for group in (QPalette.Active, QPalette.Inactive, QPalette.Disabled)
+            for role in range(QPalette.NColorRoles)}
+
+def apply_palette_patches(app, patches):
+    from PyQt5.QtGui import QPalette
+
+    palette = app.palette()
+    for group, role, rgba in patches:
+        palette.setColor(QPalette.ColorGroup(group), QPalette.ColorRole(role), QColor.fromRgba(rgba))
+    app.setPalette(palette)
+
+def load_qdarkstyle():
+    """
+    Return the processed qdarkstyle stylesheet, from the cache when possible.
+
+    Besides returning the stylesheet, qdarkstyle.load_stylesheet patches
+    the application palette (e.g. the link color). Those changes are
+    recorded with the cached stylesheet and replayed on a cache hit, so a
+    cached start looks the same as an uncached one.
+    """
+    import json
+
+    os.environ.setdefault("QT_API", "pyqt5")
+    import qdarkstyle
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication.instance()
+    version = getattr(qdarkstyle, "__version__", "unknown")
+    cache_path = os.path.join(
+        STYLESHEET_CACHE_DIR, f"qdarkstyle-{version}-qt{QT_VERSION_STR}-{sys.platform}.json"
+    )
+    try:
+        with open(cache_path, 'r') as f:
+            cached = json.load(f)
+        stylesheet = cached["stylesheet"]
+        patches = cached["palette"]
+        # The icons the stylesheet refers to live in a compiled Qt resource module
+        from qdarkstyle.dark import darkstyle_rc  # noqa: F401
+        if app is not None:
+            apply_palette_patches(app, patches)
+        return stylesheet
+    except (OSError, ValueError, KeyError, ImportError):
+        pass
+
+    before = palette_colors(app.palette()) if app is not None else {}
+    stylesheet = qdarkstyle.load_stylesheet(qt_api="pyqt5")
+    after = palette_colors(app.palette()) if app is not None else {}
+    patches = [[group, role, rgba] for (group, role), rgba in after.items()
+               if before.get((group, role)) != rgba]
+    try:
+        os.makedirs(STYLESHEET_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"stylesheet": stylesheet, "palette": patches}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # A read-only home only costs the cache, not the theme
+        pass
+    return stylesheet
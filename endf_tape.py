@@ -0,0 +1,231 @@
+# endf_tape.py
+
+"""
+Index of the MAT/MF/MT sections on an ENDF or PENDF tape.
+
+The tape is memory-mapped and scanned once with a regular expression
+for the section-end (SEND/FEND/MEND/TEND) records, i.e. lines whose MT
+field (columns 73-75) is 0; no per-line Python work is done. Each
+section is recorded with its byte offset and length, so a caller can
+read any section directly. From the few lines it needs, the index also
+takes each material's temperature (MF1/MT451) and the number of points
+of each MF3 cross section (NP of the TAB1 record).
+
+The index is stored next to the tape as <tape>.idx.json and reused
+while the tape's size and mtime are unchanged.
+
+Usage:
+    python endf_tape.py results/tape22 [--rebuild] [--json]
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import sys
+
+from fileio import atomic_open
+from tracing import span
+
+INDEX_SUFFIX = ".idx.json"
+INDEX_VERSION = 1
+
+# Columns 67-75 (MAT, MF, MT) of a record whose MT is 0
+END_RECORD_RE = re.compile(rb"^[^\n]{66}([ \d+-]{4})([ \d]{2})  0[^\n]*(?:\n|\Z)", re.MULTILINE)
+ENDF_EXPONENT_RE = re.compile(r"(?<=[\d.])([+-])")
+
+# Progress is reported about this often (in bytes scanned)
+PROGRESS_STEP = 8 << 20
+
+
+class TapeFormatError(ValueError):
+    """Raised when a file does not look like an ENDF tape."""
+
+
+def endf_float(field):
+    """Parse an 11-column ENDF number such as ' 2.936000+2' or '-1.0-10'."""
+    text = field.strip()
+    if not text:
+        return 0.0
+    try:
+        return float(text)
+    except ValueError:
+        return float(ENDF_EXPONENT_RE.sub(r"e\1", text.replace(" ", ""), count=1))
+
+
+def endf_int(field):
+    text = field.strip()
+    return int(text) if text else 0
+
+
+def record_fields(line):
+    """Return the six 11-column fields of a record line."""
+    return [line[i:i + 11] for i in range(0, 66, 11)]
+
+
+def control(line):
+    """Return (MAT, MF, MT) of a record line."""
+    return endf_int(line[66:70]), endf_int(line[70:72]), endf_int(line[72:75])
+
+
+def line_at(mm, offset, number=0):
+    """Return the text of the number-th line from offset, without reading further."""
+    for _ in range(number):
+        offset = mm.find(b"\n", offset) + 1
+        if offset == 0:
+            return ""
+    end = mm.find(b"\n", offset)
+    return mm[offset:end if end >= 0 else len(mm)].decode("ascii", "replace")
+
+
+def tape_stamp(filepath):
+    stat = os.stat(filepath)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def index_tape(filepath, progress=None):
+    """
+    Scan a tape and return its index.
+
+    The index is a dict: {"stamp", "tpid", "materials": [{"mat", "za",
+    "awr", "temperature", "offset", "sections": [[mf, mt, offset,
+    length, np], ...]}, ...]}. np is the TAB1 point count for MF3 and
+    None for other files. progress(done KiB, total KiB) is called as the
+    scan advances.
+    """
+    with span("index_tape", "io"), open(filepath, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            raise TapeFormatError(f"{filepath}: empty file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            index = {"stamp": tape_stamp(filepath), "tpid": line_at(mm, 0)[:66].rstrip(),
+                     "materials": []}
+            material = None
+            start = 0
+            next_report = PROGRESS_STEP
+            for m in END_RECORD_RE.finditer(mm):
+                mat = endf_int(m.group(1).decode())
+                mf = endf_int(m.group(2).decode())
+                if mat > 0 and mf > 0 and m.start() > start:
+                    # SEND: the section runs from the previous end record to here
+                    _, _, mt = control(line_at(mm, start))
+                    if material is None or material["mat"] != mat:
+                        material = new_material(mm, mat, start)
+                        index["materials"].append(material)
+                    np = None
+                    if mf == 1 and mt == 451:
+                        read_description(mm, start, material)
+                    elif mf == 3:
+                        np = endf_int(record_fields(line_at(mm, start, 1))[5])
+                    material["sections"].append([mf, mt, start, m.start() - start, np])
+                elif mat <= 0:
+                    # MEND/TEND: the next section starts a new material (or temperature)
+                    material = None
+                start = m.end()
+                if progress is not None and start >= next_report:
+                    progress(start >> 10, size >> 10)
+                    next_report = start + PROGRESS_STEP
+            if not index["materials"] and size > 0:
+                raise TapeFormatError(f"{filepath}: no ENDF sections found")
+            if progress is not None:
+                progress(size >> 10, size >> 10)
+    return index
+
+
+def new_material(mm, mat, offset):
+    head = record_fields(line_at(mm, offset))
+    return {"mat": mat, "za": endf_float(head[0]), "awr": endf_float(head[1]),
+            "temperature": None, "offset": offset, "sections": []}
+
+
+def read_description(mm, offset, material):
+    """Take TEMP from the fourth record of MF1/MT451 (ENDF-6 layout)."""
+    try:
+        material["temperature"] = endf_float(record_fields(line_at(mm, offset, 3))[0])
+    except ValueError:
+        material["temperature"] = None
+
+
+def index_path(filepath):
+    return filepath + INDEX_SUFFIX
+
+
+def load_tape_index(filepath, rebuild=False, progress=None):
+    """
+    Return the index of a tape, from <tape>.idx.json when it is current.
+
+    A fresh index is written next to the tape; a read-only directory
+    only means the tape is scanned again next time.
+    """
+    sidecar = index_path(filepath)
+    if not rebuild:
+        try:
+            with open(sidecar, 'r') as f:
+                index = json.load(f)
+            if index.get("version") == INDEX_VERSION and index.get("stamp") == tape_stamp(filepath):
+                return index
+        except (OSError, ValueError):
+            pass
+    index = index_tape(filepath, progress)
+    index["version"] = INDEX_VERSION
+    try:
+        with atomic_open(sidecar) as f:
+            json.dump(index, f)
+    except OSError:
+        pass
+    return index
+
+
+def read_section(filepath, section, max_bytes=None):
+    """Return the text of one [mf, mt, offset, length, np] section (its first max_bytes)."""
+    _, _, offset, length, _ = section
+    if max_bytes is not None:
+        length = min(length, max_bytes)
+    with open(filepath, 'rb') as f:
+        f.seek(offset)
+        return f.read(length).decode("ascii", "replace")
+
+
+def format_temperature(temperature):
+    return "?" if temperature is None else f"{temperature:g} K"
+
+
+def summary_lines(index):
+    """Human-readable summary: one line per material and per file."""
+    lines = [f"TPID: {index['tpid']}"] if index["tpid"] else []
+    for material in index["materials"]:
+        lines.append(f"MAT {material['mat']}  ZA {material['za']:g}  AWR {material['awr']:g}  "
+                     f"T {format_temperature(material['temperature'])}  "
+                     f"{len(material['sections'])} sections")
+        files = {}
+        for mf, mt, _, length, np in material["sections"]:
+            files.setdefault(mf, []).append((mt, length, np))
+        for mf, sections in files.items():
+            mts = " ".join(f"{mt}({np})" if np is not None else str(mt) for mt, _, np in sections)
+            size = sum(length for _, length, _ in sections)
+            lines.append(f"  MF{mf:<3} {size:>12,} bytes  MT {mts}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index and summarize an ENDF/PENDF tape.")
+    parser.add_argument("tape", help="ENDF or PENDF tape")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore a stored index")
+    parser.add_argument("--json", action="store_true", help="Print the index as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        index = load_tape_index(args.tape, args.rebuild)
+    except (OSError, TapeFormatError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(index))
+    else:
+        print("\n".join(summary_lines(index)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+# fileio.py
+
+"""
+Atomic file writes and cooperative cancellation for long file operations.
+
+atomic_open writes to a temporary file next to the target and renames it
+into place only once everything is written and synced, so a crash, an
+error or a cancelled save never leaves a truncated deck or workflow (the
+previous file, if any, stays intact).
+"""
+
+import gzip
+import io
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+
+
+class OperationCancelled(Exception):
+    """Raised from a progress callback to abandon a save, load or render."""
+
+
+@contextmanager
+def atomic_open(filepath, compress=False):
+    """
+    Open a text file for writing that only appears at filepath when complete.
+
+    The temporary file lives in the target's directory so the final
+    os.replace is a rename on the same filesystem. An existing target's
+    permissions are kept.
+    """
+    tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    raw = open(tmp_path, 'xb')
+    try:
+        stream = gzip.GzipFile(filename=filepath, mode='wb', fileobj=raw) if compress else raw
+        text = io.TextIOWrapper(stream, encoding='utf-8')
+        yield text
+        text.flush()
+        # Detach so closing the wrapper does not close raw before the sync
+        text.detach()
+        if compress:
+            stream.close()
+        raw.flush()
+        os.fsync(raw.fileno())
+        raw.close()
+        if os.path.exists(filepath):
+            shutil.copymode(filepath, tmp_path)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        raw.close()
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -2,19 +2,19 @@
 
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-    QMessageBox, QSplitter, QScrollArea, QTextEdit, QFileDialog,
-    QSizePolicy
+    QMessageBox, QSplitter, QListView, QPlainTextEdit, QFileDialog,
+    QSizePolicy, QAction
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont
-
-from model import load_module, load_isotopes
-from gui.module_item import ModuleItem
-from gui.module_selection_dialog import ModuleSelectionDialog
-from gui.parameter_dialog import ParameterDialog
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFont, QTextCursor
+
+from model import create_module, load_isotope_table
+from renderer import RenderCache, RenderError
+from isotope_table import UnknownIsotopeError
+from tracing import span, tracer
+from gui.module_list_model import ModuleListModel, ModuleItemDelegate
 import config 
 from config import get_large_button_font, get_dialog_font  
-import json 
 
 class MainWindow(QMainWindow):
     def __init__(self, modules_available):
@@ -25,10 +25,24 @@ class MainWindow(QMainWindow):
         self.modules_available = modules_available
         self.added_modules = []
         
-        # Load isotopes once
-        self.isotopes = load_isotopes()
+        # Shared isotope table from the schema registry, loaded on first render
+        self.isotopes = None
+
+        # Rendered module blocks, re-used until a module's inputs change
+        self.render_cache = RenderCache()
+        # Lines currently shown in the preview document
+        self.preview_lines = []
+        # One ParameterDialog per module type, rebound on every edit
+        self.parameter_dialogs = {}
+        # Trace panel, created when first opened from the Tools menu
+        self.trace_dialog = None
+        # Background file operation in progress (gui.workers.Worker), if any
+        self.worker = None
+        # Loads the manual search index in the background after startup
+        self.index_worker = None
 
         self.init_ui()
+        self.init_menu()
 
     def init_ui(self):
         central_widget = QWidget()
@@ -62,8 +76,14 @@ class MainWindow(QMainWindow):
         self.load_config_btn.setFont(save_load_font)
         self.load_config_btn.clicked.connect(self.load_configuration)
         
+        self.import_deck_btn = QPushButton("Import NJOY Deck")
+        self.import_deck_btn.setMinimumSize(120, 30)
+        self.import_deck_btn.setFont(save_load_font)
+        self.import_deck_btn.clicked.connect(self.import_njoy_deck)
+
         buttons_container.addWidget(self.save_config_btn)
         buttons_container.addWidget(self.load_config_btn)
+        buttons_container.addWidget(self.import_deck_btn)
         
         left_layout.addLayout(buttons_container)
 
@@ -75,16 +95,25 @@ class MainWindow(QMainWindow):
         self.add_module_btn.clicked.connect(self.add_module)
         left_layout.addWidget(self.add_module_btn)
 
-        self.module_list_container = QVBoxLayout()
-        self.module_list_container.setSpacing(2)  # Reduced spacing between module items
-        self.module_list_container.setAlignment(Qt.AlignTop)
-
-        scroll_frame = QWidget()
-        scroll_frame.setLayout(self.module_list_container)
-        scroll_area = QScrollArea()
-        scroll_area.setWidget(scroll_frame)
-        scroll_area.setWidgetResizable(True)
-        left_layout.addWidget(scroll_area)
+        # Module chain: a list model over added_modules painted by a delegate,
+        # so only visible rows are drawn and moves touch two rows
+        self.module_model = ModuleListModel(self.added_modules, self)
+        self.module_view = QListView()
+        self.module_view.setModel(self.module_model)
+        self.module_view.setSelectionMode(QListView.NoSelection)
+        self.module_view.setUniformItemSizes(True)
+        self.module_view.setSpacing(2)  # Reduced spacing between module items
+        self.module_view.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.module_delegate = ModuleItemDelegate(self.module_view)
+        self.module_delegate.action_triggered.connect(self.on_module_action)
+        self.module_view.setItemDelegate(self.module_delegate)
+        left_layout.addWidget(self.module_view)
+
+        self.optimize_btn = QPushButton("Optimize Chain")
+        self.optimize_btn.setMinimumSize(120, 30)
+        self.optimize_btn.setFont(config.get_button_font())
+        self.optimize_btn.clicked.connect(self.optimize_chain)
+        left_layout.addWidget(self.optimize_btn)
 
         self.generate_btn = QPushButton("Generate NJOY Input")
         self.generate_btn.setMinimumSize(120, 30)
@@ -94,19 +123,33 @@ class MainWindow(QMainWindow):
         self.generate_btn.clicked.connect(self.generate_njoy_input)
         left_layout.addWidget(self.generate_btn)
 
+        self.run_btn = QPushButton("Run NJOY")
+        self.run_btn.setMinimumSize(120, 30)
+        self.run_btn.setFont(config.get_button_font())
+        self.run_btn.clicked.connect(self.run_njoy)
+        left_layout.addWidget(self.run_btn)
+
         left_widget.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Expanding)
 
         splitter.addWidget(left_widget)
 
         # Right panel
-        self.preview_text = QTextEdit()
+        self.preview_text = QPlainTextEdit()
         self.preview_text.setReadOnly(True)
+        self.preview_text.setUndoRedoEnabled(False)
+        self.preview_text.setLineWrapMode(QPlainTextEdit.NoWrap)
         self.preview_text.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         
         # Set larger font for preview text
         preview_font = config.get_preview_font()
         self.preview_text.setFont(preview_font)
         
+        # Bursts of changes are coalesced into a single preview refresh
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(config.PREVIEW_DEBOUNCE_MS)
+        self.preview_timer.timeout.connect(self.refresh_preview)
+
         self.update_preview()
         splitter.addWidget(self.preview_text)
 
@@ -116,111 +159,169 @@ class MainWindow(QMainWindow):
 
         splitter.setSizes([330, 570])
 
+    def init_menu(self):
+        tools_menu = self.menuBar().addMenu("Tools")
+
+        self.tracing_action = QAction("Collect Trace Spans", self)
+        self.tracing_action.setCheckable(True)
+        self.tracing_action.setChecked(tracer.enabled)
+        self.tracing_action.toggled.connect(self.set_tracing)
+        tools_menu.addAction(self.tracing_action)
+
+        trace_panel_action = QAction("Trace Panel...", self)
+        trace_panel_action.triggered.connect(self.show_trace_panel)
+        tools_menu.addAction(trace_panel_action)
+
+        tools_menu.addSeparator()
+        search_manuals_action = QAction("Search Manuals...", self)
+        search_manuals_action.triggered.connect(self.search_manuals)
+        tools_menu.addAction(search_manuals_action)
+
+        inspect_tape_action = QAction("Inspect ENDF/PENDF Tape...", self)
+        inspect_tape_action.triggered.connect(lambda: self.inspect_tape())
+        tools_menu.addAction(inspect_tape_action)
+
+        check_ace_action = QAction("Check ACE Files and Write xsdir...", self)
+        check_ace_action.triggered.connect(self.check_ace_files)
+        tools_menu.addAction(check_ace_action)
+
+        # Load (or build) the manual index off the GUI thread once startup is done
+        QTimer.singleShot(config.MANUAL_INDEX_DELAY_MS, self.warm_manual_index)
+
+    def warm_manual_index(self):
+        from gui.workers import Worker
+        from manual_index import shared_index
+
+        worker = Worker(lambda progress: shared_index())
+        # Help falls back to loading synchronously; nothing to report here
+        worker.signals.failed.connect(lambda message: None)
+        self.index_worker = worker
+        worker.start()
+
+    def search_manuals(self):
+        from gui.manual_search_dialog import ManualSearchDialog
+        from manual_index import shared_index
+
+        try:
+            index = shared_index()
+        except OSError as e:
+            msg = QMessageBox(self)
+            msg.setFont(get_dialog_font())
+            msg.setIcon(QMessageBox.Critical)
+            msg.setText(f"Failed to load the manual index: {str(e)}")
+            msg.setWindowTitle("Error")
+            msg.exec_()
+            return
+        ManualSearchDialog(index, self).exec_()
+
+    def set_tracing(self, enabled):
+        if enabled:
+            tracer.enable()
+        else:
+            tracer.disable()
+        if self.trace_dialog is not None:
+            self.trace_dialog.enable_box.setChecked(enabled)
+        self.statusBar().showMessage("Tracing on" if enabled else "Tracing off")
+
+    def show_trace_panel(self):
+        from gui.trace_dialog import TraceDialog
+
+        if self.trace_dialog is None:
+            self.trace_dialog = TraceDialog(self)
+            # Keep the menu check in step with the panel's own switch
+            self.trace_dialog.enable_box.toggled.connect(self.tracing_action.setChecked)
+        self.trace_dialog.show()
+        self.trace_dialog.raise_()
+        self.trace_dialog.activateWindow()
+
     def add_module(self):
+        # Dialog modules are imported on first use to keep startup light
+        from gui.module_selection_dialog import ModuleSelectionDialog
+
         dialog = ModuleSelectionDialog(self.modules_available, self)
         if dialog.exec_():
             selected_module = dialog.get_selected_module()
             if selected_module:
-                mod_model = load_module(selected_module)
-                parameters = {}
-                # Set all parameters from JSON defaults upfront
-                for card in mod_model.cards:
-                    for param in card["parameters"]:
-                        p_name = param["name"]
-                        p_default = param.get("default", None)
-                        parameters[p_name] = p_default
-
-                # Handle temperature parameters for both BROADR and PURR
-                if mod_model.module_name.lower() in ["broadr", "purr"]:
-                    temp_param = "temp2" if mod_model.module_name.lower() == "broadr" else "temp"
-                    if isinstance(parameters.get(temp_param), (int, float)):
-                        parameters[temp_param] = str(parameters[temp_param])
-                    if not parameters.get(temp_param, '').strip():
-                        parameters[temp_param] = "293.6"
-
-                # Make sure you include the description from the mod_model
-                module_dict = {
-                    "name": mod_model.module_name,
-                    "description": getattr(mod_model, "description", "No description available."),
-                    "cards": mod_model.cards,
-                    "parameters": parameters
-                }
-
-                self.added_modules.append(module_dict)
-                self.add_module_item(module_dict)
+                # Parameters start from the JSON defaults
+                module_dict = create_module(selected_module)
+
+                self.module_model.append_module(module_dict)
                 self.update_preview()
 
 
-    def add_module_item(self, module_dict):
-        # Extract module name and description from module_dict
-        module_name = module_dict.get("name", "Unnamed Module")
-        module_description = module_dict.get("description", "No description available.")
-        
-        # Create the ModuleItem with name and description
-        item_widget = ModuleItem(module_name, module_description, self)
-        
-        # Connect signals to appropriate slots
-        item_widget.module_up.connect(lambda: self.move_module_up(item_widget))
-        item_widget.module_down.connect(lambda: self.move_module_down(item_widget))
-        item_widget.module_remove.connect(lambda: self.remove_module(item_widget))
-        item_widget.module_edit.connect(lambda: self.edit_module_parameters(item_widget))
-        
-        # Add the widget to the container and show it
-        self.module_list_container.addWidget(item_widget)
-        item_widget.show()
-
-    def remove_module(self, item_widget):
-        idx = self.index_of_module_item(item_widget)
-        if idx >= 0:
-            self.added_modules.pop(idx)
-            self.module_list_container.removeWidget(item_widget)
-            item_widget.deleteLater()
+    def on_module_action(self, action, row):
+        if action == "edit":
+            self.edit_module_parameters(row)
+        elif action == "up":
+            self.move_module_up(row)
+        elif action == "down":
+            self.move_module_down(row)
+        elif action == "remove":
+            self.remove_module(row)
+        elif action == "info":
+            self.show_module_info(row)
+
+    def remove_module(self, row):
+        if 0 <= row < len(self.added_modules):
+            self.module_model.remove_module(row)
             self.update_preview()
 
-    def move_module_up(self, item_widget):
-        idx = self.index_of_module_item(item_widget)
-        if idx > 0:
-            self.added_modules[idx], self.added_modules[idx-1] = self.added_modules[idx-1], self.added_modules[idx]
-            self.reorder_module_items()
+    def move_module_up(self, row):
+        if self.module_model.move_module(row, row - 1):
             self.update_preview()
 
-    def move_module_down(self, item_widget):
-        idx = self.index_of_module_item(item_widget)
-        if idx < len(self.added_modules)-1:
-            self.added_modules[idx], self.added_modules[idx+1] = self.added_modules[idx+1], self.added_modules[idx]
-            self.reorder_module_items()
+    def move_module_down(self, row):
+        if self.module_model.move_module(row, row + 1):
             self.update_preview()
 
-    def reorder_module_items(self):
-        # Remove all widgets and re-add them in the new order
-        for i in reversed(range(self.module_list_container.count())):
-            w = self.module_list_container.itemAt(i).widget()
-            self.module_list_container.removeWidget(w)
-            w.deleteLater()
-        for mod in self.added_modules:
-            self.add_module_item(mod)
-
-    def index_of_module_item(self, item_widget):
-        for i in range(self.module_list_container.count()):
-            w = self.module_list_container.itemAt(i).widget()
-            if w == item_widget:
-                return i
-        return -1
-
-    def edit_module_parameters(self, item_widget):
-        idx = self.index_of_module_item(item_widget)
-        if idx >= 0:
+    def show_module_info(self, row):
+        """
+        Display the module's description in a QMessageBox with rich text formatting,
+        matching the style used in ParameterDialog.
+        """
+        mod_dict = self.added_modules[row]
+        module_description = mod_dict.get("description", "")
+        msg_box = QMessageBox(self)
+        msg_box.setWindowTitle(f"{mod_dict['name']} Information")
+        msg_box.setTextFormat(Qt.RichText)
+
+        # Assume module_description may contain HTML tags (e.g., "<b>...</b>")
+        msg_box.setText(module_description if module_description else "<b>No description available.</b>")
+        msg_box.setIcon(QMessageBox.NoIcon)
+
+        # Use a readable font
+        custom_font = QFont("Arial", 11)
+        msg_box.setFont(custom_font)
+
+        msg_box.setStandardButtons(QMessageBox.Ok)
+        msg_box.exec_()
+
+    def parameter_dialog_for(self, mod_dict):
+        """Return the cached dialog for the module's type, bound to its parameters."""
+        module_description = mod_dict.get("description", "No description available.")
+        from gui.parameter_dialog import ParameterDialog
+
+        dialog = self.parameter_dialogs.get(mod_dict["name"])
+        # A workflow may carry its own copy of the cards; rebuild only if they differ
+        if dialog is None or (dialog.cards is not mod_dict["cards"] and dialog.cards != mod_dict["cards"]):
+            with span("ParameterDialog", "gui", module=mod_dict["name"]):
+                dialog = ParameterDialog(
+                    mod_dict["name"],
+                    mod_dict["cards"],
+                    mod_dict["parameters"],
+                    self,
+                    module_description
+                )
+            self.parameter_dialogs[mod_dict["name"]] = dialog
+        else:
+            with span("ParameterDialog.bind", "gui", module=mod_dict["name"]):
+                dialog.bind(mod_dict["parameters"], module_description)
+        return dialog
+
+    def edit_module_parameters(self, idx):
+        if 0 <= idx < len(self.added_modules):
             mod_dict = self.added_modules[idx]
-            module_description = mod_dict.get("description", "No description available.")
-            
-            # Pass the module_description to ParameterDialog
-            dialog = ParameterDialog(
-                mod_dict["name"],
-                mod_dict["cards"],
-                mod_dict["parameters"],
-                self,
-                module_description 
-            )
+            dialog = self.parameter_dialog_for(mod_dict)
             if dialog.exec_():
                 updated_params = dialog.get_parameters()
                 # Convert temperature parameter to string for PURR
@@ -231,440 +332,380 @@ class MainWindow(QMainWindow):
                     if not updated_params.get(temp_param, '').strip():
                         updated_params[temp_param] = "293.6"
                 self.added_modules[idx]["parameters"] = updated_params
+                self.module_model.module_changed(idx)
                 self.update_preview()
 
+    def optimize_chain(self):
+        """Offer to drop the dead and duplicate stages found by chain.py."""
+        from chain import optimize_chain
+
+        pruned, report = optimize_chain(self.added_modules)
+        msg = QMessageBox(self)
+        msg.setFont(get_dialog_font())
+        msg.setWindowTitle("Optimize Chain")
+        if not report:
+            msg.setIcon(QMessageBox.Information)
+            msg.setText("Every module contributes to the chain's output; nothing to remove.")
+            msg.exec_()
+            return
+
+        removed = len(self.added_modules) - len(pruned)
+        msg.setIcon(QMessageBox.Question)
+        msg.setText(f"{removed} module(s) can be removed:\n\n" + "\n".join(report.lines(self.added_modules)))
+        msg.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
+        if msg.exec_() == QMessageBox.Yes:
+            self.added_modules = pruned
+            self.module_model.set_modules(self.added_modules)
+            self.update_preview()
+
     def update_preview(self):
-        lines = []
-        for mod in self.added_modules:
-            name = mod["name"]
-            p = mod["parameters"]
-
-            if name == "MODER":
-                # Card 1
-                nin = p.get("nin", "")
-                nout = p.get("nout", "")
-
-                # Build the MODER module
-                lines.append("moder")
-                lines.append(f"{nin} {nout}")
-
-            elif name == "RECONR":
-                # Card 1
-                nendf = p.get("nendf", "")
-                npend = p.get("npend", "")
-
-                # Card 2 (label)
-                isotope = p.get("mat", "U235")
-                mat = self.isotopes.get(isotope, 9228)
-                
-                # Get tempr value from parameters, use 0 as default for label
-                tempr = p.get("tempr")
-                try:
-                    if tempr is not None:
-                        tempr = float(tempr)
-                    else:
-                        tempr = 0.0
-                except (ValueError, TypeError):
-                    tempr = 0.0
-                
-                # Always show temperature in label
-                label = f'reconstructed data for {isotope} @ {tempr} K'
-
-                # Card 3
-                tolerance_str = p.get("err", "0.001")
-                tolerance = float(tolerance_str)
-
-                # Get optional parameters
-                user_errmax = p.get("errmax")
-                user_errint = p.get("errint")
-
-                # Build Card 4 with dependencies (keep tempr optional in card 4)
-                card4_parts = [str(tolerance)]
-                if user_errint is not None:
-                    if user_errmax is None:
-                        user_errmax = 10 * tolerance
-                    card4_parts.extend([str(p.get("tempr", 0.0)), str(user_errmax), str(user_errint)])
-                elif user_errmax is not None:
-                    card4_parts.extend([str(p.get("tempr", 0.0)), str(user_errmax)])
-                elif p.get("tempr") is not None:
-                    card4_parts.append(str(tempr))
-
-                card4_line = " ".join(card4_parts) + " /"
-
-                # Build the RECONR module
-                lines.append("-- reconstruct, linearise and unionize data")
-                lines.append("reconr")
-                lines.append(f"{nendf} {npend}")
-                lines.append(f"{label} /")
-                lines.append(f"{mat} /")
-                lines.append(card4_line)
-                lines.append("0 /")
-
-            elif name == "BROADR":
-                # Card 1
-                nendf = p.get("nendf", "")
-                nin = p.get("nin", "")
-                nout = p.get("nout", "")
-
-                # Card 2
-                mat_str = p.get("mat", "U235")
-                mat_num = self.isotopes.get(mat_str, 9228)
-                temp2_str = p.get("temp2", "")
-                temps = temp2_str.split()
-                ntemp2 = len(temps)
-
-                # Card 3 parameters
-                errthn_str = p.get("errthn", "0.001")
-                errthn = float(errthn_str)
-                user_thnmax = p.get("thnmax")
-                user_errmax = p.get("errmax")
-                user_errint = p.get("errint")
-
-                # Build Card 3 with dependencies
-                card3_parts = [str(errthn)]
-                if user_errint is not None:
-                    if user_errmax is None:
-                        user_errmax = 10 * errthn
-                    if user_thnmax is None:
-                        user_thnmax = 1
-                    card3_parts.extend([str(user_thnmax), str(user_errmax), str(user_errint)])
-                elif user_errmax is not None:
-                    if user_thnmax is None:
-                        user_thnmax = 1
-                    card3_parts.extend([str(user_thnmax), str(user_errmax)])
-                elif user_thnmax is not None:
-                    card3_parts.append(str(user_thnmax))
-
-                card3_line = " ".join(card3_parts) + " /"
-
-                # Build the BROADR module
-                lines.append("-- calculate doppler broadening")
-                lines.append("broadr")
-                lines.append(f"{nendf} {nin} {nout}")
-                lines.append(f"{mat_num} {ntemp2} /")
-                lines.append(card3_line)
-                if ntemp2 > 0:
-                    lines.append(" ".join(temps) + " /")
-                lines.append("0 /")
-
-            elif name == "HEATR":
-                # Card 1
-                nendf = p.get("nendf", "")
-                nin = p.get("nin", "")
-                nout = p.get("nout", "")
-                nplot = p.get("nplot") or "0"  # Set default value to "0" if None or empty
-
-                # Card 2 mandatory parameters
-                mat_str = p.get("matd", "U235")
-                mat_num = self.isotopes.get(mat_str, 9228)
-                mtk_str = p.get("mtk", "")
-                mtk_list = str(mtk_str).split()
-                npk = len(mtk_list)
-
-                # Handle optional Card 2 parameters
-                user_ed = p.get("ed")
-                user_iprint = p.get("iprint")
-                user_local = p.get("local")
-                
-                # Convert text options to numbers - simplified iprint handling
-                if user_iprint == "min":
-                    iprint = 0
-                elif user_iprint == "max":
-                    iprint = 1
-                else:
-                    iprint = None
-
-                if user_local == "Transported":
-                    local = 0
-                elif user_local == "Deposited":
-                    local = 1
-                else:
-                    local = None
-
-                # Build Card 2 based on rightmost specified parameter
-                card2_parts = [str(mat_num), str(npk)]
-                
-                if user_ed is not None:
-                    # If ed is specified, include all parameters
-                    card2_parts.extend([
-                        "0",  # nqa
-                        "0",  # ntemp
-                        str(local if local is not None else 0),
-                        str(iprint if iprint is not None else 0),
-                        str(user_ed)
-                    ])
-                elif user_iprint is not None:
-                    # If iprint is specified (but not ed), include up to iprint
-                    card2_parts.extend([
-                        "0",  # nqa
-                        "0",  # ntemp
-                        str(local if local is not None else 0),
-                        str(iprint)
-                    ])
-                elif user_local is not None:
-                    # If only local is specified, include up to local
-                    card2_parts.extend([
-                        "0",  # nqa
-                        "0",  # ntemp
-                        str(local)
-                    ])
-
-                # Build the HEATR module
-                lines.append("-- calculate heating values")
-                lines.append("heatr")
-                lines.append(f"{nendf} {nin} {nout} {nplot}")
-                lines.append(" ".join(card2_parts) + " /")
-                if npk > 0:
-                    lines.append(" ".join(mtk_list) + " /")
-
-            elif name == "PURR":
-                # Card 1
-                nendf = p.get("nendf", "")
-                nin = p.get("nin", "")
-                nout = p.get("nout", "")
-
-                # Card 2
-                mat_str = p.get("matd", "U235")
-                mat_num = self.isotopes.get(mat_str, 9228)
-                
-                # Process temperatures
-                temp_str = str(p.get("temp", ""))  # Ensure temp is a string
-                temps = temp_str.split()
-                ntemp = len(temps)
-                
-                # Process sigma zero values
-                sigz_str = str(p.get("sigz", ""))  # Ensure sigz is a string
-                sigz_values = sigz_str.split()
-                nsigz = len(sigz_values)
-                
-                # Get optional parameters
-                nbin = p.get("nbin", "20")
-                nladr = p.get("nladr", "64")
-                user_iprint = p.get("iprint")
-                nunx = p.get("nunx")
-                
-                # Convert text options to numbers - fixed iprint handling
-                if user_iprint == "min":
-                    iprint = 0
-                elif user_iprint == "max":
-                    iprint = 1
-                else:
-                    iprint = None
-                    
-                # Build card 2 parameters
-                card2_parts = [str(mat_num), str(ntemp), str(nsigz), str(nbin), str(nladr)]
-                
-                # Add iprint and nunx if either is specified
-                if nunx is not None or user_iprint is not None:
-                    card2_parts.append(str(iprint if iprint is not None else "1"))
-                    card2_parts.append(str(nunx if nunx is not None else ""))
-
-                # Build the PURR module
-                lines.append("-- calculate ptables")
-                lines.append("purr")
-                lines.append(f"{nendf} {nin} {nout}")
-                lines.append(" ".join(card2_parts) + " /")
-                if ntemp > 0:
-                    lines.append(" ".join(temps) + " /")
-                if nsigz > 0:
-                    lines.append(" ".join(sigz_values) + " /")
-                lines.append("0 /")
-            
-            elif name == "UNRESR":
-                # Card 1
-                nendf = p.get("nendf", "")
-                nin = p.get("nin", "")
-                nout = p.get("nout", "")
-
-                # Card 2
-                mat_str = p.get("matd", "U235")
-                mat_num = self.isotopes.get(mat_str, 9228)
-                
-                # Process temperatures
-                temp_str = str(p.get("temp", ""))  # Ensure temp is a string
-                temps = temp_str.split()
-                ntemp = len(temps)
-                
-                # Process sigma zero values
-                sigz_str = str(p.get("sigz", ""))  # Ensure sigz is a string
-                sigz_values = sigz_str.split()
-                nsigz = len(sigz_values)
-                
-                # Get optional parameters
-                user_iprint = p.get("iprint")
-                
-                # Convert text options to numbers - fixed iprint handling
-                if user_iprint == "min":
-                    iprint = 0
-                elif user_iprint == "max":
-                    iprint = 1
-                else:
-                    iprint = None
-                    
-                # Build card 2 parameters
-                card2_parts = [str(mat_num), str(ntemp), str(nsigz)]
-                
-                # Add iprint and nunx if either is specified
-                if user_iprint is not None:
-                    card2_parts.append(str(iprint if iprint is not None else "0"))
-
-                # Build the PURR module
-                lines.append("-- calculate ptables")
-                lines.append("purr")
-                lines.append(f"{nendf} {nin} {nout}")
-                lines.append(" ".join(card2_parts) + " /")
-                if ntemp > 0:
-                    lines.append(" ".join(temps) + " /")
-                if nsigz > 0:
-                    lines.append(" ".join(sigz_values) + " /")
-                lines.append("0 /")
-
-            elif name == "GASPR":
-                # Card 1
-                nendf = p.get("nendf", "")
-                nin = p.get("nin", "")
-                nout = p.get("nout", "")
-
-                # Build the PURR module
-                lines.append("-- calculate production")
-                lines.append("gaspr")
-                lines.append(f"{nendf} {nin} {nout}")
-
-            elif name == "ACER":
-                # Card 1
-                nendf = p.get("nendf", "")
-                npend = p.get("npend", "")
-                ngend = p.get("ngend", "")
-                nace = p.get("nace", "")
-                ndir = p.get("ndir", "")
-
-                # Process iprint
-                user_iprint = p.get("iprint")
-                if user_iprint == "min":
-                    iprint = 0
-                elif user_iprint == "max":
-                    iprint = 1
-                else:
-                    iprint = 1  # default value
-
-                # Get itype and suff
-                itype = p.get("itype", 1)
-                if itype is None:
-                    itype = 1
-                suff = p.get("suff", "")
-                iopt = p.get("iopt", "")
-                suff_trunc = int(suff * 100) / 100 if suff > 0 else suff
-
-                # Get material and temperature
-                isotope = p.get("matd", "U235")
-                mat_num = self.isotopes.get(isotope, 9228)
-                tempd = p.get("tempd", "")
-
-                # Generate automatic hk label
-                hk = f"{isotope} @ {tempd} K ACE data"
-
-                # Build the ACER module
-                lines.append("-- generate ACE file")
-                lines.append("acer")
-                lines.append(f"{nendf} {npend} {ngend} {nace} {ndir}")
-                lines.append(f"{iopt} {iprint} {itype} {suff_trunc:.2f} /")
-                lines.append(f"'{hk}' /")
-                lines.append(f"{mat_num} {tempd} /")
-                lines.append('/')
-                lines.append('/')
-
-            if name == "VIEWR":
-                # Card 1
-                nin = p.get("infile", "")
-                nout = p.get("nps", "")
-
-                # Build the MODER module
-                lines.append("-- produce plots")
-                lines.append("viewr")
-                lines.append(f"{nin} {nout}")
-
-        if lines:
-            lines.append("stop")
-
-        preview_text = "\n".join(lines)
-        self.preview_text.setText(preview_text)
+        """Schedule a preview refresh; repeated calls restart the debounce."""
+        self.preview_timer.start()
+
+    def flush_preview(self):
+        """Apply a pending preview refresh immediately."""
+        if self.preview_timer.isActive():
+            self.preview_timer.stop()
+            self.refresh_preview()
+
+    def refresh_preview(self):
+        if not self.added_modules and self.isotopes is None:
+            # Nothing to render yet; leave the isotope table unloaded
+            self.patch_preview([])
+            return
+        with span("refresh_preview", "gui", modules=len(self.added_modules)):
+            # Cheap when unchanged: the registry only re-reads the file on a new mtime
+            self.isotopes = load_isotope_table()
+            try:
+                new_lines = self.render_cache.render_lines(self.added_modules, self.isotopes)
+            except (UnknownIsotopeError, RenderError) as e:
+                self.statusBar().showMessage(f"{e} - preview not updated")
+                return
+            with span("patch_preview", "gui", lines=len(new_lines)):
+                self.patch_preview(new_lines)
+
+        stats = self.render_cache.stats()
+        self.statusBar().showMessage(
+            f"Render cache: {stats['hits']} hits, {stats['misses']} misses"
+        )
+
+    def patch_preview(self, new_lines):
+        """
+        Replace only the lines that changed since the last refresh.
+
+        The changed range is found by trimming the common prefix and
+        suffix, then edited in place with a QTextCursor so the document
+        is not re-laid out and the viewport stays where it was.
+        """
+        old_lines = self.preview_lines
+        self.preview_lines = new_lines
+        if old_lines == new_lines:
+            return
+
+        if not old_lines or not new_lines:
+            self.preview_text.setPlainText("\n".join(new_lines))
+            return
+
+        old_len, new_len = len(old_lines), len(new_lines)
+        prefix = 0
+        limit = min(old_len, new_len)
+        while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+            prefix += 1
+        suffix = 0
+        limit -= prefix
+        while suffix < limit and old_lines[old_len - 1 - suffix] == new_lines[new_len - 1 - suffix]:
+            suffix += 1
+        old_end = old_len - suffix
+        new_end = new_len - suffix
+        replacement = "\n".join(new_lines[prefix:new_end])
+
+        v_bar = self.preview_text.verticalScrollBar()
+        h_bar = self.preview_text.horizontalScrollBar()
+        v_pos, h_pos = v_bar.value(), h_bar.value()
+
+        doc = self.preview_text.document()
+        cursor = QTextCursor(doc)
+        cursor.beginEditBlock()
+        if prefix == old_end:
+            # Pure insertion before old line `prefix` (or at the very end)
+            if prefix < old_len:
+                cursor.setPosition(doc.findBlockByNumber(prefix).position())
+                cursor.insertText(replacement + "\n")
+            else:
+                cursor.movePosition(QTextCursor.End)
+                cursor.insertText("\n" + replacement)
+        elif prefix == new_end:
+            # Pure deletion of old lines [prefix, old_end)
+            if old_end < old_len:
+                cursor.setPosition(doc.findBlockByNumber(prefix).position())
+                cursor.setPosition(doc.findBlockByNumber(old_end).position(), QTextCursor.KeepAnchor)
+            else:
+                cursor.setPosition(doc.findBlockByNumber(prefix).position() - 1)
+                cursor.movePosition(QTextCursor.End, QTextCursor.KeepAnchor)
+            cursor.removeSelectedText()
+        else:
+            last = doc.findBlockByNumber(old_end - 1)
+            cursor.setPosition(doc.findBlockByNumber(prefix).position())
+            cursor.setPosition(last.position() + last.length() - 1, QTextCursor.KeepAnchor)
+            cursor.insertText(replacement)
+        cursor.endEditBlock()
+
+        v_bar.setValue(v_pos)
+        h_bar.setValue(h_pos)
+
+    def run_in_background(self, worker, label, on_finished, failure_text):
+        """
+        Run a Worker with a window-modal progress dialog that can cancel it.
+
+        The window keeps painting while the file work happens on the pool.
+        """
+        from PyQt5.QtWidgets import QProgressDialog
+
+        progress = QProgressDialog(label, "Cancel", 0, 0, self)
+        progress.setWindowTitle("Please wait")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+        # Quick operations finish before the dialog would appear
+        progress.setMinimumDuration(config.PROGRESS_DIALOG_DELAY_MS)
+        progress.canceled.connect(worker.cancel)
+
+        def on_progress(done, total):
+            if progress.maximum() != total:
+                progress.setMaximum(total)
+            progress.setValue(done)
+
+        def finish():
+            progress.close()
+            self.worker = None
+
+        def on_success(result):
+            finish()
+            on_finished(result)
+
+        def on_failure(message):
+            finish()
+            msg = QMessageBox(self)
+            msg.setFont(get_dialog_font())
+            msg.setIcon(QMessageBox.Critical)
+            msg.setText(f"{failure_text}: {message}")
+            msg.setWindowTitle("Error")
+            msg.exec_()
+
+        def on_cancel():
+            finish()
+            self.statusBar().showMessage(f"{label.rstrip('.')} cancelled; no file was changed")
+
+        worker.signals.progress.connect(on_progress)
+        worker.signals.finished.connect(on_success)
+        worker.signals.failed.connect(on_failure)
+        worker.signals.cancelled.connect(on_cancel)
+        self.worker = worker
+        worker.start()
 
     def generate_njoy_input(self):
+        from gui.workers import Worker
+        from renderer import write_deck
+
         file_dialog = QFileDialog.getSaveFileName(self, "Save NJOY Input", "input.njoy", "All Files (*.*)")
-        if file_dialog[0]:
-            with open(file_dialog[0], 'w') as f:
-                f.write(self.preview_text.toPlainText())
+        if file_dialog[0] and self.worker is None:
+            file_path = file_dialog[0]
+            # Rendered from the modules, not the preview text; the snapshot
+            # keeps the worker independent of later edits
+            worker = Worker(write_deck, file_path, list(self.added_modules), load_isotope_table())
+
+            def saved(_):
+                msg = QMessageBox(self)
+                msg.setFont(get_dialog_font())
+                msg.setIcon(QMessageBox.Information)
+                msg.setText(f"NJOY input saved to {file_path}")
+                msg.setWindowTitle("Success")
+                msg.exec_()
+
+            self.run_in_background(worker, "Writing NJOY input...", saved, "Failed to write NJOY input")
+
+    def inspect_tape(self, file_path=None, directory=""):
+        """Index a tape on a worker (or reuse its .idx.json) and show the inspector."""
+        from endf_tape import load_tape_index
+        from gui.tape_inspector_dialog import TapeInspectorDialog
+        from gui.workers import Worker
+
+        if file_path is None:
+            file_path, _ = QFileDialog.getOpenFileName(
+                self,
+                "Inspect ENDF/PENDF Tape",
+                directory,
+                "All Files (*)"
+            )
+        if file_path and self.worker is None:
+            def indexed(index):
+                dialog = TapeInspectorDialog(file_path, index, self)
+                dialog.setAttribute(Qt.WA_DeleteOnClose)
+                dialog.show()
+
+            self.run_in_background(Worker(load_tape_index, file_path), "Indexing tape...",
+                                   indexed, "Failed to index tape")
+
+    def check_ace_files(self):
+        """Validate a directory of ACE files against the chain's ACER modules and write an xsdir."""
+        from ace_tools import check_ace_files, write_xsdir
+        from gui.workers import Worker
+
+        directory = QFileDialog.getExistingDirectory(self, "Directory with ACE Files")
+        if not directory or self.worker is not None:
+            return
+        modules = list(self.added_modules)
+        has_acer = any(mod["name"] == "ACER" for mod in modules)
+
+        def checked(result):
+            tables, problems = result
             msg = QMessageBox(self)
             msg.setFont(get_dialog_font())
-            msg.setIcon(QMessageBox.Information)
-            msg.setText(f"NJOY input saved to {file_dialog[0]}")
-            msg.setWindowTitle("Success")
+            msg.setIcon(QMessageBox.Warning if problems else QMessageBox.Information)
+            msg.setWindowTitle("ACE Files")
+            text = f"Read {len(tables)} ACE tables; {len(problems)} problems."
+            if not has_acer:
+                text += "\nThe chain has no ACER module; only the files themselves were checked."
+            msg.setText(text)
+            if problems:
+                msg.setDetailedText("\n".join(f"{path}: {message}" if path else message
+                                              for path, message in problems))
+            msg.exec_()
+            if not tables:
+                return
+            file_path, _ = QFileDialog.getSaveFileName(self, "Save xsdir", f"{directory}/xsdir",
+                                                       "All Files (*)")
+            if file_path:
+                try:
+                    write_xsdir(file_path, tables)
+                except OSError as e:
+                    QMessageBox.critical(self, "Error", f"Failed to write xsdir: {str(e)}")
+
+        worker = Worker(check_ace_files, [directory], modules if has_acer else None, load_isotope_table())
+        self.run_in_background(worker, "Reading ACE headers...", checked, "Failed to check ACE files")
+
+    def run_njoy(self):
+        """Run the chain with NJOY in a live monitor window."""
+        from gui.run_monitor_dialog import RunMonitorDialog
+
+        if not self.added_modules:
+            return
+        try:
+            dialog = RunMonitorDialog(list(self.added_modules), load_isotope_table(), None, self)
+        except (UnknownIsotopeError, RenderError) as e:
+            msg = QMessageBox(self)
+            msg.setFont(get_dialog_font())
+            msg.setIcon(QMessageBox.Critical)
+            msg.setText(f"Cannot run this chain: {str(e)}")
+            msg.setWindowTitle("Error")
             msg.exec_()
+            return
+        endf_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Select ENDF Tape (staged for every input unit)",
+            "",
+            "ENDF Files (*.endf *.txt *.dat);;All Files (*.*)"
+        )
+        if not endf_path:
+            dialog.deleteLater()
+            return
+        dialog.endf_path = endf_path
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        if dialog.start():
+            dialog.show()
+        else:
+            dialog.close()
 
     def save_configuration(self):
+        from gui.workers import Worker
+        from workflow import FILE_FILTER as WORKFLOW_FILE_FILTER, save_workflow
+
         file_path, _ = QFileDialog.getSaveFileName(
             self,
             "Save Configuration",
             "",
-            "JSON Files (*.json);;All Files (*.*)"
+            WORKFLOW_FILE_FILTER
         )
-        if file_path:
-            config_data = {
-                "modules": self.added_modules
-            }
-            try:
-                with open(file_path, 'w') as f:
-                    json.dump(config_data, f, indent=2)
+        if file_path and self.worker is None:
+            # Compact format: only parameters that differ from the defaults
+            worker = Worker(save_workflow, file_path, list(self.added_modules))
+
+            def saved(_):
                 msg = QMessageBox(self)
                 msg.setFont(get_dialog_font())
                 msg.setIcon(QMessageBox.Information)
                 msg.setText("Configuration saved successfully!")
                 msg.setWindowTitle("Success")
                 msg.exec_()
-            except Exception as e:
+
+            self.run_in_background(worker, "Saving workflow...", saved, "Failed to save configuration")
+
+    def load_configuration(self):
+        from gui.workers import Worker
+        from workflow import FILE_FILTER as WORKFLOW_FILE_FILTER, load_workflow
+
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Load Configuration",
+            "",
+            WORKFLOW_FILE_FILTER
+        )
+        if file_path and self.worker is None:
+            def load(progress):
+                # Modules come back linked to the shared schemas; legacy files load too
+                warnings = []
+                return load_workflow(file_path, warnings, progress), warnings
+
+            def loaded(result):
+                modules, warnings = result
+                # Replace the chain in one model reset
+                self.added_modules = modules
+                self.module_model.set_modules(self.added_modules)
+
+                self.update_preview()
                 msg = QMessageBox(self)
                 msg.setFont(get_dialog_font())
-                msg.setIcon(QMessageBox.Critical)
-                msg.setText(f"Failed to save configuration: {str(e)}")
-                msg.setWindowTitle("Error")
+                msg.setIcon(QMessageBox.Warning if warnings else QMessageBox.Information)
+                text = "Configuration loaded successfully!"
+                if warnings:
+                    text += "\n\nModule definitions changed since this workflow was saved:\n" + "\n".join(warnings)
+                msg.setText(text)
+                msg.setWindowTitle("Success")
                 msg.exec_()
 
-    def load_configuration(self):
+            self.run_in_background(Worker(load), "Loading workflow...", loaded, "Failed to load configuration")
+
+    def import_njoy_deck(self):
+        from importer import DeckImportError, import_deck
+
         file_path, _ = QFileDialog.getOpenFileName(
             self,
-            "Load Configuration",
+            "Import NJOY Deck",
             "",
-            "JSON Files (*.json);;All Files (*.*)"
+            "NJOY Input Files (*.njoy *.inp *.txt);;All Files (*.*)"
         )
         if file_path:
             try:
-                with open(file_path, 'r') as f:
-                    config_data = json.load(f)
-                
-                # Clear existing modules
-                self.added_modules.clear()
-                for i in reversed(range(self.module_list_container.count())):
-                    widget = self.module_list_container.itemAt(i).widget()
-                    self.module_list_container.removeWidget(widget)
-                    widget.deleteLater()
-                
-                # Load new modules
-                if "modules" in config_data:
-                    self.added_modules = config_data["modules"]
-                    for module in self.added_modules:
-                        self.add_module_item(module)
-                    
+                modules, warnings = import_deck(file_path)
+
+                # Replace the chain in one model reset
+                self.added_modules = modules
+                self.module_model.set_modules(self.added_modules)
+
                 self.update_preview()
                 msg = QMessageBox(self)
                 msg.setFont(get_dialog_font())
-                msg.setIcon(QMessageBox.Information)
-                msg.setText("Configuration loaded successfully!")
-                msg.setWindowTitle("Success")
+                msg.setIcon(QMessageBox.Warning if warnings else QMessageBox.Information)
+                text = f"Imported {len(modules)} modules."
+                if warnings:
+                    text += "\n\n" + "\n".join(warnings)
+                msg.setText(text)
+                msg.setWindowTitle("Import")
                 msg.exec_()
-            except Exception as e:
+            except (OSError, DeckImportError) as e:
                 msg = QMessageBox(self)
                 msg.setFont(get_dialog_font())
                 msg.setIcon(QMessageBox.Critical)
-                msg.setText(f"Failed to load configuration: {str(e)}")
+                msg.setText(f"Failed to import deck: {str(e)}")
                 msg.setWindowTitle("Error")
                 msg.exec_()
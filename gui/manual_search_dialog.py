@@ -0,0 +1,120 @@
+# gui/manual_search_dialog.py
+import html
+import re
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QComboBox, QListWidget,
+    QListWidgetItem, QTextBrowser, QSplitter, QPushButton, QLabel, QMessageBox
+)
+from PyQt5.QtCore import Qt, QTimer, QUrl
+from PyQt5.QtGui import QDesktopServices
+
+import config
+from config import get_dialog_font
+from manual_index import RESOURCES_DIR, TERM_RE
+
+ALL_MANUALS = "All manuals"
+
+
+class ManualSearchDialog(QDialog):
+    """Searches the pre-built manual index and shows the matching page text."""
+
+    def __init__(self, index, parent=None, module=None, query=""):
+        super().__init__(parent)
+        self.index = index
+        self.setWindowTitle("Search Manuals")
+        self.resize(820, 560)
+        self.setFont(get_dialog_font())
+
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        self.query_edit = QLineEdit(query)
+        self.query_edit.setPlaceholderText("Parameter or words, e.g. nladr")
+        self.query_edit.textChanged.connect(self.schedule_search)
+        controls.addWidget(self.query_edit)
+        self.manual_combo = QComboBox()
+        self.manual_combo.addItem(ALL_MANUALS)
+        self.manual_combo.addItems(sorted(name.upper() for name in index.manuals))
+        if module and module.lower() in index.manuals:
+            self.manual_combo.setCurrentText(module.upper())
+        self.manual_combo.currentIndexChanged.connect(self.search)
+        controls.addWidget(self.manual_combo)
+        layout.addLayout(controls)
+
+        splitter = QSplitter(Qt.Horizontal)
+        self.results_list = QListWidget()
+        self.results_list.currentItemChanged.connect(self.show_page)
+        splitter.addWidget(self.results_list)
+        self.page_view = QTextBrowser()
+        splitter.addWidget(self.page_view)
+        splitter.setSizes([260, 560])
+        layout.addWidget(splitter)
+
+        buttons = QHBoxLayout()
+        self.status_label = QLabel()
+        buttons.addWidget(self.status_label)
+        buttons.addStretch()
+        self.open_button = QPushButton("Open PDF at Page")
+        config.set_theme_role(self.open_button, config.ACTION_BUTTON)
+        self.open_button.clicked.connect(self.open_pdf)
+        buttons.addWidget(self.open_button)
+        close_button = QPushButton("Close")
+        config.set_theme_role(close_button, config.ACTION_BUTTON)
+        close_button.clicked.connect(self.close)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+        # Search as the user types, once typing pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(config.PREVIEW_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.search)
+
+        self.search()
+
+    def schedule_search(self):
+        self.search_timer.start()
+
+    def search(self):
+        manual = self.manual_combo.currentText()
+        manual = None if manual == ALL_MANUALS else manual.lower()
+        hits = self.index.search(self.query_edit.text(), manual=manual, limit=50)
+        self.results_list.clear()
+        for m, page, score, snippet in hits:
+            item = QListWidgetItem(f"{m.upper()}  p.{page}  ({score})")
+            item.setToolTip(snippet)
+            item.setData(Qt.UserRole, (m, page))
+            self.results_list.addItem(item)
+        self.status_label.setText(f"{len(hits)} pages")
+        self.open_button.setEnabled(bool(hits))
+        if hits:
+            self.results_list.setCurrentRow(0)
+        else:
+            self.page_view.clear()
+
+    def show_page(self, item, previous=None):
+        if item is None:
+            return
+        m, page = item.data(Qt.UserRole)
+        text = html.escape(self.index.page_text(m, page))
+        words = TERM_RE.findall(self.query_edit.text().lower())
+        if words:
+            pattern = r"(?<![\w])(" + "|".join(re.escape(w) for w in words) + r")(?![\w])"
+            text = re.sub(pattern, r"<b><u>\1</u></b>", text, flags=re.IGNORECASE)
+        self.page_view.setHtml(f"<h3>{m.upper()} manual, page {page}</h3>"
+                               f"<pre style='white-space: pre-wrap'>{text}</pre>")
+        if words:
+            # Bring the first match into view
+            self.page_view.find(words[0])
+
+    def open_pdf(self):
+        item = self.results_list.currentItem()
+        if item is None:
+            return
+        m, page = item.data(Qt.UserRole)
+        url = QUrl.fromLocalFile(f"{RESOURCES_DIR}/{m}.pdf")
+        # Viewers that understand the #page fragment open at the hit
+        url.setFragment(f"page={page}")
+        if not QDesktopServices.openUrl(url):
+            QMessageBox.warning(self, "PDF not found", f"Could not open {m}.pdf.")
@@ -0,0 +1,166 @@
+# module_list_model.py
+
+from PyQt5.QtWidgets import QStyledItemDelegate
+from PyQt5.QtCore import (
+    Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, pyqtSignal
+)
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen
+
+import config
+
+# Role used to fetch the whole module dict from the model
+ModuleRole = Qt.UserRole + 1
+
+
+class ModuleListModel(QAbstractListModel):
+    """
+    List model over the workflow's module dicts.
+
+    The model wraps the list it is given (MainWindow.added_modules) rather
+    than copying it, so edits through the model are edits to the workflow.
+    """
+
+    def __init__(self, modules, parent=None):
+        super().__init__(parent)
+        self.modules = modules
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.modules)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        mod = self.modules[index.row()]
+        if role == Qt.DisplayRole:
+            return mod.get("name", "Unnamed Module")
+        if role == ModuleRole:
+            return mod
+        return None
+
+    def set_modules(self, modules):
+        self.beginResetModel()
+        self.modules = modules
+        self.endResetModel()
+
+    def append_module(self, module_dict):
+        row = len(self.modules)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.modules.append(module_dict)
+        self.endInsertRows()
+
+    def remove_module(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.modules.pop(row)
+        self.endRemoveRows()
+
+    def move_module(self, row, new_row):
+        """Move one module to new_row; only the two affected rows repaint."""
+        if row == new_row or not (0 <= new_row < len(self.modules)):
+            return False
+        # Qt expects the destination as the row *before* which to insert
+        destination = new_row + 1 if new_row > row else new_row
+        self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), destination)
+        self.modules.insert(new_row, self.modules.pop(row))
+        self.endMoveRows()
+        return True
+
+    def module_changed(self, row):
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+
+class ModuleItemDelegate(QStyledItemDelegate):
+    """
+    Paints a module row with its Edit/Up/Down/Remove/Info buttons.
+
+    The buttons are drawn, not widgets: clicks are hit-tested in
+    editorEvent and reported through action_triggered(action, row).
+    """
+
+    action_triggered = pyqtSignal(str, int)
+
+    ROW_HEIGHT = 64
+    MARGIN = 10
+    SPACING = 5
+    BUTTON_HEIGHT = 25
+    # (action, label, width) in display order
+    BUTTONS = (
+        ("edit", "Edit", 50),
+        ("up", "↑", 25),
+        ("down", "↓", 25),
+        ("remove", "Remove", 70),
+        ("info", "?", 25),
+    )
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.hover_pos = None
+        # Track the pointer over the viewport to highlight hovered buttons
+        view.setMouseTracking(True)
+        view.viewport().installEventFilter(self)
+        self.title_font = QFont(config.BUTTON_FONT_FAMILY)
+        self.title_font.setPixelSize(14)
+        self.title_font.setBold(True)
+        self.button_font = config.get_button_font()
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def frame_rect(self, option):
+        return option.rect.adjusted(1, 8, -1, -2)
+
+    def button_rects(self, option):
+        frame = self.frame_rect(option)
+        x = frame.left() + self.MARGIN
+        y = frame.top() + (frame.height() - self.BUTTON_HEIGHT) // 2 + 4
+        rects = []
+        for action, label, width in self.BUTTONS:
+            rects.append((action, label, QRect(x, y, width, self.BUTTON_HEIGHT)))
+            x += width + self.SPACING
+        return rects
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Group-box style frame with the module name as its title
+        frame = self.frame_rect(option)
+        painter.setPen(QPen(QColor("gray"), 2))
+        painter.drawRoundedRect(frame, 5, 5)
+
+        name = index.data(Qt.DisplayRole)
+        painter.setFont(self.title_font)
+        title_width = painter.fontMetrics().horizontalAdvance(name) + 6
+        title_rect = QRect(frame.left() + 8, option.rect.top(), title_width, 16)
+        painter.fillRect(title_rect, option.palette.window())
+        painter.setPen(config.get_label_color())
+        painter.drawText(title_rect, Qt.AlignCenter, name)
+
+        painter.setFont(self.button_font)
+        for action, label, rect in self.button_rects(option):
+            hovered = self.hover_pos is not None and rect.contains(self.hover_pos)
+            color = config.get_button_hover_color() if hovered else config.get_button_background_color()
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(color)
+            painter.drawRoundedRect(rect, 3, 3)
+            painter.setPen(config.get_base_color())
+            painter.drawText(rect, Qt.AlignCenter, label)
+
+        painter.restore()
+
+    def eventFilter(self, viewport, event):
+        if event.type() == QEvent.MouseMove:
+            self.hover_pos = event.pos()
+            viewport.update()
+        elif event.type() == QEvent.Leave:
+            self.hover_pos = None
+            viewport.update()
+        return False
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            for action, label, rect in self.button_rects(option):
+                if rect.contains(event.pos()):
+                    self.action_triggered.emit(action, index.row())
+                    return True
+        return super().editorEvent(event, model, option, index)
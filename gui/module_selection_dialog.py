@@ -3,6 +3,7 @@ from PyQt5.QtWidgets import (
     QWidget, QGroupBox, QFrame, QSizePolicy
 )
 from PyQt5.QtCore import Qt
+from model import load_module
 import config 
 
 class ModuleSelectionDialog(QDialog):
@@ -18,29 +19,15 @@ class ModuleSelectionDialog(QDialog):
         # Set the base font for the entire dialog
         self.setFont(config.get_base_font())
 
-        self.setStyleSheet("""
-            QToolTip {
-                background-color: #333333;
-                color: white;
-                border: none;
-                padding: 5px;     
-            }
-        """)
-
         self.init_ui()
 
     def load_module_data(self):
-        import json
-        import os
-        
-        # Assuming modules JSON files are in a 'modules' directory relative to the script
-        modules_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules')
-        
+        # Schemas are parsed once per process and shared through the registry
         for module in self.modules_available:
-            json_path = os.path.join(modules_dir, f"{module.lower()}.json")
-            if os.path.exists(json_path):
-                with open(json_path, 'r') as f:
-                    self.module_data[module] = json.load(f)
+            try:
+                self.module_data[module] = load_module(module)
+            except OSError:
+                continue
 
     def create_styled_tooltip(self, text):
         return f"""
@@ -77,47 +64,17 @@ class ModuleSelectionDialog(QDialog):
         for mod in self.modules_available:
             mod_button = QPushButton(mod)
             mod_button.setFont(config.get_dialog_element_font())  # Use consistent font size
-            mod_button.setStyleSheet("padding: 10px;")
+            # Colors, padding and hover come from the application stylesheet
+            config.set_theme_role(mod_button, config.MODULE_BUTTON)
             mod_button.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
             mod_button.clicked.connect(lambda checked, m=mod: self.select_module(m))
             
-            if mod in self.module_data and 'tooltip' in self.module_data[mod]:
-                mod_button.setToolTip(self.create_styled_tooltip(self.module_data[mod]['tooltip']))
+            if mod in self.module_data and self.module_data[mod].tooltip:
+                mod_button.setToolTip(self.create_styled_tooltip(self.module_data[mod].tooltip))
             
             scroll_layout.addWidget(mod_button)
 
 
-        # Style for the GroupBox using centralized color configurations
-        container.setStyleSheet(f"""
-            QGroupBox {{
-                border: 2px solid gray;
-                border-radius: 5px;
-                margin-top: 1ex;
-                font-weight: bold;
-                font-size: 14px;
-                padding: 10px;  /* Add padding inside the group box */
-                color: {config.get_label_color().name()};
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 0 3px;
-            }}
-            
-            /* Add hover effect for buttons using centralized colors */
-            QPushButton {{
-                background-color: {config.get_button_background_color().name()};
-                color: {config.get_base_color().name()};
-                border: none;
-                border-radius: 3px;
-            }}
-            QPushButton:hover {{
-                background-color: {config.get_button_hover_color().name()};
-            }}
-        """)
-        
-
-
         # Add some space at the bottom
         scroll_layout.addStretch()
         scroll_area.setWidget(container)
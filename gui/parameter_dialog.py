@@ -3,17 +3,175 @@
 from PyQt5.QtWidgets import (
     QDialog, QFormLayout, QDialogButtonBox, QVBoxLayout, QHBoxLayout, 
     QPushButton, QLabel, QMessageBox, QLineEdit, QComboBox, 
-    QGroupBox, QWidget, QCompleter, QListView, QScrollArea
+    QGroupBox, QWidget, QCompleter, QListView, QScrollArea, QApplication
 )
-from PyQt5.QtCore import Qt, QUrl, QRegExp
+from PyQt5.QtCore import Qt, QUrl, QRegExp, QStringListModel
 from PyQt5.QtGui import QDesktopServices, QRegExpValidator, QIntValidator, QFont
 
-from model import load_isotopes
+from model import isotope_list, load_isotope_table, parameter_index
+from tracing import traced
 import config
 from config import get_dialog_element_font  # Import the new font function
-from config import get_button_style, BUTTON_HOVER_COLOR
+
+_isotope_model = None
+
+def shared_isotope_model(isotope_table):
+    """
+    Return the one isotope list model shared by every isotope widget.
+
+    It is rebuilt only when the registry hands out a new isotope table.
+    """
+    global _isotope_model
+    if _isotope_model is None or _isotope_model.isotope_table is not isotope_table:
+        _isotope_model = QStringListModel([""] + list(isotope_table.symbols), QApplication.instance())
+        _isotope_model.isotope_table = isotope_table
+    return _isotope_model
+
+class MultiValueWidget(QWidget):
+    """
+    Editable list of numeric values (temperatures, sigma zeros, MT numbers).
+
+    Value rows are kept when removed or rebound, hidden, and reused, so
+    rebinding the dialog to another module does not recreate widgets.
+    """
+
+    def __init__(self, dialog, spec):
+        super().__init__()
+        self.dialog = dialog
+        self.spec = spec
+        self.rows = []
+        self.active = 0
+
+        self.v_layout = QVBoxLayout(self)
+        self.v_layout.setContentsMargins(0, 0, 0, 0)
+        self.v_layout.setSpacing(5)
+
+        input_layout = QHBoxLayout()
+        self.input_line = QLineEdit()
+        self.input_line.setFont(config.get_label_font())
+        # Override key press event to fully capture Enter
+        self.input_line.keyPressEvent = self.input_key_press
+
+        add_btn = QPushButton("Add")
+        add_btn.setFixedWidth(50)
+        add_btn.setFont(config.get_label_font())
+        dialog.apply_button_style(add_btn)
+        add_btn.clicked.connect(self.on_add)
+
+        # Add the input line with Add button at the top
+        input_layout.addWidget(self.input_line)
+        input_layout.addWidget(add_btn)
+        self.v_layout.addLayout(input_layout)
+
+    @property
+    def line_edits(self):
+        return [row.line_edit for row in self.rows[:self.active]]
+
+    def current_values(self):
+        return [edit.text().strip() for edit in self.line_edits if edit.text().strip()]
+
+    def set_values(self, values):
+        for i, value in enumerate(values):
+            if i < len(self.rows):
+                row = self.rows[i]
+            else:
+                row = self.create_row()
+            self.set_row_text(row, value)
+            row.show()
+        self.active = len(values)
+        for row in self.rows[self.active:]:
+            row.hide()
+
+    def set_row_text(self, row, value):
+        # Preserve scientific notation if present
+        if isinstance(value, str) and 'e' in value.lower():
+            row.line_edit.setText(value)  # Keep original format
+        else:
+            row.line_edit.setText(str(value))
+
+    def create_row(self):
+        row = QWidget()
+        line_layout = QHBoxLayout(row)
+        line_layout.setContentsMargins(0, 0, 0, 0)
+        row.line_edit = QLineEdit()
+        row.line_edit.setFont(config.get_label_font())
+
+        remove_btn = QPushButton("x")
+        remove_btn.setFixedWidth(25)
+        remove_btn.setFont(config.get_label_font())
+        self.dialog.apply_button_style(remove_btn)
+        remove_btn.clicked.connect(lambda checked, r=row: self.remove_row(r))
+
+        line_layout.addWidget(row.line_edit)
+        line_layout.addWidget(remove_btn)
+        self.v_layout.addWidget(row)
+        self.rows.append(row)
+        return row
+
+    def append_value(self, value):
+        if self.active < len(self.rows):
+            row = self.rows[self.active]
+        else:
+            row = self.create_row()
+        self.set_row_text(row, value)
+        row.show()
+        self.active += 1
+
+    def remove_row(self, row):
+        # Move the row to the end of the pool, behind the active rows
+        self.rows.remove(row)
+        self.rows.append(row)
+        self.v_layout.removeWidget(row)
+        self.v_layout.addWidget(row)
+        row.hide()
+        self.active -= 1
+
+    def validate_value(self, value):
+        if not value:
+            return True
+        try:
+            val = float(value)
+            # Check constraints from parameter definition
+            if self.spec.min is not None and val < self.spec.min:
+                QMessageBox.warning(self, "Invalid Value", 
+                                f"Value must be >= {self.spec.min}")
+                return False
+            if self.spec.max is not None and val > self.spec.max:
+                QMessageBox.warning(self, "Invalid Value", 
+                                f"Value must be <= {self.spec.max}")
+                return False
+        except ValueError:
+            QMessageBox.warning(self, "Invalid Value", 
+                            "Please enter a valid number")
+            return False
+
+        return value not in self.current_values()
+
+    def on_add(self):
+        text = self.input_line.text().strip()
+        if text and self.validate_value(text):
+            self.append_value(text)
+            self.input_line.setText("")
+        elif text and text in self.current_values():
+            QMessageBox.warning(self, "Duplicate Value", 
+                             "This value is already in the list!")
+
+    def input_key_press(self, event):
+        if event.key() == Qt.Key_Return or event.key() == Qt.Key_Enter:
+            self.on_add()
+            event.accept()  # Prevent propagation
+        else:
+            QLineEdit.keyPressEvent(self.input_line, event)  # Handle other keys normally
 
 class ParameterDialog(QDialog):
+    """
+    Parameter editor for one module type.
+
+    MainWindow keeps one instance per module type and calls bind() with a
+    module's parameters each time it opens, instead of rebuilding the
+    widgets. The Advanced card is only built the first time it is expanded.
+    """
+
     def __init__(self, module_name, cards, parameters, parent=None,  module_description=""):
         super().__init__(parent)
         self.module_name = module_name
@@ -21,7 +179,9 @@ class ParameterDialog(QDialog):
         self.parameters = parameters.copy()
         self.module_description = module_description
         self.param_widgets = {}
-        self.isotopes = load_isotopes()
+        self.isotopes = load_isotope_table()
+        # Precompiled name -> ParameterSpec lookup for this module's cards
+        self.param_index = parameter_index(module_name, cards)
         self.setFixedSize(600, 600)
 
         # Set default font size 10 for the entire dialog
@@ -31,7 +191,8 @@ class ParameterDialog(QDialog):
 
     def apply_button_style(self, button):
         """Helper method to apply consistent button styling"""
-        button.setStyleSheet(get_button_style())
+        # Styled by the application stylesheet; nothing is parsed per button
+        config.set_theme_role(button, config.ACTION_BUTTON)
 
     def init_ui(self):
         # Create main layout
@@ -58,63 +219,42 @@ class ParameterDialog(QDialog):
             card_name = card["name"]
             card_map.setdefault(card_name, []).extend(card["parameters"])
 
+        # Cards whose rows are built on first expansion
+        self.lazy_cards = {}
+
         for card_name, param_list in card_map.items():
             if (card_name == "Automatic"):
                 continue
             group_box = QGroupBox(card_name)
             group_box.setFont(config.get_label_font())
             group_layout = QFormLayout()
+            group_box.setLayout(group_layout)
 
-            for param in param_list:
-                p_name = param["name"]
-                p_type = param["type"]
-                p_default = param.get("default", None)
-                p_constraints = param.get("constraints", {})
-                p_help = param.get("help", "")
-                p_display_name = param.get("display_name", p_name)
-
-                # Determine the displayed value:
-                # If user previously set this param, use that.
-                # Else use JSON default if available.
-                # If none, leave blank for optional parameters.
-                if p_name in self.parameters:
-                    p_value = self.parameters[p_name]
-                else:
-                    p_value = p_default
-
-                widget = self.create_widget_for_type(p_type, p_value, p_name, p_constraints, card_name)
-                widget.setFont(get_dialog_element_font())
-
-                h_layout = QHBoxLayout()
-                h_layout.addWidget(widget)
-                if p_help:
-                    help_btn = QPushButton("?")
-                    help_btn.setFixedWidth(25)
-                    help_btn.setFont(config.get_help_button_font())
-                    help_btn.clicked.connect(lambda checked, text=p_help: self.show_param_help(text))
-                    h_layout.addWidget(help_btn)
-                row_widget = QWidget()
-                row_widget.setLayout(h_layout)
-
-                label = QLabel(p_display_name + ":")
-                label.setFont(get_dialog_element_font())
-                group_layout.addRow(label, row_widget)
-
-                if p_type != "auto":
-                    self.param_widgets[p_name] = (widget, p_help)
+            if card_name == "Advanced":
+                toggle_btn = QPushButton(f"Show {card_name} Parameters")
+                toggle_btn.setCheckable(True)
+                toggle_btn.setFont(config.get_button_font())
+                self.apply_button_style(toggle_btn)
+                toggle_btn.toggled.connect(
+                    lambda checked, name=card_name: self.set_card_expanded(name, checked)
+                )
+                container_layout.addWidget(toggle_btn)
+                group_box.hide()
+                self.lazy_cards[card_name] = (group_box, group_layout, param_list, toggle_btn)
+            else:
+                self.build_card_rows(param_list, group_layout)
 
-            group_box.setLayout(group_layout)
             container_layout.addWidget(group_box)
 
         container_layout.addStretch()
 
         # Creamos un QScrollArea y establecemos el widget contenedor
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setWidget(container_widget)
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidgetResizable(True)
+        self.scroll_area.setWidget(container_widget)
 
         # Añadimos el QScrollArea y los botones al layout principal
-        main_layout.addWidget(scroll_area)
+        main_layout.addWidget(self.scroll_area)
 
         button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         button_box.setFont(config.get_button_font())
@@ -128,6 +268,86 @@ class ParameterDialog(QDialog):
         button_box.rejected.connect(self.reject)
         main_layout.addWidget(button_box)
 
+    def set_card_expanded(self, card_name, expanded):
+        group_box, group_layout, param_list, toggle_btn = self.lazy_cards[card_name]
+        if expanded and group_layout.rowCount() == 0:
+            self.build_card_rows(param_list, group_layout)
+        group_box.setVisible(expanded)
+        toggle_btn.setText(f"{'Hide' if expanded else 'Show'} {card_name} Parameters")
+
+    def build_card_rows(self, param_list, group_layout):
+        for param in param_list:
+            p_name = param["name"]
+            p_type = param["type"]
+            p_constraints = param.get("constraints", {})
+            p_help = param.get("help", "")
+            p_display_name = param.get("display_name", p_name)
+            card_name = self.param_index[p_name].card
+
+            widget = self.create_widget_for_type(p_type, self.current_value(p_name), p_name, p_constraints, card_name)
+            widget.setFont(get_dialog_element_font())
+
+            h_layout = QHBoxLayout()
+            h_layout.addWidget(widget)
+            if p_help:
+                help_btn = QPushButton("?")
+                help_btn.setFixedWidth(25)
+                help_btn.setFont(config.get_help_button_font())
+                help_btn.clicked.connect(lambda checked, text=p_help, name=p_name: self.show_param_help(text, name))
+                h_layout.addWidget(help_btn)
+            row_widget = QWidget()
+            row_widget.setLayout(h_layout)
+
+            label = QLabel(p_display_name + ":")
+            label.setFont(get_dialog_element_font())
+            group_layout.addRow(label, row_widget)
+
+            if p_type != "auto":
+                self.param_widgets[p_name] = (widget, p_help)
+
+    def current_value(self, p_name):
+        # Determine the displayed value:
+        # If user previously set this param, use that.
+        # Else use JSON default if available.
+        # If none, leave blank for optional parameters.
+        if p_name in self.parameters:
+            return self.parameters[p_name]
+        return self.param_index[p_name].default
+
+    def bind(self, parameters, module_description=None):
+        """Show another module's parameters in the already-built widgets."""
+        self.parameters = parameters.copy()
+        if module_description is not None:
+            self.module_description = module_description
+        for p_name, (widget, help_text) in self.param_widgets.items():
+            self.set_widget_value(self.param_index[p_name].type, widget, self.current_value(p_name))
+        # Every binding starts like a freshly built dialog: Advanced collapsed
+        for _, _, _, toggle_btn in self.lazy_cards.values():
+            toggle_btn.setChecked(False)
+        self.scroll_area.verticalScrollBar().setValue(0)
+
+    def set_widget_value(self, p_type, widget, p_value):
+        if p_type == "option":
+            # Temporarily disable auto-exclusive behavior to allow no selection
+            for btn in widget.buttons:
+                btn.setAutoExclusive(False)
+                btn.setChecked(p_value == btn.text())
+                btn.setAutoExclusive(True)
+
+        elif p_type == "isotope":
+            # Several materials are shown space-separated
+            widget.setCurrentText(" ".join(isotope_list(p_value)))
+
+        elif p_type == "multi":
+            widget.set_values(str(p_value).split() if p_value else [])
+            # Drop a value half-typed for the previous module
+            widget.input_line.clear()
+
+        elif isinstance(widget, QLineEdit):
+            # For mandatory parameters with defaults, set value.
+            # For optional without defaults, leave blank.
+            widget.setText(str(p_value) if p_value is not None else "")
+
     def create_widget_for_type(self, p_type, p_value, p_name, p_constraints, card_name):
         # All parameters now use QLineEdit.
         line = QLineEdit()
@@ -152,12 +372,6 @@ class ParameterDialog(QDialog):
             val = QRegExpValidator(float_regex, self)
             line.setValidator(val)
 
-            if p_value is not None:
-                if isinstance(p_value, str):
-                    line.setText(p_value)
-            else:
-                line.setText("")
-
         elif p_type == "option":
             container = QWidget()
             layout = QHBoxLayout(container)
@@ -173,11 +387,8 @@ class ParameterDialog(QDialog):
                 btn.setCheckable(True)
                 btn.setAutoExclusive(True)
                 btn.setFont(config.get_dialog_element_font())  # Set font
-                # Modified style to keep hover color when checked
-                base_style = get_button_style()
-                btn.setStyleSheet(f"{base_style}\nQPushButton:checked {{background-color: {BUTTON_HOVER_COLOR.name()};}}")
-                if p_value == option:
-                    btn.setChecked(True)
+                # Keeps the hover color while checked (see config.get_theme_stylesheet)
+                config.set_theme_role(btn, config.OPTION_BUTTON)
                 button_group.append(btn)
                 layout.addWidget(btn)
                 
@@ -186,58 +397,48 @@ class ParameterDialog(QDialog):
             clear_btn.setFixedWidth(25)
             clear_btn.setFont(config.get_dialog_element_font())  # Set font
             self.apply_button_style(clear_btn)
-            
-            def clear_selection():
-                # Temporarily disable auto-exclusive behavior
-                for btn in button_group:
-                    btn.setAutoExclusive(False)
-                    btn.setChecked(False)
-                    btn.setAutoExclusive(True)
-                    
-            clear_btn.clicked.connect(clear_selection)
+            clear_btn.clicked.connect(lambda: self.set_widget_value("option", container, None))
             layout.addWidget(clear_btn)
             
             # Store buttons in the container for later access
             container.buttons = button_group
+            self.set_widget_value(p_type, container, p_value)
             return container
 
         elif p_type == "isotope":
             combo = QComboBox()
-            isotope_list = sorted(self.isotopes.keys())
-
             combo.setEditable(True)
-            combo.addItem("")
-            combo.addItems(isotope_list)
+            # Typed text must never be inserted into the shared model
+            combo.setInsertPolicy(QComboBox.NoInsert)
+
+            # Every isotope widget shares one prebuilt list model
+            isotope_model = shared_isotope_model(self.isotopes)
 
             # Set the font for the combo box and the line edit
             font = config.get_label_font()
             combo.setFont(font)
             combo.lineEdit().setFont(font)
 
-            if p_value is not None:
-                combo.setCurrentText(str(p_value))
-            else:
-                combo.setCurrentText("")
-
             # Assign a custom QListView to the combo
             view = QListView()
             view.setFont(font)
+            view.setUniformItemSizes(True)
             combo.setView(view)
+            combo.setModel(isotope_model)
 
             # Set up the completer
-            completer = QCompleter(isotope_list, self)
+            completer = QCompleter(isotope_model, combo)
             completer.setCaseSensitivity(Qt.CaseSensitive)
             completer.setFilterMode(Qt.MatchContains)
             completer.popup().setFont(font)
             combo.setCompleter(completer)
 
-            # Store the valid items list in the combo box
-            combo.valid_items = isotope_list
-
+            self.set_widget_value(p_type, combo, p_value)
             return combo
 
         elif p_type == "multi":
-            widget = self.create_multi_widget(p_value, p_name)
+            widget = MultiValueWidget(self, self.param_index[p_name])
+            self.set_widget_value(p_type, widget, p_value)
             return widget
 
         elif p_type == "auto":
@@ -247,23 +448,28 @@ class ParameterDialog(QDialog):
 
         # For all QLineEdit widgets (including float/temperature inputs)
         line.setFont(config.get_label_font())
-        
-        # For mandatory parameters with defaults, set value.
-        # For optional without defaults, leave blank.
-        if p_value is not None:
-            line.setText(str(p_value))
-        else:
-            line.setText("")
+        self.set_widget_value(p_type, line, p_value)
 
         return line
 
-    def validate_selection(self, combo, isotope_list, text):
-        if text in isotope_list or text == "":
-            combo._previous_valid_text = text
-        else:
-            combo.setCurrentText(combo._previous_valid_text)
+    def show_param_help(self, text, p_name=None):
+        import html
+        from manual_index import shared_index
+
+        index = None
+        hit = None
+        if p_name:
+            try:
+                # Loaded from the on-disk index; built only if a manual changed
+                index = shared_index()
+                hit = index.lookup_parameter(self.module_name, p_name)
+            except OSError:
+                index = None
+        if hit:
+            manual, page, snippet = hit
+            text += (f"<hr><i>{manual.upper()} manual, page {page}:</i>"
+                     f"<br><tt>{html.escape(snippet)}</tt>")
 
-    def show_param_help(self, text):
         msg_box = QMessageBox(self)
         msg_box.setWindowTitle("Parameter Help")
         msg_box.setTextFormat(Qt.RichText)
@@ -275,7 +481,12 @@ class ParameterDialog(QDialog):
         msg_box.setFont(custom_font)
 
         msg_box.setStandardButtons(QMessageBox.Ok)
+        search_button = msg_box.addButton("Search Manual...", QMessageBox.ActionRole) if index else None
         msg_box.exec_()
+        if search_button is not None and msg_box.clickedButton() is search_button:
+            from gui.manual_search_dialog import ManualSearchDialog
+
+            ManualSearchDialog(index, self, self.module_name, p_name).exec_()
 
     def show_module_help(self):
         """
@@ -299,19 +510,13 @@ class ParameterDialog(QDialog):
         msg_box.setStandardButtons(QMessageBox.Ok)
         msg_box.exec_()
 
+    @traced("accept_parameters", "gui")
     def accept_parameters(self):
         for p_name, (widget, help_text) in self.param_widgets.items():
-            p_def = self.find_parameter_definition(p_name)
-            p_type = p_def["type"]
-            constraints = p_def.get("constraints", {})
-            
-            # Check if parameter is mandatory by finding its card
-            is_mandatory = False
-            for card in self.cards:
-                if card["name"] == "Mandatory":
-                    if any(param["name"] == p_name for param in card["parameters"]):
-                        is_mandatory = True
-                        break
+            spec = self.param_index[p_name]
+            p_def = spec.definition
+            p_type = spec.type
+            is_mandatory = spec.mandatory
 
             if p_type == "multi":
                 # Handle the multi-type widget
@@ -325,11 +530,9 @@ class ParameterDialog(QDialog):
                             self.show_error(f"{p_name} values must be numeric.")
                             return
                         # Check min/max constraints for each entry
-                        if "min" in constraints and val < constraints["min"]:
-                            self.show_error(f"{p_name} must be >= {constraints['min']}")
-                            return
-                        if "max" in constraints and val > constraints["max"]:
-                            self.show_error(f"{p_name} must be <= {constraints['max']}")
+                        error = spec.check_range(val)
+                        if error:
+                            self.show_error(error)
                             return
                         lines.append(val_str)
                         
@@ -341,9 +544,9 @@ class ParameterDialog(QDialog):
             if isinstance(widget, QLineEdit):
                 value_str = widget.text().strip()
                 if value_str == "":
-                    if is_mandatory and "default" in p_def:
+                    if is_mandatory and spec.has_default:
                         # For mandatory parameters, use default value if input is empty
-                        self.parameters[p_name] = p_def["default"]
+                        self.parameters[p_name] = spec.default
                     else:
                         self.parameters.pop(p_name, None)
                 else:
@@ -352,11 +555,9 @@ class ParameterDialog(QDialog):
                         value = int(value_str)
 
                         # Check min/max constraints
-                        if "min" in constraints and value < constraints["min"]:
-                            self.show_error(f"{p_name} must be >= {constraints['min']}")
-                            return
-                        if "max" in constraints and value > constraints["max"]:
-                            self.show_error(f"{p_name} must be <= {constraints['max']}")
+                        error = spec.check_range(value)
+                        if error:
+                            self.show_error(error)
                             return
                         self.parameters[p_name] = value
 
@@ -367,26 +568,29 @@ class ParameterDialog(QDialog):
                             self.show_error(f"{p_name} is not a valid number.")
                             return
                         # Check min/max constraints
-                        if "min" in constraints and value < constraints["min"]:
-                            self.show_error(f"{p_name} must be >= {constraints['min']}")
-                            return
-                        if "max" in constraints and value > constraints["max"]:
-                            self.show_error(f"{p_name} must be <= {constraints['max']}")
+                        error = spec.check_range(value)
+                        if error:
+                            self.show_error(error)
                             return
                         self.parameters[p_name] = value
 
             elif isinstance(widget, QComboBox):
                 value = widget.currentText().strip()
                 if value == "":
-                    if is_mandatory and "default" in p_def:
+                    if is_mandatory and spec.has_default:
                         # For mandatory parameters, use default value if input is empty
-                        self.parameters[p_name] = p_def["default"]
+                        self.parameters[p_name] = spec.default
                     else:
                         self.parameters.pop(p_name, None)
+                elif p_type == "isotope":
+                    # Several space-separated symbols make a multi-material module
+                    symbols = isotope_list(value.replace(",", " "))
+                    for symbol in symbols:
+                        if symbol not in self.isotopes:
+                            self.show_error(f"'{symbol}' is not a valid isotope.")
+                            return
+                    self.parameters[p_name] = symbols[0] if len(symbols) == 1 else symbols
                 else:
-                    if p_type == "isotope" and value not in widget.valid_items:
-                        self.show_error(f"'{value}' is not a valid isotope.")
-                        return
                     self.parameters[p_name] = value
 
             elif p_type == "option":
@@ -399,9 +603,9 @@ class ParameterDialog(QDialog):
                 if selected_value:
                     self.parameters[p_name] = selected_value
                 else:
-                    if is_mandatory and "default" in p_def:
+                    if is_mandatory and spec.has_default:
                         # For mandatory parameters, use default value if nothing selected
-                        self.parameters[p_name] = p_def["default"]
+                        self.parameters[p_name] = spec.default
                     else:
                         self.parameters.pop(p_name, None)
 
@@ -420,11 +624,8 @@ class ParameterDialog(QDialog):
         return self.parameters
 
     def find_parameter_definition(self, p_name):
-        for card in self.cards:
-            for param in card["parameters"]:
-                if param["name"] == p_name:
-                    return param
-        return None
+        spec = self.param_index.get(p_name)
+        return spec.definition if spec is not None else None
 
     def show_error(self, message):
         QMessageBox.warning(self, "Invalid Input", message)
@@ -433,108 +634,3 @@ class ParameterDialog(QDialog):
         pdf_path = f"resources/{self.module_name}.pdf"
         if not QDesktopServices.openUrl(QUrl.fromLocalFile(pdf_path)):
             QMessageBox.warning(self, "PDF not found", f"Could not open {pdf_path}. Ensure the file exists.")
-
-
-    def create_multi_widget(self, p_value, p_name):
-        container = QWidget()
-        v_layout = QVBoxLayout(container)
-        v_layout.setContentsMargins(0, 0, 0, 0)
-        v_layout.setSpacing(5)
-
-        container.line_edits = []
-
-        def get_current_values():
-            return [edit.text().strip() for edit in container.line_edits if edit.text().strip()]
-
-        def validate_value(value):
-            if not value:
-                return True
-            try:
-                val = float(value)
-                # Check constraints from parameter definition
-                p_def = self.find_parameter_definition(p_name)
-                constraints = p_def.get("constraints", {})
-                if "min" in constraints and val < constraints["min"]:
-                    QMessageBox.warning(container, "Invalid Value", 
-                                    f"Value must be >= {constraints['min']}")
-                    return False
-                if "max" in constraints and val > constraints["max"]:
-                    QMessageBox.warning(container, "Invalid Value", 
-                                    f"Value must be <= {constraints['max']}")
-                    return False
-            except ValueError:
-                QMessageBox.warning(container, "Invalid Value", 
-                                "Please enter a valid number")
-                return False
-                
-            current_values = get_current_values()
-            return value not in current_values
-
-        def create_value_line(value):
-            line_layout = QHBoxLayout()
-            line_edit = QLineEdit()
-            # Preserve scientific notation if present
-            if isinstance(value, str) and 'e' in value.lower():
-                line_edit.setText(value)  # Keep original format
-            else:
-                line_edit.setText(str(value))
-            line_edit.setFont(config.get_label_font())
-            
-            remove_btn = QPushButton("x")
-            remove_btn.setFixedWidth(25)
-            remove_btn.setFont(config.get_label_font())
-            self.apply_button_style(remove_btn)
-            
-            def remove_line():
-                v_layout.removeItem(line_layout)
-                line_edit.deleteLater()
-                remove_btn.deleteLater()
-                container.line_edits.remove(line_edit)
-            
-            remove_btn.clicked.connect(remove_line)
-            
-            line_layout.addWidget(line_edit)
-            line_layout.addWidget(remove_btn)
-            v_layout.addLayout(line_layout)
-            container.line_edits.append(line_edit)
-            
-        def on_add():
-            text = input_line.text().strip()
-            if text and validate_value(text):
-                create_value_line(text)
-                input_line.setText("")
-            elif text and text in get_current_values():
-                QMessageBox.warning(container, "Duplicate Value", 
-                                 "This value is already in the list!")
-        
-        input_layout = QHBoxLayout()
-        input_line = QLineEdit()
-        input_line.setFont(config.get_label_font())
-        # Override key press event to fully capture Enter
-        def keyPressEvent(event):
-            if event.key() == Qt.Key_Return or event.key() == Qt.Key_Enter:
-                on_add()
-                event.accept()  # Prevent propagation
-            else:
-                QLineEdit.keyPressEvent(input_line, event)  # Handle other keys normally
-                
-        input_line.keyPressEvent = keyPressEvent
-        
-        add_btn = QPushButton("Add")
-        add_btn.setFixedWidth(50)
-        add_btn.setFont(config.get_label_font())
-        self.apply_button_style(add_btn)
-        
-        add_btn.clicked.connect(on_add)
-        
-        # Add the input line with Add button at the top
-        input_layout.addWidget(input_line)
-        input_layout.addWidget(add_btn)
-        v_layout.addLayout(input_layout)
-        
-        # Initialize existing values below the input line
-        values = str(p_value).split() if p_value else []
-        for val in values:
-            create_value_line(val)
-
-        return container
\ No newline at end of file
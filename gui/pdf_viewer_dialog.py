@@ -1,10 +1,13 @@
 # gui/pdf_viewer_dialog.py
 from PyQt5.QtWidgets import QDialog, QVBoxLayout
 from PyQt5.QtCore import QUrl
-from PyQt5.QtWebEngineWidgets import QWebEngineView
 
 class PDFViewerDialog(QDialog):
     def __init__(self, pdf_path, parent=None):
+        # QtWebEngine is heavy; load it only when a PDF is actually shown.
+        # main.py sets AA_ShareOpenGLContexts so the late import is allowed.
+        from PyQt5.QtWebEngineWidgets import QWebEngineView
+
         super().__init__(parent)
         self.setWindowTitle("Module PDF Documentation")
 
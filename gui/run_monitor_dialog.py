@@ -0,0 +1,280 @@
+# gui/run_monitor_dialog.py
+import os
+import tempfile
+import time
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QTabWidget,
+    QPlainTextEdit, QPushButton, QLabel, QHeaderView, QSplitter, QMessageBox
+)
+from PyQt5.QtCore import Qt, QProcess, QTimer
+from PyQt5.QtGui import QColor
+
+from renderer import fan_out_materials, render_deck
+from runner import (
+    DEFAULT_NJOY, ModuleTimeline, deck_tape_units, resolve_executable, stage_file, tape_name
+)
+import config
+from config import get_dialog_font, get_preview_font
+
+STATUS_COLUMN = 3
+ELAPSED_COLUMN = 4
+
+
+def chain_positions(modules, expanded):
+    """
+    Map each module of the fanned-out deck back to its row in modules.
+
+    fan_out_materials keeps the leading modules as they are and repeats
+    the tail once per material.
+    """
+    start = 0
+    while start < min(len(modules), len(expanded)) and expanded[start] is modules[start]:
+        start += 1
+    tail = max(len(modules) - start, 1)
+    return [i if i < start else start + (i - start) % tail for i in range(len(expanded))]
+
+
+class LogView(QPlainTextEdit):
+    """Read-only log that keeps only the last max_lines lines."""
+
+    def __init__(self, max_lines, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.setFont(get_preview_font())
+        # Qt drops the oldest blocks past this count: a ring buffer of lines
+        self.setMaximumBlockCount(max_lines)
+
+    def append_text(self, text):
+        bar = self.verticalScrollBar()
+        follow = bar.value() == bar.maximum()
+        self.appendPlainText(text)
+        if follow:
+            bar.setValue(bar.maximum())
+
+
+class RunMonitorDialog(QDialog):
+    """
+    Runs a chain's deck with NJOY as a QProcess and follows it live.
+
+    stdout and the NJOY "output" file are shown in bounded log views; the
+    module banners on stdout drive a per-module status and timing table.
+    """
+
+    def __init__(self, modules, isotopes, endf_path, parent=None, njoy=DEFAULT_NJOY):
+        super().__init__(parent)
+        self.setWindowTitle("NJOY Run")
+        self.resize(900, 640)
+        self.setFont(get_dialog_font())
+
+        self.modules = modules
+        self.expanded = fan_out_materials(modules)
+        self.positions = chain_positions(modules, self.expanded)
+        self.timeline = ModuleTimeline(mod["name"] for mod in self.expanded)
+        self.deck = render_deck(modules, isotopes)
+        self.endf_path = endf_path
+        # QProcess starts NJOY in the work directory
+        self.njoy = resolve_executable(njoy)
+        # Created by start(), unique even for runs started in the same second
+        self.workdir = None
+        self.process = None
+        self.started_at = None
+        # Unterminated tail of the last stdout chunk
+        self.partial_line = ""
+        self.output_file = None
+
+        self.init_ui()
+
+        self.tick_timer = QTimer(self)
+        self.tick_timer.setInterval(config.RUN_TAIL_INTERVAL_MS)
+        self.tick_timer.timeout.connect(self.tick)
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        splitter = QSplitter(Qt.Vertical)
+        self.table = QTableWidget(len(self.expanded), 5)
+        self.table.setHorizontalHeaderLabels(("#", "Module", "Chain row", "Status", "Elapsed"))
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        for row, mod in enumerate(self.expanded):
+            values = (str(row + 1), mod["name"], str(self.positions[row] + 1), "pending", "")
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(value))
+        splitter.addWidget(self.table)
+
+        self.tabs = QTabWidget()
+        self.stdout_view = LogView(config.RUN_LOG_MAX_LINES)
+        self.output_view = LogView(config.RUN_LOG_MAX_LINES)
+        self.tabs.addTab(self.stdout_view, "stdout")
+        self.tabs.addTab(self.output_view, "output")
+        splitter.addWidget(self.tabs)
+        splitter.setSizes([220, 420])
+        layout.addWidget(splitter)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        self.inspect_button = QPushButton("Inspect Tape...")
+        config.set_theme_role(self.inspect_button, config.ACTION_BUTTON)
+        self.inspect_button.clicked.connect(self.inspect_tape)
+        self.inspect_button.setEnabled(False)
+        buttons.addWidget(self.inspect_button)
+        self.stop_button = QPushButton("Stop")
+        config.set_theme_role(self.stop_button, config.ACTION_BUTTON)
+        self.stop_button.clicked.connect(self.stop)
+        buttons.addWidget(self.stop_button)
+        close_button = QPushButton("Close")
+        config.set_theme_role(close_button, config.ACTION_BUTTON)
+        close_button.clicked.connect(self.close)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+    def start(self):
+        """Stage the tapes and deck in a fresh work directory and launch NJOY."""
+        try:
+            work_root = os.path.abspath(config.RUN_WORK_DIR)
+            os.makedirs(work_root, exist_ok=True)
+            self.workdir = tempfile.mkdtemp(dir=work_root, prefix=time.strftime("gui_%Y%m%d_%H%M%S_"))
+            inputs, _ = deck_tape_units(self.deck)
+            for unit in inputs:
+                stage_file(self.endf_path, os.path.join(self.workdir, tape_name(unit)))
+            deck_path = os.path.join(self.workdir, "input")
+            with open(deck_path, 'w') as f:
+                f.write(self.deck + "\n")
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to prepare the run: {str(e)}")
+            return False
+
+        self.process = QProcess(self)
+        self.process.setWorkingDirectory(self.workdir)
+        self.process.setStandardInputFile(deck_path)
+        self.process.setProcessChannelMode(QProcess.MergedChannels)
+        self.process.readyReadStandardOutput.connect(self.read_stdout)
+        self.process.finished.connect(self.process_finished)
+        self.process.errorOccurred.connect(self.process_error)
+        self.started_at = time.monotonic()
+        self.process.start(self.njoy, [])
+        self.tick_timer.start()
+        self.status_label.setText(f"Running {self.njoy} in {self.workdir}")
+        return True
+
+    def read_stdout(self):
+        text = self.partial_line + bytes(self.process.readAllStandardOutput()).decode("utf-8", "replace")
+        lines = text.split("\n")
+        self.partial_line = lines.pop()
+        if not lines:
+            return
+        now = time.monotonic()
+        for line in lines:
+            started = self.timeline.feed(line, now)
+            if started is not None:
+                self.module_started(started)
+        self.stdout_view.append_text("\n".join(lines))
+
+    def module_started(self, index):
+        if index > 0:
+            for row in range(index):
+                if self.table.item(row, STATUS_COLUMN).text() == "running":
+                    self.set_status(row, "done")
+        self.set_status(index, "running")
+        self.table.scrollToItem(self.table.item(index, 0))
+        mod = self.expanded[index]
+        self.status_label.setText(f"Running {mod['name']} (chain row {self.positions[index] + 1}, "
+                                  f"module {index + 1} of {len(self.expanded)})")
+
+    def set_status(self, row, status):
+        item = self.table.item(row, STATUS_COLUMN)
+        item.setText(status)
+        color = {"running": QColor("#f1fa8c"), "done": QColor("#50fa7b"),
+                 "failed": QColor("#ff5555")}.get(status)
+        if color is not None:
+            item.setForeground(color)
+        self.update_elapsed(row, time.monotonic())
+
+    def update_elapsed(self, row, now):
+        elapsed = self.timeline.elapsed(row, now)
+        if elapsed is not None:
+            self.table.item(row, ELAPSED_COLUMN).setText(f"{elapsed:.1f} s")
+
+    def tick(self):
+        now = time.monotonic()
+        if self.timeline.current >= 0:
+            self.update_elapsed(self.timeline.current, now)
+        self.tail_output()
+
+    def tail_output(self):
+        """Show what NJOY appended to its output file since the last tick."""
+        if self.output_file is None:
+            try:
+                self.output_file = open(os.path.join(self.workdir, "output"), 'rb')
+            except OSError:
+                return
+        size = os.fstat(self.output_file.fileno()).st_size
+        position = self.output_file.tell()
+        if size - position > config.RUN_TAIL_CHUNK_BYTES:
+            # Far behind: skip to the newest data rather than reading it all
+            self.output_file.seek(size - config.RUN_TAIL_CHUNK_BYTES)
+            self.output_file.readline()
+            self.output_view.append_text(f"[... {size - position - config.RUN_TAIL_CHUNK_BYTES} bytes skipped ...]")
+        data = self.output_file.read(config.RUN_TAIL_CHUNK_BYTES)
+        cut = data.rfind(b"\n")
+        if cut < 0:
+            self.output_file.seek(-len(data), os.SEEK_CUR)
+            return
+        # Leave an unterminated last line for the next tick
+        self.output_file.seek(cut + 1 - len(data), os.SEEK_CUR)
+        self.output_view.append_text(data[:cut].decode("utf-8", "replace"))
+
+    def process_finished(self, exit_code, exit_status):
+        now = time.monotonic()
+        if self.partial_line:
+            self.timeline.feed(self.partial_line, now)
+            self.stdout_view.append_text(self.partial_line)
+            self.partial_line = ""
+        self.timeline.finish(now)
+        self.tick_timer.stop()
+        self.tail_output()
+        if self.output_file is not None:
+            self.output_file.close()
+            self.output_file = None
+
+        ok = exit_status == QProcess.NormalExit and exit_code == 0
+        current = self.timeline.current
+        if current >= 0:
+            self.set_status(current, "done" if ok else "failed")
+        total = now - self.started_at
+        result = "finished" if ok else f"failed (exit {exit_code})"
+        self.status_label.setText(f"NJOY {result} after {total:.1f} s; tapes in {self.workdir}")
+        self.stop_button.setEnabled(False)
+        self.inspect_button.setEnabled(True)
+
+    def inspect_tape(self):
+        # The main window owns the background indexing and the inspector
+        self.parent().inspect_tape(directory=self.workdir)
+
+    def process_error(self, error):
+        if error == QProcess.FailedToStart:
+            self.tick_timer.stop()
+            self.stop_button.setEnabled(False)
+            self.status_label.setText(f"Could not start '{self.njoy}'. Set the NJOY environment variable "
+                                      "to the NJOY executable.")
+
+    def stop(self):
+        if self.process is not None and self.process.state() != QProcess.NotRunning:
+            self.process.kill()
+
+    def reject(self):
+        # QDialog routes the close button, the window X and Escape through here
+        if self.process is not None and self.process.state() != QProcess.NotRunning:
+            answer = QMessageBox.question(self, "NJOY Run", "NJOY is still running. Stop it?")
+            if answer != QMessageBox.Yes:
+                return
+            self.process.kill()
+            self.process.waitForFinished(3000)
+        super().reject()
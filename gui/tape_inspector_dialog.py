@@ -0,0 +1,95 @@
+# gui/tape_inspector_dialog.py
+import os
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem, QPlainTextEdit,
+    QSplitter, QPushButton, QLabel, QHeaderView
+)
+from PyQt5.QtCore import Qt
+
+from endf_tape import format_temperature, read_section
+import config
+from config import get_dialog_font, get_preview_font
+
+# Bytes of a section shown in the record view
+PREVIEW_BYTES = 64 * 1024
+
+
+class TapeInspectorDialog(QDialog):
+    """Shows the MAT/MF/MT index of a tape and the records of a chosen section."""
+
+    def __init__(self, filepath, index, parent=None):
+        super().__init__(parent)
+        self.filepath = filepath
+        self.setWindowTitle(f"Tape Inspector - {os.path.basename(filepath)}")
+        self.resize(900, 600)
+        self.setFont(get_dialog_font())
+
+        layout = QVBoxLayout(self)
+        materials = index["materials"]
+        sections = sum(len(material["sections"]) for material in materials)
+        header = f"{filepath}: {len(materials)} material(s), {sections} sections"
+        if index["tpid"]:
+            header += f"\n{index['tpid']}"
+        layout.addWidget(QLabel(header))
+
+        splitter = QSplitter(Qt.Horizontal)
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(("Section", "Temperature", "Points", "Bytes"))
+        self.tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.tree.currentItemChanged.connect(self.show_section)
+        self.populate(materials)
+        splitter.addWidget(self.tree)
+
+        self.records_view = QPlainTextEdit()
+        self.records_view.setReadOnly(True)
+        self.records_view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.records_view.setFont(get_preview_font())
+        splitter.addWidget(self.records_view)
+        splitter.setSizes([420, 480])
+        layout.addWidget(splitter)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        close_button = QPushButton("Close")
+        config.set_theme_role(close_button, config.ACTION_BUTTON)
+        close_button.clicked.connect(self.close)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+    def populate(self, materials):
+        for material in materials:
+            temperature = format_temperature(material["temperature"])
+            total = sum(section[3] for section in material["sections"])
+            mat_item = QTreeWidgetItem((f"MAT {material['mat']} (ZA {material['za']:g})",
+                                        temperature, "", f"{total:,}"))
+            files = {}
+            for section in material["sections"]:
+                mf, mt, _, length, np = section
+                mf_item = files.get(mf)
+                if mf_item is None:
+                    mf_item = files[mf] = QTreeWidgetItem((f"MF{mf}", "", "", ""))
+                    mat_item.addChild(mf_item)
+                mt_item = QTreeWidgetItem((f"MT{mt}", "", "" if np is None else str(np), f"{length:,}"))
+                mt_item.setData(0, Qt.UserRole, section)
+                mf_item.addChild(mt_item)
+            for mf_item in files.values():
+                size = sum(mf_item.child(i).data(0, Qt.UserRole)[3] for i in range(mf_item.childCount()))
+                mf_item.setText(3, f"{size:,}")
+            self.tree.addTopLevelItem(mat_item)
+        for column in (1, 2, 3):
+            self.tree.resizeColumnToContents(column)
+
+    def show_section(self, item, previous=None):
+        section = item.data(0, Qt.UserRole) if item is not None else None
+        if section is None:
+            self.records_view.clear()
+            return
+        try:
+            text = read_section(self.filepath, section, PREVIEW_BYTES)
+        except OSError as e:
+            self.records_view.setPlainText(f"Could not read the tape: {e}")
+            return
+        if section[3] > PREVIEW_BYTES:
+            text = text[:text.rfind("\n") + 1] + f"... ({section[3] - PREVIEW_BYTES:,} more bytes)"
+        self.records_view.setPlainText(text)
@@ -0,0 +1,116 @@
+# gui/trace_dialog.py
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QPushButton, QCheckBox, QLabel, QHeaderView, QFileDialog, QMessageBox
+)
+from PyQt5.QtCore import Qt, QTimer
+
+from tracing import tracer
+import config
+from config import get_dialog_font
+
+COLUMNS = ("Span", "Category", "Count", "Total ms", "Mean ms", "Max ms")
+
+# How often the open panel re-reads the collected spans
+REFRESH_INTERVAL_MS = 1000
+
+
+class TraceDialog(QDialog):
+    """Non-modal panel summarizing the spans collected by tracing.tracer."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Trace")
+        self.resize(640, 420)
+        self.setFont(get_dialog_font())
+
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        self.enable_box = QCheckBox("Collect spans")
+        self.enable_box.setChecked(tracer.enabled)
+        self.enable_box.toggled.connect(self.set_enabled)
+        controls.addWidget(self.enable_box)
+        controls.addStretch()
+        self.count_label = QLabel()
+        controls.addWidget(self.count_label)
+        layout.addLayout(controls)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        for text, slot in (("Refresh", self.refresh), ("Clear", self.clear),
+                           ("Export Chrome Trace...", self.export)):
+            button = QPushButton(text)
+            config.set_theme_role(button, config.ACTION_BUTTON)
+            button.clicked.connect(slot)
+            buttons.addWidget(button)
+        buttons.addStretch()
+        close_button = QPushButton("Close")
+        config.set_theme_role(close_button, config.ACTION_BUTTON)
+        close_button.clicked.connect(self.close)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+        # Only polls while the panel is visible
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+        self.refresh()
+
+    def showEvent(self, event):
+        self.enable_box.setChecked(tracer.enabled)
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def set_enabled(self, enabled):
+        if enabled:
+            tracer.enable()
+        else:
+            tracer.disable()
+
+    def refresh(self):
+        rows = tracer.summary()
+        self.count_label.setText(f"{len(tracer.events)} spans")
+        self.table.setUpdatesEnabled(False)
+        self.table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            values = (row["name"], row["category"], str(row["count"]),
+                      f"{row['total_ms']:.3f}", f"{row['mean_ms']:.3f}", f"{row['max_ms']:.3f}")
+            for c, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if c >= 2:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(r, c, item)
+        self.table.setUpdatesEnabled(True)
+
+    def clear(self):
+        tracer.clear()
+        self.refresh()
+
+    def export(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Export Chrome Trace", "trace.json", "Trace Files (*.json);;All Files (*.*)"
+        )
+        if not file_path:
+            return
+        try:
+            count = tracer.export_chrome(file_path)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to export trace: {str(e)}")
+            return
+        QMessageBox.information(
+            self, "Export", f"{count} spans written to {file_path}.\n"
+                            "Open it in chrome://tracing or ui.perfetto.dev."
+        )
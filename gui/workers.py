@@ -0,0 +1,67 @@
+# gui/workers.py
+import time
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from fileio import OperationCancelled
+
+# Minimum interval between progress signals, so a 100k-module save does
+# not flood the GUI thread's event queue
+PROGRESS_INTERVAL = 0.05
+
+
+class WorkerSignals(QObject):
+    # done, total (0 while the total is unknown)
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class Worker(QRunnable):
+    """
+    Runs func(*args, progress=..., **kwargs) on the global thread pool.
+
+    func reports through the progress callback it is given; once cancel()
+    has been called that callback raises OperationCancelled, so func
+    stops at its next report. Exactly one of finished(result), failed(message)
+    or cancelled() is emitted.
+    """
+
+    def __init__(self, func, *args, **kwargs):
+        super().__init__()
+        # The window keeps a reference until a final signal arrives
+        self.setAutoDelete(False)
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self.is_cancelled = False
+        self.last_report = 0.0
+
+    def cancel(self):
+        self.is_cancelled = True
+
+    def report_progress(self, done, total=None):
+        if self.is_cancelled:
+            raise OperationCancelled()
+        now = time.monotonic()
+        if now - self.last_report >= PROGRESS_INTERVAL or done == total:
+            self.last_report = now
+            self.signals.progress.emit(done, total or 0)
+
+    def run(self):
+        try:
+            result = self.func(*self.args, progress=self.report_progress, **self.kwargs)
+        except OperationCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            if self.is_cancelled:
+                self.signals.cancelled.emit()
+            else:
+                self.signals.finished.emit(result)
+
+    def start(self):
+        QThreadPool.globalInstance().start(self)
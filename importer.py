@@ -0,0 +1,411 @@
+# importer.py
+
+"""
+Streaming importer for existing NJOY input decks.
+
+Decks are read record by record and module by module, so a multi-MB
+deck is never held in memory. Cards are mapped back onto the parameter
+names of modules/*.json and MAT numbers back onto isotope symbols.
+
+Usage:
+    python importer.py decks/*.njoy -o workflows -j 16 [--render]
+"""
+
+import argparse
+import os
+import re
+import sys
+from multiprocessing import Pool
+
+from model import TAPE_UNITS, create_module, load_isotope_table, parameter_index
+from isotope_table import UnknownIsotopeError
+from renderer import render_deck
+from tracing import span
+from workflow import save_workflow
+
+# Every NJOY module keyword, so unsupported modules can be skipped cleanly
+NJOY_MODULES = {
+    "moder", "reconr", "broadr", "unresr", "heatr", "thermr", "groupr",
+    "gaminr", "errorr", "covr", "dtfr", "ccccr", "matxsr", "resxsr", "acer",
+    "powr", "wimsr", "plotr", "viewr", "mixr", "purr", "leapr", "gaspr", "stop",
+}
+
+TOKEN_PATTERN = re.compile(r"'[^']*'|\"[^\"]*\"|/|[^\s,/]+")
+
+IPRINT_OPTIONS = {"0": "min", "1": "max", "2": "check"}
+LOCAL_OPTIONS = {"0": "Transported", "1": "Deposited"}
+
+
+class DeckImportError(ValueError):
+    """Raised when a deck cannot be mapped onto the GUI's modules."""
+
+    def __init__(self, message, lineno=None):
+        if lineno is not None:
+            message = f"line {lineno}: {message}"
+        super().__init__(message)
+        self.lineno = lineno
+
+
+class EndOfModule(Exception):
+    """A card was requested but the next record starts another module."""
+
+
+class Record:
+    """One input line split into tokens."""
+
+    __slots__ = ("tokens", "terminated", "lineno")
+
+    def __init__(self, tokens, terminated, lineno):
+        self.tokens = tokens
+        self.terminated = terminated
+        self.lineno = lineno
+
+    @property
+    def keyword(self):
+        if len(self.tokens) == 1 and not self.terminated and self.tokens[0].lower() in NJOY_MODULES:
+            return self.tokens[0].lower()
+        return None
+
+
+def tokenize(line):
+    """Return (tokens, terminated) for one line; text after '/' is ignored."""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(line):
+        if token == "/":
+            return tokens, True
+        if token[0] in "'\"":
+            token = token[1:-1]
+        tokens.append(token)
+    return tokens, False
+
+
+class CardReader:
+    """Pulls records lazily from an iterable of lines."""
+
+    def __init__(self, lines):
+        self.lines = iter(lines)
+        self.lineno = 0
+        self.pushed = None
+
+    def next_record(self):
+        if self.pushed is not None:
+            record, self.pushed = self.pushed, None
+            return record
+        for line in self.lines:
+            self.lineno += 1
+            stripped = line.strip()
+            # Blank lines and '--' comment lines carry no data
+            if not stripped or stripped.startswith("--"):
+                continue
+            tokens, terminated = tokenize(stripped)
+            return Record(tokens, terminated, self.lineno)
+        return None
+
+    def push_back(self, record):
+        self.pushed = record
+
+    def card(self, count=None):
+        """
+        Return the tokens of the next card.
+
+        With count, a card that is not terminated by '/' continues on the
+        following lines until count values have been read, as in
+        Fortran list-directed input.
+        """
+        record = self.next_record()
+        if record is None or record.keyword:
+            self.push_back(record)
+            raise EndOfModule()
+        tokens = list(record.tokens)
+        while count is not None and len(tokens) < count and not record.terminated:
+            record = self.next_record()
+            if record is None or record.keyword:
+                self.push_back(record)
+                break
+            tokens.extend(record.tokens)
+        return tokens
+
+    def skip_module(self):
+        """Discard records up to the next module keyword."""
+        skipped = 0
+        while True:
+            record = self.next_record()
+            if record is None or record.keyword:
+                self.push_back(record)
+                return skipped
+            skipped += 1
+
+
+def to_number(token):
+    """Parse an NJOY number, including Fortran 'd' exponents."""
+    text = token.replace("d", "e").replace("D", "e")
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def number_text(token):
+    """Normalize a numeric token for space-separated list parameters."""
+    return token.replace("d", "e").replace("D", "e")
+
+
+class ModuleParser:
+    """Maps the cards of one module block back onto its parameters."""
+
+    def __init__(self, reader, isotopes, warnings):
+        self.reader = reader
+        self.isotopes = isotopes
+        self.warnings = warnings
+
+    def warn(self, message):
+        self.warnings.append(f"line {self.reader.lineno}: {message}")
+
+    def symbol(self, token):
+        mat = int(to_number(token))
+        try:
+            return self.isotopes.symbol(mat)
+        except UnknownIsotopeError:
+            raise DeckImportError(f"MAT {mat} is not in isotopes.json", self.reader.lineno) from None
+
+    def materials(self, symbols):
+        """A block with several materials keeps them all as a list."""
+        return symbols[0] if len(symbols) == 1 else symbols
+
+    def unit_card(self, module_name, parameters):
+        tokens = self.reader.card()
+        for (p_name, _), token in zip(TAPE_UNITS[module_name], tokens):
+            parameters[p_name] = int(to_number(token))
+
+    def parse(self, module_name):
+        parameters = {}
+        self.unit_card(module_name, parameters)
+        parse_cards = getattr(self, f"parse_{module_name.lower()}", None)
+        if parse_cards is not None:
+            parse_cards(parameters)
+        return parameters
+
+    def parse_reconr(self, p):
+        self.reader.card()  # card 2: tape label
+        mats = []
+        while True:
+            card3 = self.reader.card()
+            mat = int(to_number(card3[0])) if card3 else 0
+            if mat == 0:
+                break
+            ncards = int(card3[1]) if len(card3) > 1 else 0
+            ngrid = int(card3[2]) if len(card3) > 2 else 0
+            card4 = self.reader.card()
+            if not mats:
+                for p_name, token in zip(("err", "tempr", "errmax", "errint"), card4):
+                    p[p_name] = float(to_number(token))
+            for _ in range(ncards):
+                self.reader.card()  # card 5: descriptive text
+            if ngrid:
+                self.reader.card(ngrid)  # card 6: user grid points
+            mats.append(self.symbol(card3[0]))
+        if mats:
+            p["mat"] = self.materials(mats)
+
+    def parse_broadr(self, p):
+        card2 = self.reader.card()
+        ntemp2 = int(card2[1])
+        mats = [self.symbol(card2[0])]
+        card3 = self.reader.card()
+        for p_name, token in zip(("errthn", "thnmax", "errmax", "errint"), card3):
+            p[p_name] = float(to_number(token))
+        p["temp2"] = " ".join(number_text(t) for t in self.reader.card(ntemp2)[:ntemp2])
+        p["ntemp2"] = ntemp2
+        while True:
+            card5 = self.reader.card()
+            if not card5 or int(to_number(card5[0])) == 0:
+                break
+            mats.append(self.symbol(card5[0]))
+        p["mat"] = self.materials(mats)
+
+    def parse_heatr(self, p):
+        card2 = self.reader.card()
+        p["matd"] = self.symbol(card2[0])
+        npk = int(card2[1]) if len(card2) > 1 else 0
+        nqa = int(card2[2]) if len(card2) > 2 else 0
+        if len(card2) > 4:
+            p["local"] = LOCAL_OPTIONS.get(card2[4])
+        if len(card2) > 5:
+            p["iprint"] = IPRINT_OPTIONS.get(card2[5])
+        if len(card2) > 6:
+            p["ed"] = float(to_number(card2[6]))
+        if npk:
+            p["mtk"] = " ".join(self.reader.card(npk)[:npk])
+        if nqa:
+            self.reader.card(nqa)  # card 4: mta
+            self.reader.card(nqa)  # card 5: qa
+            self.warn("HEATR user Q values (nqa) are not supported and were dropped")
+
+    def parse_purr(self, p):
+        self.parse_unresolved(p, ("nbin", "nladr", "iprint", "nunx"))
+
+    def parse_unresr(self, p):
+        self.parse_unresolved(p, ("iprint",))
+
+    def parse_unresolved(self, p, extra_names):
+        mats = []
+        while True:
+            card2 = self.reader.card()
+            if not card2 or int(to_number(card2[0])) == 0:
+                break
+            ntemp = int(card2[1])
+            nsigz = int(card2[2])
+            temps = self.reader.card(ntemp)[:ntemp]
+            sigz = self.reader.card(nsigz)[:nsigz]
+            if not mats:
+                for p_name, token in zip(extra_names, card2[3:]):
+                    if p_name == "iprint":
+                        p[p_name] = IPRINT_OPTIONS.get(token)
+                    else:
+                        p[p_name] = int(to_number(token))
+                p["temp"] = " ".join(number_text(t) for t in temps)
+                p["sigz"] = " ".join(number_text(t) for t in sigz)
+                p["ntemp"] = ntemp
+                p["nsigz"] = nsigz
+            mats.append(self.symbol(card2[0]))
+        if mats:
+            p["matd"] = self.materials(mats)
+
+    def parse_acer(self, p):
+        card2 = self.reader.card()
+        p["iopt"] = card2[0]
+        if len(card2) > 1:
+            p["iprint"] = IPRINT_OPTIONS.get(card2[1])
+        if len(card2) > 2:
+            p["itype"] = card2[2]
+        if len(card2) > 3:
+            p["suff"] = float(to_number(card2[3]))
+        nxtra = int(card2[4]) if len(card2) > 4 else 0
+        self.reader.card()  # card 3: hk label, regenerated on render
+        if nxtra:
+            self.reader.card(2 * nxtra)  # card 4: iz/aw pairs
+        if card2[0] != "1":
+            self.warn(f"ACER iopt={card2[0]} cards beyond card 3 are not mapped")
+            return
+        card5 = self.reader.card()
+        p["matd"] = self.symbol(card5[0])
+        if len(card5) > 1:
+            p["tempd"] = float(to_number(card5[1]))
+        # Cards 6 and 7 (newfor/iopt2, thin) are always written as defaults
+        for _ in range(2):
+            try:
+                self.reader.card()
+            except EndOfModule:
+                break
+
+
+def iter_deck_modules(lines, warnings=None, isotopes=None):
+    """
+    Yield workflow module dicts for the supported modules of a deck.
+
+    lines may be any iterable of lines, e.g. an open file, which keeps
+    memory flat for large decks. Unsupported modules are skipped with a
+    warning appended to warnings.
+    """
+    warnings = warnings if warnings is not None else []
+    isotopes = isotopes if isotopes is not None else load_isotope_table()
+    reader = CardReader(lines)
+    parser = ModuleParser(reader, isotopes, warnings)
+
+    while True:
+        record = reader.next_record()
+        if record is None:
+            return
+        keyword = record.keyword
+        if keyword is None:
+            warnings.append(f"line {record.lineno}: card outside any module ignored")
+            continue
+        if keyword == "stop":
+            return
+
+        module_name = keyword.upper()
+        if module_name not in TAPE_UNITS:
+            reader.skip_module()
+            warnings.append(f"line {record.lineno}: unsupported module {keyword} skipped")
+            continue
+
+        try:
+            parameters = parser.parse(module_name)
+        except EndOfModule:
+            raise DeckImportError(f"{keyword} block ends before all its cards were read", reader.lineno)
+        except (ValueError, IndexError) as e:
+            if isinstance(e, DeckImportError):
+                raise
+            raise DeckImportError(f"cannot parse {keyword} block: {e}", reader.lineno) from None
+
+        if reader.skip_module():
+            warnings.append(f"line {record.lineno}: extra cards after {keyword} ignored")
+        yield create_module(module_name, coerce_parameters(module_name, parameters))
+
+
+def coerce_parameters(module_name, parameters):
+    """Give imported values the types the GUI stores for them."""
+    index = parameter_index(module_name)
+    for p_name, value in parameters.items():
+        spec = index.get(p_name)
+        if spec is not None and spec.type == "int" and isinstance(value, float):
+            parameters[p_name] = int(value)
+    return parameters
+
+
+def import_deck(filepath):
+    """Return (modules, warnings) for a deck file."""
+    warnings = []
+    with span("import_deck", "io"), open(filepath, 'r') as f:
+        modules = list(iter_deck_modules(f, warnings))
+    return modules, warnings
+
+
+def import_to_file(args):
+    """Import one deck and write its workflow (and optionally a re-render). Runs in a worker."""
+    filepath, output_dir, render = args
+    stem = os.path.splitext(os.path.basename(filepath))[0]
+    try:
+        modules, warnings = import_deck(filepath)
+        save_workflow(os.path.join(output_dir, f"{stem}.jsonl"), modules, source=filepath)
+        if render:
+            with open(os.path.join(output_dir, f"{stem}.njoy"), 'w') as f:
+                f.write(render_deck(modules, load_isotope_table()))
+                f.write("\n")
+        return filepath, warnings, None
+    except (OSError, ValueError, LookupError) as e:
+        # DeckImportError, and RenderError/UnknownIsotopeError from --render,
+        # fail this deck only, not the whole pool
+        return filepath, [], str(e)
+
+
+def import_archive(filepaths, output_dir, processes=None, render=False):
+    """Import decks in a worker pool; yields (path, warnings, error) per deck."""
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = ((filepath, output_dir, render) for filepath in filepaths)
+    with Pool(processes) as pool:
+        for result in pool.imap_unordered(import_to_file, tasks, chunksize=8):
+            yield result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import NJOY input decks as GUI workflows.")
+    parser.add_argument("decks", nargs="+", help="NJOY input decks")
+    parser.add_argument("-o", "--output-dir", required=True, help="Directory for the workflow files")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--render", action="store_true", help="Also write each workflow re-rendered as a deck")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for filepath, warnings, error in import_archive(args.decks, args.output_dir, args.jobs, args.render):
+        if error:
+            failures += 1
+            print(f"{filepath}: error: {error}")
+        for warning in warnings:
+            print(f"{filepath}: {warning}")
+    print(f"Imported {len(args.decks) - failures} of {len(args.decks)} decks")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+# isotope_table.py
+
+"""
+Indexed isotope table built once from resources/isotopes.json.
+
+Columns are stored in contiguous arrays sorted by symbol, with secondary
+sort orders for MAT and ZA lookups, so resolving materials never builds
+per-call dictionaries.
+"""
+
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+
+# Element symbols indexed by atomic number (index 0 is the neutron)
+ELEMENTS = (
+    "n", "H", "He", "Li", "Be", "B", "C", "N", "O", "F", "Ne",
+    "Na", "Mg", "Al", "Si", "P", "S", "Cl", "Ar", "K", "Ca",
+    "Sc", "Ti", "V", "Cr", "Mn", "Fe", "Co", "Ni", "Cu", "Zn",
+    "Ga", "Ge", "As", "Se", "Br", "Kr", "Rb", "Sr", "Y", "Zr",
+    "Nb", "Mo", "Tc", "Ru", "Rh", "Pd", "Ag", "Cd", "In", "Sn",
+    "Sb", "Te", "I", "Xe", "Cs", "Ba", "La", "Ce", "Pr", "Nd",
+    "Pm", "Sm", "Eu", "Gd", "Tb", "Dy", "Ho", "Er", "Tm", "Yb",
+    "Lu", "Hf", "Ta", "W", "Re", "Os", "Ir", "Pt", "Au", "Hg",
+    "Tl", "Pb", "Bi", "Po", "At", "Rn", "Fr", "Ra", "Ac", "Th",
+    "Pa", "U", "Np", "Pu", "Am", "Cm", "Bk", "Cf", "Es", "Fm",
+)
+ATOMIC_NUMBERS = {symbol: z for z, symbol in enumerate(ELEMENTS)}
+
+SYMBOL_PATTERN = re.compile(r"([A-Z][a-z]*)(\d+)(m?)")
+
+
+class UnknownIsotopeError(LookupError):
+    """Raised when an isotope symbol or MAT number is not in the table."""
+
+    def __init__(self, symbol):
+        super().__init__(f"Unknown isotope '{symbol}'")
+        self.symbol = symbol
+
+
+def parse_symbol(symbol, mat=0):
+    """Return (Z, A, metastable) for a symbol such as 'U235' or 'Am242m'."""
+    match = SYMBOL_PATTERN.match(symbol)
+    if match is None:
+        return mat // 100, 0, 0
+    element, mass, meta = match.groups()
+    # The MAT number encodes Z for every element but Fm; use it as a fallback
+    z = ATOMIC_NUMBERS.get(element, mat // 100)
+    return z, int(mass), 1 if meta else 0
+
+
+class IsotopeTable:
+    """Symbol <-> MAT table with Z, A and metastable columns."""
+
+    def __init__(self, mapping):
+        self.symbols = sorted(mapping)
+        self.mats = array('i', (int(mapping[s]) for s in self.symbols))
+        self.z = array('H')
+        self.a = array('H')
+        self.meta = array('B')
+        for symbol, mat in zip(self.symbols, self.mats):
+            z, a, meta = parse_symbol(symbol, mat)
+            self.z.append(z)
+            self.a.append(a)
+            self.meta.append(meta)
+
+        self._rows = {symbol: row for row, symbol in enumerate(self.symbols)}
+
+        mat_order = sorted(range(len(self.symbols)), key=self.mats.__getitem__)
+        self._mat_rows = array('i', mat_order)
+        self._mat_keys = array('i', (self.mats[row] for row in mat_order))
+
+        za_order = sorted(range(len(self.symbols)), key=self.za_of_row)
+        self._za_rows = array('i', za_order)
+        self._za_keys = array('i', (self.za_of_row(row) for row in za_order))
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self._rows
+
+    def keys(self):
+        return self.symbols
+
+    def za_of_row(self, row):
+        return self.z[row] * 1000 + self.a[row]
+
+    def row(self, symbol):
+        try:
+            return self._rows[symbol]
+        except (KeyError, TypeError):
+            raise UnknownIsotopeError(symbol) from None
+
+    def mat(self, symbol):
+        """Return the MAT number of a symbol, raising UnknownIsotopeError."""
+        return self.mats[self.row(symbol)]
+
+    def get(self, symbol, default=None):
+        row = self._rows.get(symbol)
+        return default if row is None else self.mats[row]
+
+    def za(self, symbol):
+        return self.za_of_row(self.row(symbol))
+
+    def symbol(self, mat):
+        """Return the symbol for a MAT number, raising UnknownIsotopeError."""
+        i = bisect_left(self._mat_keys, mat)
+        if i == len(self._mat_keys) or self._mat_keys[i] != mat:
+            raise UnknownIsotopeError(mat)
+        return self.symbols[self._mat_rows[i]]
+
+    def by_za(self, za):
+        """Return the symbols with a given ZA (ground state first)."""
+        lo = bisect_left(self._za_keys, za)
+        hi = bisect_right(self._za_keys, za)
+        rows = sorted(self._za_rows[lo:hi], key=self.meta.__getitem__)
+        return [self.symbols[row] for row in rows]
+
+    def with_prefix(self, prefix):
+        """Return the symbols starting with prefix, in sorted order."""
+        lo = bisect_left(self.symbols, prefix)
+        hi = bisect_left(self.symbols, prefix + "\uffff")
+        return self.symbols[lo:hi]
+
+    def resolve(self, symbols):
+        """
+        Return (mats, unknown) for an iterable of symbols.
+
+        mats is an array of MAT numbers (0 where unknown) and unknown lists
+        the symbols that are not in the table.
+        """
+        rows = self._rows
+        mats = self.mats
+        resolved = array('i')
+        unknown = []
+        for symbol in symbols:
+            row = rows.get(symbol)
+            if row is None:
+                unknown.append(symbol)
+                resolved.append(0)
+            else:
+                resolved.append(mats[row])
+        return resolved, unknown
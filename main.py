@@ -1,16 +1,74 @@
 # main.py
 
 import sys
-from PyQt5.QtWidgets import QApplication
-import qdarkstyle
-from gui.main_window import MainWindow
-import config  # Import config if not already imported
+import time
 
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    app.setStyleSheet(qdarkstyle.load_stylesheet_pyqt5())
+MODULES_AVAILABLE = ["MODER", "RECONR", "BROADR", "HEATR", "PURR", "UNRESR", "GASPR", "ACER", "VIEWR"]
+
+PROFILE_FLAG = "--profile-startup"
+
+
+class StartupProfiler:
+    """Records the wall time of each startup phase for --profile-startup."""
+
+    def __init__(self):
+        self.start = self.last = time.perf_counter()
+        self.phases = []
+
+    def phase(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    def report(self):
+        lines = ["Startup profile:"]
+        for name, elapsed in self.phases:
+            lines.append(f"  {name:<24} {elapsed * 1000:8.1f} ms")
+        lines.append(f"  {'total':<24} {(self.last - self.start) * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+
+def main(argv):
+    profile = PROFILE_FLAG in argv
+    argv = [arg for arg in argv if arg != PROFILE_FLAG]
+    profiler = StartupProfiler()
 
-    modules_available = ["MODER", "RECONR", "BROADR", "HEATR", "PURR", "UNRESR", "GASPR", "ACER", "VIEWR"]
-    window = MainWindow(modules_available)
+    # Dialogs, QtWebEngine and module schemas are imported/parsed on first use
+    from PyQt5.QtCore import Qt, QCoreApplication, QTimer
+    from PyQt5.QtWidgets import QApplication
+    from gui.main_window import MainWindow
+    import config
+    profiler.phase("imports")
+
+    # Lets gui/pdf_viewer_dialog.py import QtWebEngine after the application exists
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    app = QApplication(argv)
+    profiler.phase("application")
+
+    app.setStyleSheet(config.load_app_stylesheet())
+    profiler.phase("stylesheet")
+
+    window = MainWindow(MODULES_AVAILABLE)
     window.show()
-    sys.exit(app.exec_())
+    profiler.phase("main window")
+
+    if profile:
+        def report_startup():
+            profiler.phase("first paint")
+            # Schema parsing is deferred; time it here so it stays visible
+            from model import load_isotope_table, load_module
+            for module_name in MODULES_AVAILABLE:
+                load_module(module_name)
+            load_isotope_table()
+            profiler.phase("schema load (deferred)")
+            print(profiler.report(), file=sys.stderr)
+            app.quit()
+
+        # Runs once the event loop has painted the window
+        QTimer.singleShot(0, report_startup)
+
+    return app.exec_()
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,534 @@
+# manual_index.py
+
+"""
+Full-text index over the module manuals in resources/*.pdf.
+
+Text is extracted once with a small PDF reader that handles what the
+manuals use: FlateDecode streams, object streams, the page tree and
+Tj/TJ text operators with each font's /Differences encoding. The
+extracted pages and an inverted index (term -> pages) are stored in
+~/.cache/njoygui/manual_index.json. A manual is re-extracted only when
+its size or modification time changes.
+
+Usage:
+    python manual_index.py nladr errint       # search all manuals
+    python manual_index.py --module PURR nbin
+    python manual_index.py --rebuild
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import zlib
+
+from model import BASE_DIR
+from tracing import span
+
+RESOURCES_DIR = os.path.join(BASE_DIR, "resources")
+INDEX_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "njoygui", "manual_index.json"
+)
+INDEX_VERSION = 1
+
+SNIPPET_CHARS = 240
+TERM_RE = re.compile(r"[a-z0-9_]{2,}")
+
+# Glyph names used by TeX font encodings that are not single characters
+GLYPH_NAMES = {
+    "space": " ", "exclam": "!", "quotedbl": '"', "numbersign": "#", "dollar": "$",
+    "percent": "%", "ampersand": "&", "quoteright": "'", "quotesingle": "'",
+    "parenleft": "(", "parenright": ")", "asterisk": "*", "plus": "+", "comma": ",",
+    "hyphen": "-", "minus": "-", "period": ".", "slash": "/", "zero": "0", "one": "1",
+    "two": "2", "three": "3", "four": "4", "five": "5", "six": "6", "seven": "7",
+    "eight": "8", "nine": "9", "colon": ":", "semicolon": ";", "less": "<", "equal": "=",
+    "greater": ">", "question": "?", "at": "@", "bracketleft": "[", "backslash": "\\",
+    "bracketright": "]", "asciicircum": "^", "underscore": "_", "quoteleft": "'",
+    "grave": "`", "braceleft": "{", "bar": "|", "braceright": "}", "asciitilde": "~",
+    "quotedblleft": '"', "quotedblright": '"', "quotedblbase": '"', "endash": "-",
+    "emdash": "-", "ff": "ff", "fi": "fi", "fl": "fl", "ffi": "ffi", "ffl": "ffl",
+    "bullet": "*", "periodcentered": ".", "multiply": "x", "degree": " deg",
+}
+
+OBJECT_RE = re.compile(rb"(\d+)\s+\d+\s+obj\b")
+REF_RE = rb"\s+(\d+)\s+\d+\s+R"
+WHITESPACE = b" \t\r\n\f\x00"
+
+
+class PdfError(ValueError):
+    """Raised when a manual cannot be read by the minimal PDF reader."""
+
+
+def dict_ref(body, key):
+    """Return the object number of `/key N 0 R` in a dictionary, or None."""
+    m = re.search(rb"/" + key + REF_RE, body)
+    return int(m.group(1)) if m else None
+
+
+def dict_refs(body, key):
+    """Return the object numbers of `/key [N 0 R ...]` or `/key N 0 R`."""
+    m = re.search(rb"/" + key + rb"\s*\[([^\]]*)\]", body)
+    if m:
+        return [int(n) for n in re.findall(rb"(\d+)\s+\d+\s+R", m.group(1))]
+    ref = dict_ref(body, key)
+    return [ref] if ref is not None else []
+
+
+def inline_dict(body, key):
+    """Return the text of an inline `/key << ... >>` dictionary, or None."""
+    m = re.search(rb"/" + key + rb"\s*<<", body)
+    if not m:
+        return None
+    depth = 1
+    i = m.end()
+    while i < len(body) and depth:
+        if body.startswith(b"<<", i):
+            depth += 1
+            i += 2
+        elif body.startswith(b">>", i):
+            depth -= 1
+            i += 2
+        else:
+            i += 1
+    return body[m.end():i - 2]
+
+
+class PdfDocument:
+    """The objects of one PDF file, enough to walk its pages and text."""
+
+    def __init__(self, filepath):
+        with open(filepath, 'rb') as f:
+            data = f.read()
+        if not data.startswith(b"%PDF"):
+            raise PdfError(f"{filepath}: not a PDF file")
+        self.objects = {}
+        for m in OBJECT_RE.finditer(data):
+            end = data.find(b"endobj", m.end())
+            self.objects[int(m.group(1))] = self.split_stream(data[m.end():end])
+        for number, (body, stream) in list(self.objects.items()):
+            if stream is not None and re.search(rb"/Type\s*/ObjStm", body):
+                self.unpack_object_stream(body, stream)
+        self.encodings = {}
+
+    @staticmethod
+    def split_stream(body):
+        """Return (dictionary, decoded stream or None) for an object body."""
+        start = body.find(b"stream")
+        if start < 0:
+            return body, None
+        dictionary = body[:start]
+        start += 6
+        if body.startswith(b"\r\n", start):
+            start += 2
+        elif body[start:start + 1] in (b"\n", b"\r"):
+            start += 1
+        stream = body[start:body.rfind(b"endstream")]
+        if b"/FlateDecode" in dictionary:
+            try:
+                stream = zlib.decompressobj().decompress(stream)
+            except zlib.error as e:
+                raise PdfError(f"bad FlateDecode stream: {e}")
+        elif b"/Filter" in dictionary:
+            # Other filters (images) never hold text
+            stream = b""
+        return dictionary, stream
+
+    def unpack_object_stream(self, body, stream):
+        count = int(re.search(rb"/N\s+(\d+)", body).group(1))
+        first = int(re.search(rb"/First\s+(\d+)", body).group(1))
+        header = [int(n) for n in stream[:first].split()]
+        offsets = [(header[2 * i], header[2 * i + 1]) for i in range(count)]
+        for i, (number, offset) in enumerate(offsets):
+            end = offsets[i + 1][1] if i + 1 < count else len(stream) - first
+            # Objects stored directly in the file take precedence
+            self.objects.setdefault(number, (stream[first + offset:first + end], None))
+
+    def body(self, number):
+        return self.objects.get(number, (b"", None))[0]
+
+    def pages(self):
+        """Return the page dictionaries in page order."""
+        catalog = next((body for body, _ in self.objects.values()
+                        if re.search(rb"/Type\s*/Catalog", body)), None)
+        if catalog is None:
+            raise PdfError("no document catalog")
+        pages = []
+        stack = [dict_ref(catalog, b"Pages")]
+        seen = set()
+        while stack:
+            number = stack.pop()
+            if number is None or number in seen:
+                continue
+            seen.add(number)
+            node = self.body(number)
+            if re.search(rb"/Type\s*/Pages\b", node):
+                stack.extend(reversed(dict_refs(node, b"Kids")))
+            else:
+                pages.append(node)
+        return pages
+
+    def font_encodings(self, page):
+        """Return {font resource name: {code: text}} for a page."""
+        resources = inline_dict(page, b"Resources")
+        if resources is None:
+            resources = self.body(dict_ref(page, b"Resources"))
+        fonts = inline_dict(resources, b"Font")
+        if fonts is None:
+            fonts = self.body(dict_ref(resources, b"Font"))
+        encodings = {}
+        for name, number in re.findall(rb"/([^\s/<>\[\]()]+)" + REF_RE, fonts):
+            encodings[name] = self.font_encoding(int(number))
+        return encodings
+
+    def font_encoding(self, number):
+        encoding = self.encodings.get(number)
+        if encoding is None:
+            font = self.body(number)
+            differences = inline_dict(font, b"Encoding")
+            if differences is None:
+                differences = self.body(dict_ref(font, b"Encoding"))
+            encoding = {}
+            m = re.search(rb"/Differences\s*\[([^\]]*)\]", differences or b"")
+            if m:
+                code = 0
+                for token in m.group(1).split():
+                    if token.startswith(b"/"):
+                        name = token[1:].decode("latin-1")
+                        encoding[code] = GLYPH_NAMES.get(name, name if len(name) == 1 else "")
+                        code += 1
+                    else:
+                        code = int(token)
+            self.encodings[number] = encoding
+        return encoding
+
+    def page_text(self, page):
+        streams = [self.objects.get(n, (b"", None))[1] or b"" for n in dict_refs(page, b"Contents")]
+        return content_text(b"\n".join(streams), self.font_encodings(page))
+
+    def texts(self):
+        """Return the extracted text of every page."""
+        return [self.page_text(page) for page in self.pages()]
+
+
+def content_tokens(data):
+    """
+    Yield (kind, value) tokens of a content stream.
+
+    kind is "string" (bytes), "number" (float), "name", "[" / "]" or
+    "op". Inline images and dictionaries are skipped.
+    """
+    i = 0
+    n = len(data)
+    while i < n:
+        c = data[i]
+        if c in WHITESPACE:
+            i += 1
+        elif c == 0x25:  # % comment
+            end = data.find(b"\n", i)
+            i = n if end < 0 else end + 1
+        elif c == 0x28:  # ( literal string )
+            out = bytearray()
+            depth = 1
+            i += 1
+            while i < n:
+                c = data[i]
+                if c == 0x5C:  # backslash escape
+                    i += 1
+                    e = data[i:i + 1]
+                    if e in b"01234567":
+                        digits = re.match(rb"[0-7]{1,3}", data[i:i + 3]).group()
+                        out.append(int(digits, 8) & 0xFF)
+                        i += len(digits)
+                        continue
+                    out += {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b",
+                            b"f": b"\f", b"\n": b"", b"\r": b""}.get(e, e)
+                elif c == 0x28:
+                    depth += 1
+                    out.append(c)
+                elif c == 0x29:
+                    depth -= 1
+                    if depth == 0:
+                        i += 1
+                        break
+                    out.append(c)
+                else:
+                    out.append(c)
+                i += 1
+            yield "string", bytes(out)
+        elif c == 0x3C:  # < hex string > or << dictionary >>
+            if data.startswith(b"<<", i):
+                end = data.find(b">>", i)
+                i = n if end < 0 else end + 2
+                continue
+            end = data.find(b">", i)
+            end = n if end < 0 else end
+            digits = re.sub(rb"\s", b"", data[i + 1:end])
+            if len(digits) % 2:
+                digits += b"0"
+            yield "string", bytes.fromhex(digits.decode("ascii", "replace"))
+            i = end + 1
+        elif c in b"[]":
+            yield chr(c), None
+            i += 1
+        elif c == 0x2F:  # /name
+            m = re.match(rb"/[^\s/<>\[\]()%{}]*", data[i:i + 128])
+            yield "name", m.group()[1:]
+            i += len(m.group())
+        else:
+            m = re.match(rb"[^\s/<>\[\]()%{}]+", data[i:i + 64])
+            if m is None:
+                i += 1
+                continue
+            word = m.group()
+            i += len(word)
+            try:
+                yield "number", float(word)
+            except ValueError:
+                if word == b"BI":
+                    # Inline image data is binary; resume after EI
+                    end = data.find(b"EI", i)
+                    i = n if end < 0 else end + 2
+                    continue
+                yield "op", word
+
+
+def content_text(data, encodings):
+    """Extract the text shown by a page's content stream."""
+    parts = []
+    operands = []
+    encoding = {}
+
+    def show(raw):
+        parts.append("".join(encoding.get(b, chr(b) if 32 <= b < 127 else "") for b in raw))
+
+    for kind, value in content_tokens(data):
+        if kind != "op":
+            operands.append((kind, value))
+            continue
+        if value == b"Tf":
+            names = [v for k, v in operands if k == "name"]
+            if names:
+                encoding = encodings.get(names[-1], {})
+        elif value in (b"Tj", b"'", b'"'):
+            if value != b"Tj":
+                parts.append("\n")
+            for k, v in operands:
+                if k == "string":
+                    show(v)
+        elif value == b"TJ":
+            for k, v in operands:
+                if k == "string":
+                    show(v)
+                elif k == "number" and v < -200:
+                    # A large kern inside TJ is a word space
+                    parts.append(" ")
+        elif value in (b"Td", b"TD"):
+            numbers = [v for k, v in operands if k == "number"]
+            parts.append("\n" if len(numbers) == 2 and numbers[1] != 0 else " ")
+        elif value in (b"T*", b"ET"):
+            parts.append("\n")
+        elif value == b"Tm":
+            parts.append("\n")
+        operands = []
+    text = "".join(parts)
+    # Hyphenated line breaks join back into one word
+    text = re.sub(r"(\w)-\n(\w)", r"\1\2", text)
+    return re.sub(r"[ \t]+", " ", text)
+
+
+def page_terms(text):
+    """Return {term: count} for one page of text."""
+    counts = {}
+    for term in TERM_RE.findall(text.lower()):
+        counts[term] = counts.get(term, 0) + 1
+    return counts
+
+
+def manual_stamp(filepath):
+    stat = os.stat(filepath)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class ManualIndex:
+    """
+    Inverted index over the manual pages.
+
+    terms maps each term to {(manual, page): count}, where manual is the
+    PDF's name without extension (e.g. "purr") and page is 1-based.
+    """
+
+    def __init__(self, manuals):
+        # {manual: {"stamp": [...], "pages": [text, ...], "terms": {term: {page: count}}}}
+        self.manuals = manuals
+        self.terms = {}
+        for manual, entry in manuals.items():
+            for term, pages in entry["terms"].items():
+                postings = self.terms.setdefault(term, {})
+                for page, count in pages.items():
+                    postings[(manual, int(page))] = count
+
+    def page_text(self, manual, page):
+        return self.manuals[manual]["pages"][page - 1]
+
+    def search(self, query, manual=None, limit=20):
+        """
+        Return the best pages for all words of query as
+        [(manual, page, score, snippet)], best first.
+        """
+        words = TERM_RE.findall(query.lower())
+        if not words:
+            return []
+        scores = None
+        for word in words:
+            postings = self.terms.get(word, {})
+            if manual is not None:
+                postings = {key: count for key, count in postings.items() if key[0] == manual}
+            if scores is None:
+                scores = dict(postings)
+            else:
+                scores = {key: score + postings[key] for key, score in scores.items() if key in postings}
+            if not scores:
+                return []
+        # Most occurrences first; earlier pages break ties
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [(m, page, score, self.snippet(m, page, words)) for (m, page), score in ranked]
+
+    def snippet(self, manual, page, words):
+        text = self.page_text(manual, page)
+        lowered = text.lower()
+        position = -1
+        for word in words:
+            m = re.search(r"(?<![a-z0-9_])" + re.escape(word) + r"(?![a-z0-9_])", lowered)
+            if m and (position < 0 or m.start() < position):
+                position = m.start()
+        start = max(0, position - SNIPPET_CHARS // 3)
+        excerpt = " ".join(text[start:start + SNIPPET_CHARS].split())
+        return ("..." if start else "") + excerpt + "..."
+
+    def lookup_parameter(self, module_name, p_name):
+        """
+        Return (manual, page, snippet) describing a parameter, or None.
+
+        Input instructions list each card variable at the start of a
+        line, so such a page is preferred over pages merely mentioning it.
+        """
+        manual = module_name.lower()
+        word = p_name.lower()
+        hits = self.search(word, manual=manual, limit=100)
+        if not hits:
+            return None
+        definition = re.compile(r"^[\s!*]*" + re.escape(word) + r"(?![a-z0-9_])", re.MULTILINE)
+        for m, page, _, snippet in sorted(hits, key=lambda hit: hit[1]):
+            match = definition.search(self.page_text(m, page).lower())
+            if match:
+                text = self.page_text(m, page)
+                excerpt = " ".join(text[match.start():match.start() + SNIPPET_CHARS].split())
+                return m, page, excerpt + "..."
+        m, page, _, snippet = hits[0]
+        return m, page, snippet
+
+
+def index_manual(filepath):
+    """Extract one manual; returns its index entry."""
+    with span(f"index {os.path.basename(filepath)}", "manual"):
+        pages = PdfDocument(filepath).texts()
+        terms = {}
+        for page, text in enumerate(pages, 1):
+            for term, count in page_terms(text).items():
+                terms.setdefault(term, {})[page] = count
+        return {"stamp": manual_stamp(filepath), "pages": pages, "terms": terms}
+
+
+def load_index(resources_dir=RESOURCES_DIR, index_path=INDEX_PATH, rebuild=False, errors=None):
+    """
+    Return the ManualIndex for every PDF in resources_dir.
+
+    The stored index is reused for manuals whose size and mtime are
+    unchanged; others are re-extracted and the file is rewritten.
+    Manuals that cannot be read are skipped and described in errors.
+    """
+    stored = {}
+    if not rebuild:
+        try:
+            with open(index_path, 'r') as f:
+                document = json.load(f)
+            if document.get("version") == INDEX_VERSION and document.get("resources") == resources_dir:
+                stored = document["manuals"]
+        except (OSError, ValueError, KeyError):
+            stored = {}
+
+    manuals = {}
+    changed = False
+    for filename in sorted(os.listdir(resources_dir)):
+        if not filename.lower().endswith(".pdf"):
+            continue
+        filepath = os.path.join(resources_dir, filename)
+        manual = os.path.splitext(filename)[0].lower()
+        entry = stored.get(manual)
+        if entry is None or entry["stamp"] != manual_stamp(filepath):
+            try:
+                entry = index_manual(filepath)
+            except (OSError, PdfError, ValueError) as e:
+                if errors is not None:
+                    errors.append(f"{filename}: {e}")
+                continue
+            changed = True
+        manuals[manual] = entry
+    changed = changed or set(manuals) != set(stored)
+
+    if changed:
+        from fileio import atomic_open
+
+        try:
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            with atomic_open(index_path) as f:
+                json.dump({"version": INDEX_VERSION, "resources": resources_dir, "manuals": manuals}, f)
+        except OSError as e:
+            # A read-only cache only costs a re-extraction next time
+            if errors is not None:
+                errors.append(f"could not save {index_path}: {e}")
+    return ManualIndex(manuals)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def shared_index():
+    """Return the process-wide ManualIndex, loading it on first use (thread-safe)."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = load_index()
+        return _index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search the NJOY module manuals.")
+    parser.add_argument("query", nargs="*", help="Words to search for")
+    parser.add_argument("--module", help="Only search this module's manual")
+    parser.add_argument("--rebuild", action="store_true", help="Re-extract every manual")
+    parser.add_argument("-n", "--limit", type=int, default=10, help="Number of results")
+    args = parser.parse_args(argv)
+
+    errors = []
+    index = load_index(rebuild=args.rebuild, errors=errors)
+    for error in errors:
+        print(f"warning: {error}", file=sys.stderr)
+    if not args.query:
+        pages = sum(len(entry["pages"]) for entry in index.manuals.values())
+        print(f"{len(index.manuals)} manuals, {pages} pages, {len(index.terms)} terms")
+        return 0
+
+    manual = args.module.lower() if args.module else None
+    hits = index.search(" ".join(args.query), manual=manual, limit=args.limit)
+    for m, page, score, snippet in hits:
+        print(f"{m}.pdf p.{page} ({score}): {snippet}")
+    return 0 if hits else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,29 +1,242 @@
+import hashlib
 import json
 import os
+import threading
+
+from isotope_table import IsotopeTable
+from tracing import span
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODULES_DIR = os.path.join(BASE_DIR, "modules")
+ISOTOPES_PATH = os.path.join(BASE_DIR, "resources", "isotopes.json")
+
+# Tape units on card 1 of each module, in deck order, with their direction
+TAPE_UNITS = {
+    "MODER": (("nin", "in"), ("nout", "out")),
+    "RECONR": (("nendf", "in"), ("npend", "out")),
+    "BROADR": (("nendf", "in"), ("nin", "in"), ("nout", "out")),
+    "HEATR": (("nendf", "in"), ("nin", "in"), ("nout", "out"), ("nplot", "out")),
+    "PURR": (("nendf", "in"), ("nin", "in"), ("nout", "out")),
+    "UNRESR": (("nendf", "in"), ("nin", "in"), ("nout", "out")),
+    "GASPR": (("nendf", "in"), ("nin", "in"), ("nout", "out")),
+    "ACER": (("nendf", "in"), ("npend", "in"), ("ngend", "in"), ("nace", "out"), ("ndir", "out")),
+    "VIEWR": (("infile", "in"), ("nps", "out")),
+}
 
 class ModuleModel:
     def __init__(self, module_name):
         self.module_name = module_name
         self.description = ""
+        self.tooltip = ""
         self.cards = []
+        self.index = {}
+        self.isotope_parameters = ()
+        self.schema_version = ""
 
     def load_from_file(self, filepath):
         with open(filepath, 'r') as f:
             data = json.load(f)
         self.module_name = data["name"]
         self.description = data.get("description", "")
+        self.tooltip = data.get("tooltip", "")
         self.cards = data.get("cards", [])
+        self.index = compile_parameter_index(self.cards)
+        self.isotope_parameters = tuple(
+            name for name, spec in self.index.items() if spec.type == "isotope"
+        )
+        self.schema_version = schema_version(self.cards)
 
-def load_module(module_name):
-    filepath = os.path.join("modules", f"{module_name}.json")
+class ParameterSpec:
+    """A parameter definition resolved against its card, ready for lookups."""
+
+    __slots__ = ("name", "definition", "card", "type", "mandatory",
+                 "has_default", "default", "min", "max", "options")
+
+    def __init__(self, definition, card_name):
+        constraints = definition.get("constraints") or {}
+        self.name = definition["name"]
+        self.definition = definition
+        self.card = card_name
+        self.type = definition["type"]
+        self.mandatory = card_name == "Mandatory"
+        self.has_default = "default" in definition
+        self.default = definition.get("default")
+        self.min = constraints.get("min")
+        self.max = constraints.get("max")
+        self.options = tuple(constraints.get("options", ()))
+
+    def check_range(self, value):
+        """Return an error message if value is outside min/max, else None."""
+        if self.min is not None and value < self.min:
+            return f"{self.name} must be >= {self.min}"
+        if self.max is not None and value > self.max:
+            return f"{self.name} must be <= {self.max}"
+        return None
+
+def schema_version(cards):
+    """Short content hash of a module's cards, stored with saved workflows."""
+    text = json.dumps(cards, sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()[:12]
+
+def compile_parameter_index(cards):
+    """Return a dict of parameter name -> ParameterSpec for a list of cards."""
+    index = {}
+    for card in cards:
+        for param in card["parameters"]:
+            spec = index.get(param["name"])
+            if spec is None:
+                index[param["name"]] = ParameterSpec(param, card["name"])
+            elif card["name"] == "Mandatory":
+                spec.mandatory = True
+    return index
+
+class SchemaRegistry:
+    """
+    Process-wide cache of parsed module schemas and the isotope table.
+
+    Every file is parsed once and the parsed object is shared by all
+    callers. A file is only read again when its modification time changes.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _get(self, filepath, loader, key=None):
+        key = key or filepath
+        mtime = os.stat(filepath).st_mtime_ns
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == mtime:
+                return entry[1]
+            with span(f"parse {os.path.basename(filepath)}", "schema"):
+                value = loader(filepath)
+            self._entries[key] = (mtime, value)
+            return value
+
+    def module(self, module_name):
+        filepath = os.path.join(MODULES_DIR, f"{module_name.lower()}.json")
+        return self._get(filepath, lambda path: _read_module(module_name, path))
+
+    def isotopes(self):
+        if not os.path.exists(ISOTOPES_PATH):
+            return {}
+        return self._get(ISOTOPES_PATH, _read_json)
+
+    def isotope_table(self):
+        if not os.path.exists(ISOTOPES_PATH):
+            return IsotopeTable({})
+        return self._get(ISOTOPES_PATH, lambda path: IsotopeTable(_read_json(path)),
+                         key=(ISOTOPES_PATH, "table"))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+def _read_module(module_name, filepath):
     model = ModuleModel(module_name)
     model.load_from_file(filepath)
     return model
 
+def _read_json(filepath):
+    with open(filepath, 'r') as f:
+        return json.load(f)
+
+registry = SchemaRegistry()
+
+def load_module(module_name):
+    """Return the shared ModuleModel for a module. Do not mutate it."""
+    return registry.module(module_name)
+
+def default_parameters(mod_model):
+    """Return a new parameter dict filled from the module's JSON defaults."""
+    parameters = {}
+    # Set all parameters from JSON defaults upfront
+    for card in mod_model.cards:
+        for param in card["parameters"]:
+            p_name = param["name"]
+            p_default = param.get("default", None)
+            parameters[p_name] = p_default
+
+    # Handle temperature parameters for both BROADR and PURR
+    if mod_model.module_name.lower() in ["broadr", "purr"]:
+        temp_param = "temp2" if mod_model.module_name.lower() == "broadr" else "temp"
+        if isinstance(parameters.get(temp_param), (int, float)):
+            parameters[temp_param] = str(parameters[temp_param])
+        if not parameters.get(temp_param, '').strip():
+            parameters[temp_param] = "293.6"
+
+    return parameters
+
+def create_module(module_name, parameters=None):
+    """
+    Return a workflow module dict with default parameters.
+
+    parameters, if given, override the defaults.
+    """
+    mod_model = load_module(module_name)
+    module_parameters = default_parameters(mod_model)
+    if parameters:
+        module_parameters.update(parameters)
+    return {
+        "name": mod_model.module_name,
+        "description": getattr(mod_model, "description", "No description available."),
+        "cards": mod_model.cards,
+        "parameters": module_parameters
+    }
+
+def parameter_index(module_name, cards=None):
+    """
+    Return the parameter index for a module.
+
+    The registry's precompiled index is used unless the caller holds its
+    own copy of the cards (e.g. from an older workflow file).
+    """
+    try:
+        model = registry.module(module_name)
+    except OSError:
+        model = None
+    if model is not None and (cards is None or cards is model.cards):
+        return model.index
+    return compile_parameter_index(cards or [])
+
+def isotope_parameters(module_name):
+    """Return the names of a module's isotope-typed parameters."""
+    try:
+        return registry.module(module_name).isotope_parameters
+    except OSError:
+        return ()
+
+def module_units(mod):
+    """Return [(parameter, direction, unit)] for the tapes on a module's card 1."""
+    units = []
+    for p_name, direction in TAPE_UNITS.get(mod["name"], ()):
+        try:
+            unit = int(mod["parameters"].get(p_name))
+        except (TypeError, ValueError):
+            continue
+        # Units below 20 are not tapes (0 means unused)
+        if abs(unit) >= 20:
+            units.append((p_name, direction, unit))
+    return units
+
+def isotope_list(value):
+    """
+    Return the symbols held by an isotope parameter as a list.
+
+    mat/matd hold one symbol, or several as a list (or a space-separated
+    string) when one module block processes several materials.
+    """
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return str(value).split()
+
 def load_isotopes():
-    filepath = "resources/isotopes.json"
-    if os.path.exists(filepath):
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-        return data
-    return {}
+    """Return the shared isotope symbol -> MAT table. Do not mutate it."""
+    return registry.isotopes()
+
+def load_isotope_table():
+    """Return the shared, indexed IsotopeTable."""
+    return registry.isotope_table()
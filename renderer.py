@@ -0,0 +1,599 @@
+# renderer.py
+
+"""
+Qt-free rendering of NJOY input decks from workflow module dictionaries.
+
+isotopes is an isotope_table.IsotopeTable; an unknown symbol raises
+UnknownIsotopeError instead of silently rendering another material.
+
+mat/matd may hold a list of isotopes. RECONR, BROADR, PURR and UNRESR
+then repeat their material cards inside one block, so each tape is read
+once for all materials. HEATR and ACER handle one material per run: the
+chain from the first such module onwards is repeated once per material
+by render_deck (see fan_out_materials).
+"""
+
+import json
+from collections import OrderedDict
+
+from fileio import atomic_open
+from model import isotope_list, isotope_parameters, module_units
+from tracing import span
+
+# Modules that take one material per invocation
+PER_MATERIAL_MODULES = ("HEATR", "ACER")
+
+# Highest unit NJOY accepts for a tape
+MAX_TAPE_UNIT = 99
+
+
+class RenderError(ValueError):
+    """Raised when a workflow cannot be written as a valid deck."""
+
+
+def material_numbers(isotopes, value):
+    """Return (symbols, MAT numbers) for an isotope parameter that may hold a list."""
+    symbols = isotope_list(value) or [value]
+    return symbols, [isotopes.mat(symbol) for symbol in symbols]
+
+
+def single_material(isotopes, value, module_name):
+    symbols, mats = material_numbers(isotopes, value)
+    if len(symbols) > 1:
+        raise RenderError(f"{module_name} processes one material per block; "
+                          "render the whole deck to fan it out")
+    return symbols[0], mats[0]
+
+
+def render_module(mod, isotopes):
+    """Return the deck lines for a single module dictionary."""
+    lines = []
+    name = mod["name"]
+    p = mod["parameters"]
+
+    if name == "MODER":
+        # Card 1
+        nin = p.get("nin", "")
+        nout = p.get("nout", "")
+
+        # Build the MODER module
+        lines.append("moder")
+        lines.append(f"{nin} {nout}")
+
+    elif name == "RECONR":
+        # Card 1
+        nendf = p.get("nendf", "")
+        npend = p.get("npend", "")
+
+        # Card 2 (label)
+        materials, mats = material_numbers(isotopes, p.get("mat", "U235"))
+        isotope = materials[0] if len(materials) == 1 else f"{len(materials)} materials"
+
+        # Get tempr value from parameters, use 0 as default for label
+        tempr = p.get("tempr")
+        try:
+            if tempr is not None:
+                tempr = float(tempr)
+            else:
+                tempr = 0.0
+        except (ValueError, TypeError):
+            tempr = 0.0
+
+        # Always show temperature in label
+        label = f'reconstructed data for {isotope} @ {tempr} K'
+
+        # Card 3
+        tolerance_str = p.get("err", "0.001")
+        tolerance = float(tolerance_str)
+
+        # Get optional parameters
+        user_errmax = p.get("errmax")
+        user_errint = p.get("errint")
+
+        # Build Card 4 with dependencies (keep tempr optional in card 4)
+        card4_parts = [str(tolerance)]
+        if user_errint is not None:
+            if user_errmax is None:
+                user_errmax = 10 * tolerance
+            card4_parts.extend([str(p.get("tempr", 0.0)), str(user_errmax), str(user_errint)])
+        elif user_errmax is not None:
+            card4_parts.extend([str(p.get("tempr", 0.0)), str(user_errmax)])
+        elif p.get("tempr") is not None:
+            card4_parts.append(str(tempr))
+
+        card4_line = " ".join(card4_parts) + " /"
+
+        # Build the RECONR module
+        lines.append("-- reconstruct, linearise and unionize data")
+        lines.append("reconr")
+        lines.append(f"{nendf} {npend}")
+        lines.append(f"{label} /")
+        # Cards 3 and 4 repeat for every material on the tape
+        for mat in mats:
+            lines.append(f"{mat} /")
+            lines.append(card4_line)
+        lines.append("0 /")
+
+    elif name == "BROADR":
+        # Card 1
+        nendf = p.get("nendf", "")
+        nin = p.get("nin", "")
+        nout = p.get("nout", "")
+
+        # Card 2
+        _, mat_nums = material_numbers(isotopes, p.get("mat", "U235"))
+        temp2_str = p.get("temp2", "")
+        temps = temp2_str.split()
+        ntemp2 = len(temps)
+
+        # Card 3 parameters
+        errthn_str = p.get("errthn", "0.001")
+        errthn = float(errthn_str)
+        user_thnmax = p.get("thnmax")
+        user_errmax = p.get("errmax")
+        user_errint = p.get("errint")
+
+        # Build Card 3 with dependencies
+        card3_parts = [str(errthn)]
+        if user_errint is not None:
+            if user_errmax is None:
+                user_errmax = 10 * errthn
+            if user_thnmax is None:
+                user_thnmax = 1
+            card3_parts.extend([str(user_thnmax), str(user_errmax), str(user_errint)])
+        elif user_errmax is not None:
+            if user_thnmax is None:
+                user_thnmax = 1
+            card3_parts.extend([str(user_thnmax), str(user_errmax)])
+        elif user_thnmax is not None:
+            card3_parts.append(str(user_thnmax))
+
+        card3_line = " ".join(card3_parts) + " /"
+
+        # Build the BROADR module
+        lines.append("-- calculate doppler broadening")
+        lines.append("broadr")
+        lines.append(f"{nendf} {nin} {nout}")
+        lines.append(f"{mat_nums[0]} {ntemp2} /")
+        lines.append(card3_line)
+        if ntemp2 > 0:
+            lines.append(" ".join(temps) + " /")
+        # Card 5: further materials broadened with the same parameters
+        for mat_num in mat_nums[1:]:
+            lines.append(f"{mat_num} /")
+        lines.append("0 /")
+
+    elif name == "HEATR":
+        # Card 1
+        nendf = p.get("nendf", "")
+        nin = p.get("nin", "")
+        nout = p.get("nout", "")
+        nplot = p.get("nplot") or "0"  # Set default value to "0" if None or empty
+
+        # Card 2 mandatory parameters
+        _, mat_num = single_material(isotopes, p.get("matd", "U235"), name)
+        mtk_str = p.get("mtk", "")
+        mtk_list = str(mtk_str).split()
+        npk = len(mtk_list)
+
+        # Handle optional Card 2 parameters
+        user_ed = p.get("ed")
+        user_iprint = p.get("iprint")
+        user_local = p.get("local")
+
+        # Convert text options to numbers - simplified iprint handling
+        if user_iprint == "min":
+            iprint = 0
+        elif user_iprint == "max":
+            iprint = 1
+        else:
+            iprint = None
+
+        if user_local == "Transported":
+            local = 0
+        elif user_local == "Deposited":
+            local = 1
+        else:
+            local = None
+
+        # Build Card 2 based on rightmost specified parameter
+        card2_parts = [str(mat_num), str(npk)]
+
+        if user_ed is not None:
+            # If ed is specified, include all parameters
+            card2_parts.extend([
+                "0",  # nqa
+                "0",  # ntemp
+                str(local if local is not None else 0),
+                str(iprint if iprint is not None else 0),
+                str(user_ed)
+            ])
+        elif user_iprint is not None:
+            # If iprint is specified (but not ed), include up to iprint
+            card2_parts.extend([
+                "0",  # nqa
+                "0",  # ntemp
+                str(local if local is not None else 0),
+                str(iprint)
+            ])
+        elif user_local is not None:
+            # If only local is specified, include up to local
+            card2_parts.extend([
+                "0",  # nqa
+                "0",  # ntemp
+                str(local)
+            ])
+
+        # Build the HEATR module
+        lines.append("-- calculate heating values")
+        lines.append("heatr")
+        lines.append(f"{nendf} {nin} {nout} {nplot}")
+        lines.append(" ".join(card2_parts) + " /")
+        if npk > 0:
+            lines.append(" ".join(mtk_list) + " /")
+
+    elif name == "PURR":
+        # Card 1
+        nendf = p.get("nendf", "")
+        nin = p.get("nin", "")
+        nout = p.get("nout", "")
+
+        # Card 2
+        _, mat_nums = material_numbers(isotopes, p.get("matd", "U235"))
+
+        # Process temperatures
+        temp_str = str(p.get("temp", ""))  # Ensure temp is a string
+        temps = temp_str.split()
+        ntemp = len(temps)
+
+        # Process sigma zero values
+        sigz_str = str(p.get("sigz", ""))  # Ensure sigz is a string
+        sigz_values = sigz_str.split()
+        nsigz = len(sigz_values)
+
+        # Get optional parameters
+        nbin = p.get("nbin", "20")
+        nladr = p.get("nladr", "64")
+        user_iprint = p.get("iprint")
+        nunx = p.get("nunx")
+
+        # Convert text options to numbers - fixed iprint handling
+        if user_iprint == "min":
+            iprint = 0
+        elif user_iprint == "max":
+            iprint = 1
+        else:
+            iprint = None
+
+        # Build card 2 parameters
+        card2_parts = [str(ntemp), str(nsigz), str(nbin), str(nladr)]
+
+        # Add iprint and nunx if either is specified
+        if nunx is not None or user_iprint is not None:
+            card2_parts.append(str(iprint if iprint is not None else "1"))
+            card2_parts.append(str(nunx if nunx is not None else ""))
+
+        # Build the PURR module
+        lines.append("-- calculate ptables")
+        lines.append("purr")
+        lines.append(f"{nendf} {nin} {nout}")
+        # Cards 2-4 repeat for every material on the tape
+        for mat_num in mat_nums:
+            lines.append(" ".join([str(mat_num)] + card2_parts) + " /")
+            if ntemp > 0:
+                lines.append(" ".join(temps) + " /")
+            if nsigz > 0:
+                lines.append(" ".join(sigz_values) + " /")
+        lines.append("0 /")
+
+    elif name == "UNRESR":
+        # Card 1
+        nendf = p.get("nendf", "")
+        nin = p.get("nin", "")
+        nout = p.get("nout", "")
+
+        # Card 2
+        _, mat_nums = material_numbers(isotopes, p.get("matd", "U235"))
+
+        # Process temperatures
+        temp_str = str(p.get("temp", ""))  # Ensure temp is a string
+        temps = temp_str.split()
+        ntemp = len(temps)
+
+        # Process sigma zero values
+        sigz_str = str(p.get("sigz", ""))  # Ensure sigz is a string
+        sigz_values = sigz_str.split()
+        nsigz = len(sigz_values)
+
+        # Get optional parameters
+        user_iprint = p.get("iprint")
+
+        # Convert text options to numbers - fixed iprint handling
+        if user_iprint == "min":
+            iprint = 0
+        elif user_iprint == "max":
+            iprint = 1
+        else:
+            iprint = None
+
+        # Build card 2 parameters
+        card2_parts = [str(ntemp), str(nsigz)]
+
+        # Add iprint and nunx if either is specified
+        if user_iprint is not None:
+            card2_parts.append(str(iprint if iprint is not None else "0"))
+
+        # Build the PURR module
+        lines.append("-- calculate ptables")
+        lines.append("purr")
+        lines.append(f"{nendf} {nin} {nout}")
+        # Cards 2-4 repeat for every material on the tape
+        for mat_num in mat_nums:
+            lines.append(" ".join([str(mat_num)] + card2_parts) + " /")
+            if ntemp > 0:
+                lines.append(" ".join(temps) + " /")
+            if nsigz > 0:
+                lines.append(" ".join(sigz_values) + " /")
+        lines.append("0 /")
+
+    elif name == "GASPR":
+        # Card 1
+        nendf = p.get("nendf", "")
+        nin = p.get("nin", "")
+        nout = p.get("nout", "")
+
+        # Build the PURR module
+        lines.append("-- calculate production")
+        lines.append("gaspr")
+        lines.append(f"{nendf} {nin} {nout}")
+
+    elif name == "ACER":
+        # Card 1
+        nendf = p.get("nendf", "")
+        npend = p.get("npend", "")
+        ngend = p.get("ngend", "")
+        nace = p.get("nace", "")
+        ndir = p.get("ndir", "")
+
+        # Process iprint
+        user_iprint = p.get("iprint")
+        if user_iprint == "min":
+            iprint = 0
+        elif user_iprint == "max":
+            iprint = 1
+        else:
+            iprint = 1  # default value
+
+        # Get itype and suff
+        itype = p.get("itype", 1)
+        if itype is None:
+            itype = 1
+        suff = p.get("suff", "")
+        iopt = p.get("iopt", "")
+        suff_trunc = int(suff * 100) / 100 if suff > 0 else suff
+
+        # Get material and temperature
+        isotope, mat_num = single_material(isotopes, p.get("matd", "U235"), name)
+        tempd = p.get("tempd", "")
+
+        # Generate automatic hk label
+        hk = f"{isotope} @ {tempd} K ACE data"
+
+        # Build the ACER module
+        lines.append("-- generate ACE file")
+        lines.append("acer")
+        lines.append(f"{nendf} {npend} {ngend} {nace} {ndir}")
+        lines.append(f"{iopt} {iprint} {itype} {suff_trunc:.2f} /")
+        lines.append(f"'{hk}' /")
+        lines.append(f"{mat_num} {tempd} /")
+        lines.append('/')
+        lines.append('/')
+
+    if name == "VIEWR":
+        # Card 1
+        nin = p.get("infile", "")
+        nout = p.get("nps", "")
+
+        # Build the MODER module
+        lines.append("-- produce plots")
+        lines.append("viewr")
+        lines.append(f"{nin} {nout}")
+
+    return lines
+
+
+def fan_out_materials(modules):
+    """
+    Return the chain with per-material modules expanded.
+
+    From the first HEATR/ACER whose material is a list, the rest of the
+    chain is repeated once per material. Intermediate tapes are simply
+    rewritten by each repetition; the final tapes (written but never read
+    further down) move to fresh units for every material after the first.
+    Chains without such a module are returned unchanged.
+    """
+    start = None
+    materials = []
+    for i, mod in enumerate(modules):
+        if mod["name"] in PER_MATERIAL_MODULES:
+            for p_name in isotope_parameters(mod["name"]):
+                materials = isotope_list(mod["parameters"].get(p_name))
+                if len(materials) > 1:
+                    start = i
+                    break
+        if start is not None:
+            break
+    if start is None:
+        return modules
+
+    segment = modules[start:]
+    read_later = set()
+    final_units = []
+    for mod in reversed(segment):
+        for p_name, direction, unit in module_units(mod):
+            if direction == "out" and abs(unit) not in read_later and abs(unit) not in final_units:
+                final_units.append(abs(unit))
+        read_later.update(abs(unit) for _, direction, unit in module_units(mod) if direction == "in")
+    final_units.sort()
+
+    used_units = {abs(unit) for mod in modules for _, _, unit in module_units(mod)}
+    step = len(final_units)
+    for i in range(1, len(materials)):
+        for unit in final_units:
+            shifted = unit + i * step
+            if shifted > MAX_TAPE_UNIT or shifted in used_units:
+                raise RenderError(f"no free tape unit for material {materials[i]} "
+                                  f"(unit {unit} would move to {shifted})")
+
+    expanded = list(modules[:start])
+    for i, symbol in enumerate(materials):
+        for mod in segment:
+            parameters = dict(mod["parameters"])
+            for p_name in isotope_parameters(mod["name"]):
+                value = isotope_list(parameters.get(p_name))
+                if len(value) > 1:
+                    if len(value) != len(materials):
+                        raise RenderError(f"{mod['name']} {p_name} lists {len(value)} materials, "
+                                          f"expected {len(materials)}")
+                    parameters[p_name] = value[i]
+            if i:
+                for p_name, direction, unit in module_units(mod):
+                    if abs(unit) in final_units:
+                        shifted = abs(unit) + i * step
+                        parameters[p_name] = shifted if unit > 0 else -shifted
+            fanned = dict(mod)
+            fanned["parameters"] = parameters
+            expanded.append(fanned)
+    return expanded
+
+
+def render_deck(modules, isotopes):
+    """Return the full NJOY deck text for a list of module dictionaries."""
+    with span("render_deck", "render", modules=len(modules)):
+        lines = []
+        for mod in fan_out_materials(modules):
+            lines.extend(render_module(mod, isotopes))
+
+        if lines:
+            lines.append("stop")
+
+        return "\n".join(lines)
+
+
+def write_deck(filepath, modules, isotopes, progress=None):
+    """
+    Render modules straight into filepath, atomically.
+
+    Writes the same text as render_deck plus a final newline, one block
+    at a time. progress(done, total) is called after each rendered block
+    and may raise fileio.OperationCancelled to leave filepath untouched.
+    """
+    expanded = fan_out_materials(modules)
+    total = len(expanded)
+    with span("write_deck", "io", modules=total), atomic_open(filepath) as f:
+        wrote = False
+        for done, mod in enumerate(expanded, 1):
+            block = render_module(mod, isotopes)
+            if block:
+                f.write("\n".join(block) + "\n")
+                wrote = True
+            if progress is not None:
+                progress(done, total)
+        if wrote:
+            f.write("stop\n")
+
+
+class RenderCache:
+    """
+    Memoizes rendered module blocks under a fingerprint of their inputs.
+
+    A module is only re-rendered when its name, parameters or the MAT
+    numbers of its isotopes change; reordering modules just re-joins
+    the cached blocks.
+    """
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self.blocks = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # id(module dict) -> (module, isotopes, parameter snapshot, key); the
+        # module is kept alive so its id is not reused by another dict
+        self.keys = {}
+        # (name, id(cards)) -> (cards, isotope parameter names)
+        self.isotope_keys = {}
+
+    def isotope_parameter_names(self, mod):
+        """isotope_parameters() once per schema instead of a registry check per call."""
+        cards = mod.get("cards")
+        entry = self.isotope_keys.get((mod["name"], id(cards)))
+        if entry is None:
+            entry = self.isotope_keys[(mod["name"], id(cards))] = (cards, isotope_parameters(mod["name"]))
+        return entry[1]
+
+    def fingerprint(self, mod, isotopes):
+        """
+        Return the cache key of a module.
+
+        A dict seen before keeps its key while its parameters compare equal
+        to the snapshot taken then (a C-level dict comparison), so only new
+        or edited modules pay for serializing their parameters.
+        """
+        p = mod["parameters"]
+        entry = self.keys.get(id(mod))
+        if entry is not None and entry[1] is isotopes and entry[2] == p and entry[3][0] == mod["name"]:
+            return entry[3]
+
+        mats = [
+            isotopes.get(symbol)
+            for key in self.isotope_parameter_names(mod) if key in p
+            for symbol in isotope_list(p[key])
+        ]
+        key = (mod["name"], json.dumps(p, sort_keys=True, default=str), tuple(mats))
+        if len(self.keys) >= 4 * self.max_entries:
+            self.keys.clear()
+        snapshot = {p_name: list(value) if isinstance(value, list) else value for p_name, value in p.items()}
+        self.keys[id(mod)] = (mod, isotopes, snapshot, key)
+        return key
+
+    def render_module(self, mod, isotopes):
+        key = self.fingerprint(mod, isotopes)
+        block = self.blocks.get(key)
+        if block is not None:
+            self.hits += 1
+            self.blocks.move_to_end(key)
+            return block
+
+        self.misses += 1
+        with span(mod["name"], "render"):
+            block = tuple(render_module(mod, isotopes))
+        self.blocks[key] = block
+        if len(self.blocks) > self.max_entries:
+            self.blocks.popitem(last=False)
+        return block
+
+    def render_lines(self, modules, isotopes):
+        with span("render_lines", "render", modules=len(modules)) as s:
+            misses = self.misses
+            lines = []
+            for mod in fan_out_materials(modules):
+                lines.extend(self.render_module(mod, isotopes))
+
+            if lines:
+                lines.append("stop")
+
+            s.set(rendered=self.misses - misses)
+            return lines
+
+    def render_deck(self, modules, isotopes):
+        return "\n".join(self.render_lines(modules, isotopes))
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.blocks)}
+
+    def clear(self):
+        self.blocks.clear()
+        self.keys.clear()
+        self.isotope_keys.clear()
+        self.hits = 0
+        self.misses = 0
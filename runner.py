@@ -0,0 +1,294 @@
+# runner.py
+
+"""
+Parallel execution of NJOY decks, one sandboxed working directory per job.
+
+Usage:
+    python runner.py decks/*.njoy --endf "endf/{isotope}.endf" -o results -j 16
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+
+from model import TAPE_UNITS
+from tracing import span
+
+DEFAULT_NJOY = os.environ.get("NJOY", "njoy")
+
+# Lowercase keyword that opens each module block in a deck
+MODULE_KEYWORDS = {name.lower(): name for name in TAPE_UNITS}
+
+# Line NJOY prints as each module starts, e.g. " reconr...      0.1s"
+# (the time is NJOY's cumulative run time, when present)
+BANNER_RE = re.compile(r"^\s*(" + "|".join(MODULE_KEYWORDS) + r")\.\.\.(?:.*?(\d+(?:\.\d*)?)s\s*$)?",
+                       re.IGNORECASE)
+
+
+class NjoyJob:
+    """A deck to run and the files to stage as its input tapes."""
+
+    def __init__(self, name, deck, tapes):
+        self.name = name
+        self.deck = deck
+        # Either {unit: path} or one path staged for every external input unit
+        self.tapes = tapes
+
+
+def tape_name(unit):
+    """NJOY opens unit NN as tapeNN; the sign only selects binary mode."""
+    return f"tape{abs(int(unit))}"
+
+
+def card_units(line):
+    """Return the integer units on a card 1 line, ignoring the terminator."""
+    units = []
+    for token in line.split("/")[0].split():
+        try:
+            units.append(int(token))
+        except ValueError:
+            break
+    return units
+
+
+def deck_tape_units(deck):
+    """
+    Return (inputs, outputs) for a deck as lists of absolute unit numbers.
+
+    inputs are the units read before any module in the deck writes them,
+    i.e. the tapes that must be staged. outputs are every unit written.
+    """
+    inputs = []
+    outputs = []
+    lines = iter(deck.splitlines())
+    for line in lines:
+        module = MODULE_KEYWORDS.get(line.strip().lower())
+        if module is None:
+            continue
+        card1 = next((l for l in lines if l.strip() and not l.lstrip().startswith("--")), "")
+        for (_, direction), unit in zip(TAPE_UNITS[module], card_units(card1)):
+            unit = abs(unit)
+            # Units below 20 are not tapes (0 means unused)
+            if unit < 20:
+                continue
+            if direction == "in":
+                if unit not in outputs and unit not in inputs:
+                    inputs.append(unit)
+            elif unit not in outputs:
+                outputs.append(unit)
+    return inputs, outputs
+
+
+def banner_module(line):
+    """Return (module name, NJOY seconds or None) if line is a module banner, else None."""
+    m = BANNER_RE.match(line)
+    if m is None:
+        return None
+    return MODULE_KEYWORDS[m.group(1).lower()], float(m.group(2)) if m.group(2) else None
+
+
+class ModuleTimeline:
+    """
+    Follows a running deck module by module from the banners NJOY prints.
+
+    names are the deck's modules in order. Each banner starts the next
+    module of that name and ends the one before; times are whatever
+    clock the caller passes (time.monotonic() in the GUI).
+    """
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.starts = [None] * len(self.names)
+        self.ends = [None] * len(self.names)
+        self.current = -1
+
+    def feed(self, line, now):
+        """Process one output line; returns the index of a module that just started, or None."""
+        banner = banner_module(line)
+        if banner is None:
+            return None
+        name = banner[0]
+        for index in range(self.current + 1, len(self.names)):
+            if self.names[index] == name:
+                self.finish(now)
+                self.current = index
+                self.starts[index] = now
+                return index
+        return None
+
+    def finish(self, now):
+        """Close the running module (on the next banner or when NJOY exits)."""
+        if self.current >= 0 and self.ends[self.current] is None:
+            self.ends[self.current] = now
+
+    def elapsed(self, index, now):
+        """Seconds module index ran (or has been running), None if not started."""
+        start = self.starts[index]
+        if start is None:
+            return None
+        end = self.ends[index]
+        return (end if end is not None else now) - start
+
+
+def stage_file(source, destination):
+    """Link source into the sandbox: hardlink if possible, else symlink."""
+    try:
+        os.link(source, destination)
+    except OSError:
+        os.symlink(os.path.abspath(source), destination)
+
+
+def resolve_executable(njoy):
+    """
+    Return njoy made absolute if it is a relative path.
+
+    NJOY runs inside its sandbox, so './njoy' must be resolved against
+    the current directory first; a bare name is left to the PATH search.
+    """
+    if os.sep in njoy or (os.altsep and os.altsep in njoy):
+        return os.path.abspath(njoy)
+    return njoy
+
+
+def run_job(job, njoy=DEFAULT_NJOY, work_root="work", results_root="results", keep_workdir=False):
+    """Run one job in its own working directory and harvest its tapes."""
+    inputs, outputs = deck_tape_units(job.deck)
+    workdir = os.path.join(work_root, job.name)
+    results_dir = os.path.join(results_root, job.name)
+    result = {
+        "name": job.name,
+        "returncode": None,
+        "elapsed": 0.0,
+        "outputs": [],
+        "results_dir": results_dir,
+        "error": None,
+    }
+
+    if os.path.exists(workdir):
+        shutil.rmtree(workdir)
+    os.makedirs(workdir)
+    os.makedirs(results_dir, exist_ok=True)
+
+    try:
+        tapes = job.tapes if isinstance(job.tapes, dict) else {unit: job.tapes for unit in inputs}
+        for unit in inputs:
+            source = tapes.get(unit) or tapes.get(-unit)
+            if source is None or not os.path.exists(source):
+                raise FileNotFoundError(f"no input tape for unit {unit}: {source}")
+            stage_file(source, os.path.join(workdir, tape_name(unit)))
+
+        deck_path = os.path.join(workdir, "input")
+        with open(deck_path, 'w') as f:
+            f.write(job.deck)
+            if not job.deck.endswith("\n"):
+                f.write("\n")
+
+        njoy = resolve_executable(njoy)
+        start = time.perf_counter()
+        with span(f"njoy {job.name}", "njoy"), open(deck_path, 'r') as stdin, \
+                open(os.path.join(workdir, "stdout"), 'w') as stdout:
+            completed = subprocess.run([njoy], stdin=stdin, stdout=stdout,
+                                       stderr=subprocess.STDOUT, cwd=workdir)
+        result["elapsed"] = time.perf_counter() - start
+        result["returncode"] = completed.returncode
+
+        for name in [tape_name(unit) for unit in outputs] + ["output", "stdout"]:
+            path = os.path.join(workdir, name)
+            if os.path.isfile(path):
+                harvested = os.path.join(results_dir, name)
+                os.replace(path, harvested)
+                result["outputs"].append(harvested)
+    except (OSError, subprocess.SubprocessError) as e:
+        result["error"] = str(e)
+    finally:
+        if not keep_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return result
+
+
+def run_jobs(jobs, njoy=DEFAULT_NJOY, work_root="work", results_root="results",
+             processes=None, keep_workdir=False):
+    """
+    Run jobs concurrently and yield each result as it finishes.
+
+    Every job is its own NJOY process, so a thread per running job is
+    enough to keep `processes` cores busy.
+    """
+    processes = processes or os.cpu_count() or 1
+    jobs = iter(jobs)
+    names = set()
+    with ThreadPoolExecutor(max_workers=processes) as pool:
+        # Keep a bounded number of jobs queued so decks are read lazily
+        pending = set()
+        for job in jobs:
+            # Jobs sharing a name would share, and delete, one sandbox
+            if job.name in names:
+                raise ValueError(f"duplicate job name '{job.name}'")
+            names.add(job.name)
+            pending.add(pool.submit(run_job, job, njoy, work_root, results_root, keep_workdir))
+            if len(pending) >= 2 * processes:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in as_completed(pending):
+            yield future.result()
+
+
+def parse_tape_option(value):
+    unit, _, path = value.partition("=")
+    return abs(int(unit)), path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run NJOY decks in parallel sandboxes.")
+    parser.add_argument("decks", nargs="+", help="NJOY input decks")
+    parser.add_argument("--endf", help="ENDF tape staged for every external input unit; "
+                                       "may use {stem} and {isotope} (deck name up to the first '_')")
+    parser.add_argument("--tape", action="append", default=[], metavar="UNIT=PATH",
+                        help="Stage PATH as a specific input unit (repeatable)")
+    parser.add_argument("--njoy", default=DEFAULT_NJOY, help="NJOY executable (default: $NJOY or 'njoy')")
+    parser.add_argument("-o", "--results-dir", default="results", help="Directory for harvested tapes")
+    parser.add_argument("--work-dir", default="work", help="Directory for the job sandboxes")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Concurrent NJOY processes")
+    parser.add_argument("--keep", action="store_true", help="Keep the sandboxes after each run")
+    args = parser.parse_args(argv)
+
+    fixed_tapes = dict(parse_tape_option(value) for value in args.tape)
+
+    stems = [os.path.splitext(os.path.basename(deck_path))[0] for deck_path in args.decks]
+    repeated = {stem for stem in stems if stems.count(stem) > 1}
+
+    def iter_jobs():
+        for deck_path, stem in zip(args.decks, stems):
+            name = stem
+            if stem in repeated:
+                # a/U235.njoy and b/U235.njoy need their own sandboxes and results
+                name = f"{stem}_{hashlib.sha1(os.path.abspath(deck_path).encode()).hexdigest()[:8]}"
+            with open(deck_path, 'r') as f:
+                deck = f.read()
+            tapes = {}
+            if args.endf:
+                endf = args.endf.format(stem=stem, isotope=stem.split("_")[0])
+                tapes = {unit: endf for unit in deck_tape_units(deck)[0]}
+            tapes.update(fixed_tapes)
+            yield NjoyJob(name, deck, tapes)
+
+    failures = 0
+    for result in run_jobs(iter_jobs(), args.njoy, args.work_dir, args.results_dir,
+                           args.jobs, args.keep):
+        status = result["error"] or f"exit {result['returncode']}"
+        if result["error"] or result["returncode"] != 0:
+            failures += 1
+        print(f"{result['name']}: {status} ({result['elapsed']:.1f} s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
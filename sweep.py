@@ -0,0 +1,208 @@
+# sweep.py
+
+"""
+Lazy parameter sweeps over a workflow.
+
+A sweep axis assigns a list of values to one or more (module, parameter)
+targets. The Cartesian product of all axes is expanded as a generator and
+identical decks are dropped by content hash, so sweeps of 10^5 decks
+stream without building every variant up front.
+
+Axes are given as "TARGETS=V1,V2,..." where TARGETS is a comma-separated
+list of MODULE.parameter. MODULE is a module name (every module with that
+name), a 0-based position in the chain, or * (every module that has the
+parameter). Targets on one axis move together, e.g.
+
+    python sweep.py workflow.json -o decks --axis "BROADR.temp2=293.6,600,900" \\
+        --axis "*.mat,*.matd=U235,U238"
+
+A workflow file may also carry its axes under a "sweep" key of its header
+(or at the top level of a legacy workflow):
+    "sweep": [{"targets": ["BROADR.temp2"], "values": ["293.6", "600"]}]
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import sys
+
+from model import load_isotope_table, parameter_index
+from renderer import RenderCache
+from workflow import read_workflow
+
+
+class SweepAxis:
+    """Values applied together to a list of (module index, parameter) targets."""
+
+    def __init__(self, targets, values):
+        self.targets = targets
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+
+class SweepCase:
+    """One rendered point of a sweep."""
+
+    def __init__(self, index, assignment, deck, digest):
+        self.index = index
+        # {"MODULE[i].parameter": value} for every swept target
+        self.assignment = assignment
+        self.deck = deck
+        self.digest = digest
+
+
+def coerce_value(module_dict, p_name, value):
+    """Convert a swept value to the type the renderer expects for it."""
+    spec = parameter_index(module_dict["name"], module_dict.get("cards")).get(p_name)
+    if spec is None or not isinstance(value, str):
+        return value
+    if spec.type == "int":
+        return int(value)
+    if spec.type == "float":
+        return float(value)
+    return value
+
+
+def resolve_targets(modules, target_specs):
+    """Turn "MODULE.parameter" strings into (module index, parameter) pairs."""
+    targets = []
+    for target in target_specs:
+        module_key, _, p_name = target.rpartition(".")
+        if not module_key or not p_name:
+            raise ValueError(f"sweep target '{target}' must be MODULE.parameter")
+        for i, mod in enumerate(modules):
+            if module_key == "*":
+                selected = p_name in mod["parameters"]
+            elif module_key.isdigit():
+                selected = i == int(module_key)
+            else:
+                selected = mod["name"].upper() == module_key.upper()
+            if selected:
+                targets.append((i, p_name))
+    if not targets:
+        raise ValueError(f"sweep targets {', '.join(target_specs)} match no module parameter")
+    return targets
+
+
+def parse_axis(modules, text):
+    """Parse a "TARGETS=V1,V2" axis specification."""
+    target_text, _, value_text = text.partition("=")
+    values = [v.strip() for v in value_text.split(",") if v.strip()]
+    if not values:
+        raise ValueError(f"sweep axis '{text}' has no values")
+    return SweepAxis(resolve_targets(modules, target_text.split(",")), values)
+
+
+def apply_assignment(modules, axes, choice):
+    """
+    Return the chain for one point of the product.
+
+    Only the swept modules and their parameter dicts are copied; every
+    other module is shared with the base workflow.
+    """
+    case_modules = list(modules)
+    assignment = {}
+    for axis, value_index in zip(axes, choice):
+        value = axis.values[value_index]
+        for module_index, p_name in axis.targets:
+            mod = case_modules[module_index]
+            if mod is modules[module_index]:
+                mod = dict(mod)
+                mod["parameters"] = dict(mod["parameters"])
+                case_modules[module_index] = mod
+            mod["parameters"][p_name] = coerce_value(mod, p_name, value)
+            assignment[f"{mod['name']}[{module_index}].{p_name}"] = value
+    return case_modules, assignment
+
+
+def expand_sweep(modules, axes, isotopes=None, cache=None, dedupe=True):
+    """
+    Yield a SweepCase for every distinct deck of the Cartesian product.
+
+    Cases are produced lazily in product order. Modules untouched by a
+    change of value hit the render cache instead of being re-rendered.
+    """
+    isotopes = isotopes if isotopes is not None else load_isotope_table()
+    cache = cache if cache is not None else RenderCache()
+    seen = set()
+
+    choices = itertools.product(*(range(len(axis)) for axis in axes))
+    for index, choice in enumerate(choices):
+        case_modules, assignment = apply_assignment(modules, axes, choice)
+        deck = cache.render_deck(case_modules, isotopes)
+        digest = hashlib.sha256(deck.encode()).hexdigest()
+        if dedupe:
+            if digest in seen:
+                continue
+            seen.add(digest)
+        yield SweepCase(index, assignment, deck, digest)
+
+
+def sweep_size(axes):
+    size = 1
+    for axis in axes:
+        size *= len(axis)
+    return size
+
+
+def load_sweep(filepath):
+    """
+    Return (modules, axes) from a workflow file.
+
+    Missing parameters are filled from the module defaults, so a sweep
+    workflow may list only the values it changes. Axes are read from the
+    header of a compact workflow or the top level of a legacy one.
+    """
+    header, modules = read_workflow(filepath)
+    axes = [
+        SweepAxis(resolve_targets(modules, axis["targets"]), [str(v) for v in axis["values"]])
+        for axis in header.get("sweep", [])
+    ]
+    return modules, axes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Expand a parameter sweep into NJOY decks.")
+    parser.add_argument("workflow", help="Workflow JSON, optionally with a 'sweep' list")
+    parser.add_argument("-o", "--output-dir", required=True, help="Directory for the generated decks")
+    parser.add_argument("--axis", action="append", default=[], metavar="TARGETS=V1,V2",
+                        help="Sweep axis (repeatable)")
+    parser.add_argument("--keep-duplicates", action="store_true",
+                        help="Write every point even if its deck is identical to an earlier one")
+    args = parser.parse_args(argv)
+
+    try:
+        modules, axes = load_sweep(args.workflow)
+        axes.extend(parse_axis(modules, text) for text in args.axis)
+    except (ValueError, LookupError) as e:
+        parser.error(str(e))
+    if not axes:
+        parser.error("no sweep axes given")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    written = 0
+    with open(os.path.join(args.output_dir, "sweep.jsonl"), 'w') as manifest:
+        try:
+            for case in expand_sweep(modules, axes, dedupe=not args.keep_duplicates):
+                filename = f"{case.index:06d}_{case.digest[:12]}.njoy"
+                with open(os.path.join(args.output_dir, filename), 'w') as f:
+                    f.write(case.deck)
+                    f.write("\n")
+                manifest.write(json.dumps({"file": filename, "sha256": case.digest,
+                                           "assignment": case.assignment}) + "\n")
+                written += 1
+        except (ValueError, LookupError) as e:
+            # e.g. an axis value naming an unknown isotope, found when its point renders
+            print(f"error: {e}", file=sys.stderr)
+            return 1
+
+    print(f"Wrote {written} distinct decks out of {sweep_size(axes)} sweep points to {args.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
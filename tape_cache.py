@@ -0,0 +1,330 @@
+# tape_cache.py
+
+"""
+Content-addressed cache of intermediate NJOY tapes.
+
+A chain is run one module at a time. Each stage is keyed by the sha256
+of its rendered cards and of the contents of the tapes it reads; if that
+key is cached, its output tapes are reused and NJOY is not started.
+Changing an ACER parameter therefore only re-runs ACER.
+
+Layout of the cache directory:
+    objects/ab/abcdef...   tape contents, named by their sha256
+    stages/<key>.json      {"outputs": {"21": "<sha256>", ...}}
+
+The NJOY executable is part of every key (a hash of the binary), so an
+upgraded or different build never reuses tapes made by another. Objects
+are stored read-only and final tapes are copied out of the store, so
+editing a result cannot corrupt the cache.
+
+Objects are evicted least recently used first once the cache grows past
+its size limit, together with the stage records that point at them; a
+stage whose objects were evicted is simply re-run.
+
+Usage:
+    python tape_cache.py workflow.jsonl --endf endf/U235.endf -o results \\
+        --cache-dir ~/.cache/njoygui/tapes --max-size 20G
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+from model import load_isotope_table, module_units
+from renderer import fan_out_materials, render_module
+from runner import DEFAULT_NJOY, NjoyJob, resolve_executable, run_job, tape_name
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "njoygui", "tapes"
+)
+DEFAULT_MAX_BYTES = 20 * 1024 ** 3
+
+SIZE_SUFFIXES = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+# Temporary files older than this were left by a killed process
+STALE_TMP_SECONDS = 3600
+
+# (path, size, mtime_ns) -> sha256 of an NJOY executable
+_executable_digests = {}
+
+
+def hash_file(filepath, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def njoy_identity(njoy):
+    """
+    Return a string identifying an NJOY executable by its contents.
+
+    The binary is hashed once per process for each (path, size, mtime).
+    An executable that cannot be found is identified by its name; the
+    stage then fails to run anyway.
+    """
+    path = shutil.which(resolve_executable(njoy))
+    try:
+        stat = os.stat(path)
+    except (TypeError, OSError):
+        return f"name:{njoy}"
+    stamp = (os.path.realpath(path), stat.st_size, stat.st_mtime_ns)
+    digest = _executable_digests.get(stamp)
+    if digest is None:
+        digest = _executable_digests[stamp] = hash_file(path)
+    return f"sha256:{digest}"
+
+
+def parse_size(text):
+    """Parse '500M', '20G' or a plain byte count."""
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in SIZE_SUFFIXES:
+        return int(float(text[:-1]) * SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+
+class TapeCache:
+    """Stage results stored by key, tape contents stored by hash."""
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.objects_dir = os.path.join(root, "objects")
+        self.stages_dir = os.path.join(root, "stages")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.stages_dir, exist_ok=True)
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def stage_path(self, key):
+        return os.path.join(self.stages_dir, f"{key}.json")
+
+    def lookup(self, key):
+        """Return {unit: (path, digest)} for a cached stage, or None."""
+        try:
+            with open(self.stage_path(key), 'r') as f:
+                outputs = json.load(f)["outputs"]
+        except (OSError, ValueError, KeyError):
+            return None
+        tapes = {}
+        for unit, digest in outputs.items():
+            path = self.object_path(digest)
+            if not os.path.isfile(path):
+                return None
+            tapes[int(unit)] = (path, digest)
+        # Mark the objects as recently used for eviction
+        for path, _ in tapes.values():
+            os.utime(path)
+        return tapes
+
+    def add_object(self, filepath):
+        """Move a tape into the store and return (path, digest)."""
+        digest = hash_file(filepath)
+        path = self.object_path(digest)
+        if os.path.isfile(path):
+            os.remove(filepath)
+            os.utime(path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            shutil.move(filepath, tmp_path)
+            # Read-only, as sandboxes may hardlink it as an input tape
+            os.chmod(tmp_path, 0o444)
+            os.replace(tmp_path, path)
+        return path, digest
+
+    def store(self, key, outputs):
+        """Store a stage's output tapes ({unit: file}) and return {unit: (path, digest)}."""
+        tapes = {unit: self.add_object(filepath) for unit, filepath in outputs.items()}
+        stage_path = self.stage_path(key)
+        tmp_path = f"{stage_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"outputs": {str(unit): digest for unit, (_, digest) in tapes.items()}}, f)
+        os.replace(tmp_path, stage_path)
+        return tapes
+
+    def size(self):
+        return sum(size for _, size, _ in self.iter_objects())
+
+    def iter_objects(self):
+        """Yield (path, size, mtime) of every stored object, removing stale temporary files."""
+        now = time.time()
+        for dirpath, _, filenames in os.walk(self.objects_dir):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if filename.endswith(".tmp"):
+                    # Another process may still be writing a recent one
+                    if now - stat.st_mtime > STALE_TMP_SECONDS:
+                        remove_file(path)
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def evict(self, keep=()):
+        """Delete least recently used objects until the cache fits; returns bytes freed."""
+        objects = sorted(self.iter_objects(), key=lambda item: item[2])
+        total = sum(size for _, size, _ in objects)
+        freed = 0
+        evicted = set()
+        for path, size, _ in objects:
+            if total - freed <= self.max_bytes:
+                break
+            if path in keep:
+                continue
+            remove_file(path)
+            evicted.add(os.path.basename(path))
+            freed += size
+        if evicted:
+            self.drop_stages(evicted)
+        return freed
+
+    def drop_stages(self, digests):
+        """Remove the stage records that reference any of the given object digests."""
+        now = time.time()
+        for filename in os.listdir(self.stages_dir):
+            path = os.path.join(self.stages_dir, filename)
+            if filename.endswith(".tmp"):
+                try:
+                    if now - os.stat(path).st_mtime > STALE_TMP_SECONDS:
+                        remove_file(path)
+                except OSError:
+                    pass
+                continue
+            try:
+                with open(path, 'r') as f:
+                    outputs = json.load(f)["outputs"]
+            except (OSError, ValueError, KeyError):
+                continue
+            if not digests.isdisjoint(outputs.values()):
+                remove_file(path)
+
+
+def remove_file(path):
+    """Remove a file that may be read-only, ignoring one already gone."""
+    try:
+        # Objects are read-only; Windows refuses to delete those
+        os.chmod(path, 0o644)
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def stage_key(block, input_digests, executable=""):
+    """Key of a stage: its rendered cards, the contents of its input tapes and the NJOY build."""
+    digest = hashlib.sha256(f"{executable}\n".encode())
+    digest.update("\n".join(block).encode())
+    for unit, tape_digest in sorted(input_digests.items()):
+        digest.update(f"\n{unit}:{tape_digest}".encode())
+    return digest.hexdigest()
+
+
+def run_chain_cached(modules, tapes, cache, njoy=DEFAULT_NJOY, work_root="work",
+                     results_dir="results", isotopes=None, log=print):
+    """
+    Run a chain stage by stage, reusing cached stages.
+
+    tapes maps external input units to files. Returns a dict with the
+    final tape of every unit written ({unit: path} under results_dir),
+    the number of stages run and reused, and the first error if a stage
+    failed.
+    """
+    isotopes = isotopes if isotopes is not None else load_isotope_table()
+    current = {abs(int(unit)): (path, hash_file(path)) for unit, path in tapes.items()}
+    executable = njoy_identity(njoy)
+    summary = {"outputs": {}, "ran": 0, "reused": 0, "error": None}
+    os.makedirs(results_dir, exist_ok=True)
+
+    for index, mod in enumerate(fan_out_materials(modules)):
+        block = render_module(mod, isotopes)
+        inputs = [abs(unit) for _, direction, unit in module_units(mod) if direction == "in"]
+        outputs = [abs(unit) for _, direction, unit in module_units(mod) if direction == "out"]
+        missing = [unit for unit in inputs if unit not in current]
+        if missing:
+            summary["error"] = f"{mod['name']} [{index}]: no tape for unit(s) {missing}"
+            break
+
+        key = stage_key(block, {unit: current[unit][1] for unit in inputs}, executable)
+        cached = cache.lookup(key)
+        if cached is not None and set(cached) == set(outputs):
+            log(f"{mod['name']} [{index}]: reused {key[:12]}")
+            summary["reused"] += 1
+            current.update(cached)
+            continue
+
+        name = f"{index:03d}_{mod['name'].lower()}"
+        deck = "\n".join(block + ["stop"])
+        job = NjoyJob(name, deck, {unit: current[unit][0] for unit in inputs})
+        result = run_job(job, njoy, work_root, os.path.join(results_dir, "stages"))
+        summary["ran"] += 1
+        produced = {unit: os.path.join(result["results_dir"], tape_name(unit)) for unit in outputs}
+        if result["error"] or result["returncode"] != 0 or not all(map(os.path.isfile, produced.values())):
+            summary["error"] = (f"{mod['name']} [{index}]: "
+                                f"{result['error'] or 'exit ' + str(result['returncode'])}")
+            break
+        log(f"{mod['name']} [{index}]: ran in {result['elapsed']:.1f} s, cached {key[:12]}")
+        current.update(cache.store(key, produced))
+
+    # Final tapes are copied out of the store: eviction cannot break them
+    # and editing them cannot change a cached object
+    written = set()
+    for mod in modules:
+        written.update(abs(unit) for _, direction, unit in module_units(mod) if direction == "out")
+    for unit in sorted(written & set(current)):
+        destination = os.path.join(results_dir, tape_name(unit))
+        if os.path.exists(destination):
+            os.remove(destination)
+        shutil.copyfile(current[unit][0], destination)
+        summary["outputs"][unit] = destination
+
+    cache.evict(keep={path for path, _ in current.values()})
+    return summary
+
+
+def main(argv=None):
+    from runner import parse_tape_option
+    from workflow import load_workflow
+
+    parser = argparse.ArgumentParser(description="Run a workflow with cached intermediate tapes.")
+    parser.add_argument("workflow", help="Workflow file")
+    parser.add_argument("--endf", help="ENDF tape staged for every external input unit")
+    parser.add_argument("--tape", action="append", default=[], metavar="UNIT=PATH",
+                        help="Stage PATH as a specific input unit (repeatable)")
+    parser.add_argument("--njoy", default=DEFAULT_NJOY, help="NJOY executable (default: $NJOY or 'njoy')")
+    parser.add_argument("-o", "--results-dir", default="results", help="Directory for the final tapes")
+    parser.add_argument("--work-dir", default="work", help="Directory for the stage sandboxes")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Tape cache directory")
+    parser.add_argument("--max-size", default="20G", help="Cache size limit, e.g. 500M or 20G")
+    args = parser.parse_args(argv)
+
+    modules = load_workflow(args.workflow)
+    tapes = {}
+    if args.endf:
+        # Every unit read before any module writes it is an external input
+        written = set()
+        for mod in fan_out_materials(modules):
+            for _, direction, unit in module_units(mod):
+                if direction == "in" and abs(unit) not in written:
+                    tapes[abs(unit)] = args.endf
+            written.update(abs(unit) for _, direction, unit in module_units(mod) if direction == "out")
+    tapes.update(parse_tape_option(value) for value in args.tape)
+
+    cache = TapeCache(args.cache_dir, parse_size(args.max_size))
+    summary = run_chain_cached(modules, tapes, cache, args.njoy, args.work_dir, args.results_dir)
+    print(f"{summary['ran']} stages run, {summary['reused']} reused")
+    if summary["error"]:
+        print(f"error: {summary['error']}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
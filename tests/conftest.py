@@ -0,0 +1,14 @@
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+
+
+@pytest.fixture
+def stub_njoy():
+    """Path of the stand-in NJOY executable (see tests/stub_njoy)."""
+    return os.path.join(TESTS_DIR, "stub_njoy")
@@ -0,0 +1,80 @@
+# tests/test_ace_tools.py
+import os
+
+import pytest
+
+from ace_tools import (
+    BOLTZMANN_MEV, expected_tables, main, read_ace_header, scan_ace_files, validate_tables, xsdir_text
+)
+from model import create_module, load_isotope_table
+
+
+def write_ace(path, zaid="92235.00c", temperature=293.6, nxs1=40, xss_written=None, ptable=False):
+    """Write a type-1 ACE table with the header layout and XSS format NJOY uses."""
+    lines = [
+        f"{zaid:>10}{233.0248:12.6f} {temperature * BOLTZMANN_MEV:11.4E} {'10/18/26':>10}",
+        f"{'U235 @ %g K ACE data' % temperature:<70}{'   mat9228':10}",
+    ]
+    lines += ["".join(f"{0:7d}{0.0:11.0f}" for _ in range(4))] * 4
+    nxs = [nxs1, 92235] + [0] * 14
+    jxs = [1] + [0] * 31
+    if ptable:
+        jxs[22] = 17
+    for values in (nxs, jxs):
+        lines += ["".join(f"{v:9d}" for v in values[i:i + 8]) for i in range(0, len(values), 8)]
+    count = nxs1 if xss_written is None else xss_written
+    lines += ["".join(f"{1.0 + j:20.11E}" for j in range(i, min(i + 4, count)))
+              for i in range(0, count, 4)]
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+@pytest.mark.parametrize("nxs1", [8, 9, 10, 11])
+def test_complete_table_any_length(tmp_path, nxs1):
+    header = read_ace_header(write_ace(tmp_path / "t.ace", nxs1=nxs1))
+    assert header["complete"]
+    assert header["nxs"][0] == nxs1
+    assert header["zaid"] == "92235.00c"
+
+
+@pytest.mark.parametrize("nxs1", [10, 11, 12])
+def test_truncated_table(tmp_path, nxs1):
+    header = read_ace_header(write_ace(tmp_path / "t.ace", nxs1=nxs1, xss_written=nxs1 - 4))
+    assert not header["complete"]
+
+
+def test_validate_against_workflow(tmp_path):
+    write_ace(tmp_path / "a.ace", "92235.80c", 600.0, nxs1=10)
+    write_ace(tmp_path / "b.ace", "92235.80c", 900.0, nxs1=11)
+    write_ace(tmp_path / "c.ace", "26056.80c", 600.0, nxs1=9)
+    tables, errors = scan_ace_files([str(tmp_path)])
+    assert errors == []
+    modules = [create_module("ACER", {"matd": "U235", "tempd": 600.0, "suff": 0.8})]
+    expected = expected_tables(modules, load_isotope_table())
+
+    problems = validate_tables(tables, expected)
+    messages = {}
+    for path, message in problems:
+        messages.setdefault(os.path.basename(path) if path else None, []).append(message)
+    assert set(messages) == {"b.ace", "c.ace"}
+    assert "duplicate ZAID 92235.80c" in messages["b.ace"][0]
+    assert "900.0 K" in messages["b.ace"][1]
+    assert messages["c.ace"] == ["ZAID 26056.80c is not produced by the workflow"]
+
+
+def test_xsdir(tmp_path):
+    write_ace(tmp_path / "u.ace", "92235.00c", nxs1=11, ptable=True)
+    tables, _ = scan_ace_files([str(tmp_path)])
+    lines = xsdir_text(tables, str(tmp_path)).splitlines()
+    assert lines[0] == "atomic weight ratios"
+    entry = lines[lines.index("directory") + 1].split()
+    assert entry[:3] == ["92235.00c", "233.024800", "u.ace"]
+    assert entry[6] == "11"
+    assert entry[-1] == "ptable"
+
+
+def test_main_rejects_bad_temperatures(tmp_path, capsys):
+    with pytest.raises(SystemExit) as info:
+        main([str(tmp_path), "-w", "workflow.jsonl", "--isotopes", "U235", "--temperatures", "600", "hot"])
+    assert info.value.code == 2
+    assert "invalid temperatures: hot" in capsys.readouterr().err
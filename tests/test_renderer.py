@@ -0,0 +1,32 @@
+# tests/test_renderer.py
+from model import create_module, load_isotope_table
+from renderer import RenderCache, fan_out_materials, render_deck
+
+
+def chain():
+    return [create_module("MODER"), create_module("RECONR"), create_module("ACER")]
+
+
+def test_cache_matches_render_deck_after_in_place_edits():
+    modules = chain()
+    isotopes = load_isotope_table()
+    cache = RenderCache()
+    assert cache.render_deck(modules, isotopes) == render_deck(modules, isotopes)
+
+    modules[2]["parameters"]["suff"] = 0.8
+    modules[2]["parameters"]["matd"] = "Pu239"
+    deck = cache.render_deck(modules, isotopes)
+    assert deck == render_deck(modules, isotopes)
+    assert "0.80 /" in deck
+
+    misses = cache.misses
+    cache.render_deck(modules, isotopes)
+    assert cache.misses == misses
+
+
+def test_fan_out_repeats_tail_per_material():
+    modules = chain()
+    modules[2]["parameters"]["matd"] = ["U235", "Pu239"]
+    expanded = fan_out_materials(modules)
+    assert [mod["name"] for mod in expanded] == ["MODER", "RECONR", "ACER", "ACER"]
+    assert [mod["parameters"]["matd"] for mod in expanded[2:]] == ["U235", "Pu239"]
@@ -0,0 +1,99 @@
+# tests/test_runner.py
+import os
+
+import pytest
+
+from runner import NjoyJob, deck_tape_units, main, run_job, run_jobs
+
+DECK = """moder
+20 -21 /
+reconr
+-21 -22 /
+'pendf tape' /
+9228 0 0 /
+0.001 /
+0 /
+stop
+"""
+
+
+def write_endf(tmp_path):
+    endf = tmp_path / "U235.endf"
+    endf.write_bytes(b"endf data\n")
+    return str(endf)
+
+
+def test_deck_tape_units():
+    assert deck_tape_units(DECK) == ([20], [21, 22])
+
+
+def test_run_job_stages_and_harvests(tmp_path, stub_njoy):
+    job = NjoyJob("case", DECK, write_endf(tmp_path))
+    result = run_job(job, stub_njoy, str(tmp_path / "work"), str(tmp_path / "results"))
+
+    assert result["error"] is None
+    assert result["returncode"] == 0
+    names = sorted(os.path.basename(path) for path in result["outputs"])
+    assert names == ["output", "stdout", "tape21", "tape22"]
+    assert (tmp_path / "results" / "case" / "tape22").read_bytes().startswith(b"endf data\n")
+    assert not (tmp_path / "work" / "case").exists()
+
+
+def test_run_job_relative_njoy_path(tmp_path, stub_njoy, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    njoy = os.path.relpath(stub_njoy)
+    assert os.sep in njoy
+    result = run_job(NjoyJob("case", DECK, write_endf(tmp_path)), njoy, "work", "results")
+
+    assert result["error"] is None
+    assert result["returncode"] == 0
+
+
+def test_run_job_missing_tape(tmp_path, stub_njoy):
+    job = NjoyJob("case", DECK, {})
+    result = run_job(job, stub_njoy, str(tmp_path / "work"), str(tmp_path / "results"))
+
+    assert "no input tape for unit 20" in result["error"]
+    assert result["returncode"] is None
+    assert result["outputs"] == []
+
+
+def test_run_job_nonzero_exit(tmp_path, stub_njoy, monkeypatch):
+    monkeypatch.setenv("NJOY_STUB_EXIT", "3")
+    job = NjoyJob("case", DECK, write_endf(tmp_path))
+    result = run_job(job, stub_njoy, str(tmp_path / "work"), str(tmp_path / "results"))
+
+    assert result["error"] is None
+    assert result["returncode"] == 3
+    # Whatever NJOY left behind is still harvested for inspection
+    assert any(path.endswith("stdout") for path in result["outputs"])
+
+
+def test_run_jobs(tmp_path, stub_njoy):
+    endf = write_endf(tmp_path)
+    jobs = [NjoyJob(f"case{i}", DECK, endf) for i in range(5)]
+    results = list(run_jobs(jobs, stub_njoy, str(tmp_path / "work"), str(tmp_path / "results"),
+                            processes=2))
+
+    assert sorted(result["name"] for result in results) == [f"case{i}" for i in range(5)]
+    assert all(result["returncode"] == 0 and result["error"] is None for result in results)
+
+
+def test_run_jobs_rejects_duplicate_names(tmp_path, stub_njoy):
+    endf = write_endf(tmp_path)
+    jobs = [NjoyJob("case", DECK, endf), NjoyJob("case", DECK, endf)]
+    with pytest.raises(ValueError):
+        list(run_jobs(jobs, stub_njoy, str(tmp_path / "work"), str(tmp_path / "results")))
+
+
+def test_main_keeps_decks_with_the_same_stem_apart(tmp_path, stub_njoy):
+    endf = write_endf(tmp_path)
+    for directory in ("a", "b"):
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / "U235.njoy").write_text(DECK)
+    results = tmp_path / "results"
+    assert main([str(tmp_path / "a" / "U235.njoy"), str(tmp_path / "b" / "U235.njoy"),
+                 "--endf", endf, "--njoy", stub_njoy, "-o", str(results),
+                 "--work-dir", str(tmp_path / "work")]) == 0
+    names = sorted(os.listdir(results))
+    assert len(names) == 2 and all(name.startswith("U235_") for name in names)
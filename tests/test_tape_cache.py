@@ -0,0 +1,101 @@
+# tests/test_tape_cache.py
+import os
+import stat
+
+import pytest
+
+from model import create_module
+from tape_cache import TapeCache, njoy_identity, run_chain_cached
+
+
+def chain(**acer):
+    return [create_module("MODER"), create_module("RECONR"), create_module("BROADR"),
+            create_module("ACER", acer)]
+
+
+@pytest.fixture
+def setup(tmp_path, stub_njoy, monkeypatch):
+    endf = tmp_path / "U235.endf"
+    endf.write_bytes(b"endf data\n")
+    log = tmp_path / "njoy.log"
+    monkeypatch.setenv("NJOY_STUB_LOG", str(log))
+    cache = TapeCache(str(tmp_path / "cache"))
+
+    def run(modules, njoy=stub_njoy, results="results"):
+        log.write_text("")
+        summary = run_chain_cached(modules, {20: str(endf)}, cache, njoy, str(tmp_path / "work"),
+                                   str(tmp_path / results), log=lambda line: None)
+        assert summary["error"] is None
+        return summary, log.read_text().split()
+
+    return run
+
+
+def test_run_reuse_and_acer_only_change(setup):
+    summary, ran = setup(chain())
+    assert (summary["ran"], summary["reused"]) == (4, 0)
+    assert ran == ["moder", "reconr", "broadr", "acer"]
+
+    summary, ran = setup(chain())
+    assert (summary["ran"], summary["reused"]) == (0, 4)
+    assert ran == []
+
+    summary, ran = setup(chain(suff=0.8))
+    assert (summary["ran"], summary["reused"]) == (1, 3)
+    assert ran == ["acer"]
+
+
+def test_final_tapes_are_copies(setup, tmp_path):
+    summary, _ = setup(chain())
+    ace = summary["outputs"][70]
+    original = open(ace, 'rb').read()
+    with open(ace, 'ab') as f:
+        f.write(b"edited by hand\n")
+
+    summary, ran = setup(chain(), results="again")
+    assert ran == []
+    assert open(summary["outputs"][70], 'rb').read() == original
+
+    for dirpath, _, filenames in os.walk(tmp_path / "cache" / "objects"):
+        for filename in filenames:
+            mode = os.stat(os.path.join(dirpath, filename)).st_mode
+            assert not mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+
+
+def test_other_njoy_build_reruns(setup, stub_njoy, tmp_path):
+    setup(chain())
+    # A different executable that behaves the same
+    other = tmp_path / "njoy-other"
+    other.write_text(f"#!/bin/sh\nexec {stub_njoy} \"$@\"\n")
+    os.chmod(other, 0o755)
+    assert njoy_identity(str(other)) != njoy_identity(stub_njoy)
+
+    summary, ran = setup(chain(), njoy=str(other))
+    assert (summary["ran"], summary["reused"]) == (4, 0)
+
+
+def test_evict_drops_stage_records(setup, tmp_path):
+    setup(chain())
+    cache = TapeCache(str(tmp_path / "cache"), max_bytes=0)
+    stages = tmp_path / "cache" / "stages"
+    assert len(os.listdir(stages)) == 4
+
+    assert cache.evict() > 0
+    assert list(cache.iter_objects()) == []
+    assert os.listdir(stages) == []
+
+
+def test_iter_objects_skips_temporary_files(tmp_path):
+    cache = TapeCache(str(tmp_path / "cache"))
+    directory = tmp_path / "cache" / "objects" / "ab"
+    directory.mkdir()
+    stale = directory / "abcd.123.tmp"
+    fresh = directory / "abcd.456.tmp"
+    for path in (stale, fresh):
+        path.write_bytes(b"partial tape")
+    os.chmod(stale, 0o444)
+    os.utime(stale, (0, 0))
+
+    assert list(cache.iter_objects()) == []
+    assert not stale.exists()
+    assert fresh.exists()
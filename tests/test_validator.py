@@ -0,0 +1,34 @@
+# tests/test_validator.py
+from model import create_module
+from validator import BatchValidator, validate_workflows
+
+
+def chain(**acer):
+    return [create_module("MODER"), create_module("ACER", acer)]
+
+
+def test_valid_workflow():
+    assert validate_workflows([chain()]) == []
+
+
+def test_reports_every_violation():
+    violations = validate_workflows([chain(suff=1.5, tempd=-10.0, matd="Xx999", iopt="9")])
+    found = {(v.workflow, v.position, v.module, v.parameter) for v in violations}
+    assert found == {(0, 1, "ACER", "suff"), (0, 1, "ACER", "tempd"),
+                     (0, 1, "ACER", "matd"), (0, 1, "ACER", "iopt")}
+
+
+def test_shared_modules_reported_per_workflow():
+    bad = create_module("ACER", {"tempd": -1.0})
+    violations = validate_workflows([[create_module("MODER"), bad], [bad], chain()])
+    assert sorted((v.workflow, v.position) for v in violations) == [(0, 1), (1, 0)]
+
+
+def test_module_edited_in_place_is_checked_again():
+    modules = chain()
+    validator = BatchValidator()
+    validator.add_workflow("before", modules)
+    modules[1]["parameters"]["tempd"] = -5.0
+    validator.add_workflow("after", modules)
+    violations = validator.violations()
+    assert [(v.workflow, v.parameter, v.value) for v in violations] == [("after", "tempd", -5.0)]
@@ -0,0 +1,38 @@
+# tests/test_workflow.py
+import pytest
+
+from model import create_module
+from workflow import load_workflow, read_workflow, save_workflow
+
+
+def sample_modules():
+    return [
+        create_module("MODER"),
+        create_module("RECONR", {"mat": "Pu239", "err": 0.002}),
+        create_module("ACER", {"matd": "Pu239", "tempd": 600.0, "suff": 0.8}),
+    ]
+
+
+@pytest.mark.parametrize("filename", ["chain.jsonl", "chain.jsonl.gz"])
+def test_round_trip(tmp_path, filename):
+    modules = sample_modules()
+    path = str(tmp_path / filename)
+    save_workflow(path, modules, sweep=[{"targets": ["ACER.tempd"], "values": [300, 600]}])
+
+    header, loaded = read_workflow(path)
+    assert header["sweep"] == [{"targets": ["ACER.tempd"], "values": [300, 600]}]
+    assert [mod["name"] for mod in loaded] == ["MODER", "RECONR", "ACER"]
+    assert [mod["parameters"] for mod in loaded] == [mod["parameters"] for mod in modules]
+    assert [mod["parameters"] for mod in load_workflow(path)] == [mod["parameters"] for mod in modules]
+
+
+def test_gzip_by_extension(tmp_path):
+    path = tmp_path / "chain.jsonl.gz"
+    save_workflow(str(path), sample_modules())
+    assert path.read_bytes()[:2] == b"\x1f\x8b"
+
+
+def test_only_changed_parameters_are_stored(tmp_path):
+    path = tmp_path / "chain.jsonl"
+    save_workflow(str(path), [create_module("MODER")])
+    assert '"parameters": {}' in path.read_text().splitlines()[1]
@@ -0,0 +1,200 @@
+# tracing.py
+
+"""
+Lightweight timing spans for the hot paths, exportable as Chrome
+trace-event JSON (open in chrome://tracing or https://ui.perfetto.dev).
+
+    from tracing import span
+
+    with span("render_deck", "render", modules=len(modules)):
+        ...
+
+Collection is off by default and toggled at runtime with
+tracer.enable() / tracer.disable() (or NJOYGUI_TRACE=1 at startup).
+While off, span() returns one shared no-op context manager, so an
+instrumented call costs an attribute check and nothing is recorded.
+
+Usage:
+    NJOYGUI_TRACE=trace.json python batch.py ...   # export when the process exits
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+
+TRACE_ENV = "NJOYGUI_TRACE"
+DEFAULT_MAX_EVENTS = 200000
+
+
+class _NullSpan:
+    """Shared do-nothing span handed out while tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """One timed region; recorded by its tracer when the block exits."""
+
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.record(self.name, self.category, self.start, end - self.start, self.args)
+        return False
+
+    def set(self, **args):
+        """Attach arguments known only inside the block (cache hit, sizes...)."""
+        self.args.update(args)
+
+
+class Tracer:
+    """
+    Collects completed spans in a bounded buffer.
+
+    Events are (name, category, start ns, duration ns, thread id, args)
+    tuples; the oldest are dropped once max_events is reached.
+    """
+
+    def __init__(self, max_events=DEFAULT_MAX_EVENTS):
+        self.enabled = False
+        self.events = deque(maxlen=max_events)
+        self.origin = time.perf_counter_ns()
+        self.pid = os.getpid()
+        # deque.append is atomic; the lock only guards snapshots against clear()
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        with self._lock:
+            self.events.clear()
+
+    def span(self, name, category="app", **args):
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, category, args)
+
+    def traced(self, name=None, category="app"):
+        """Decorator wrapping every call of a function in a span."""
+        def decorate(func):
+            label = name or func.__qualname__
+
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with Span(self, label, category, {}):
+                    return func(*args, **kwargs)
+
+            wrapper.__name__ = func.__name__
+            wrapper.__qualname__ = func.__qualname__
+            wrapper.__doc__ = func.__doc__
+            wrapper.__wrapped__ = func
+            return wrapper
+        return decorate
+
+    def record(self, name, category, start_ns, duration_ns, args=None):
+        self.events.append((name, category, start_ns, duration_ns, threading.get_native_id(), args))
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.events)
+
+    def summary(self):
+        """
+        Return per-span totals, slowest total first.
+
+        Each row is {"name", "category", "count", "total_ms", "mean_ms", "max_ms"}.
+        """
+        totals = {}
+        for name, category, _, duration, _, _ in self.snapshot():
+            row = totals.get((name, category))
+            if row is None:
+                row = totals[(name, category)] = [0, 0, 0]
+            row[0] += 1
+            row[1] += duration
+            if duration > row[2]:
+                row[2] = duration
+        rows = [
+            {"name": name, "category": category, "count": count,
+             "total_ms": total / 1e6, "mean_ms": total / count / 1e6, "max_ms": longest / 1e6}
+            for (name, category), (count, total, longest) in totals.items()
+        ]
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def chrome_events(self):
+        """Return the spans as Chrome "complete" (ph "X") trace events."""
+        events = []
+        for name, category, start, duration, tid, args in self.snapshot():
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self.origin) / 1000,
+                "dur": duration / 1000,
+                "pid": self.pid,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = {key: value if isinstance(value, (int, float, bool)) else str(value)
+                                 for key, value in args.items()}
+            events.append(event)
+        return events
+
+    def export_chrome(self, filepath):
+        """Write a Chrome trace-event JSON file; returns the number of events."""
+        events = self.chrome_events()
+        with open(filepath, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+
+# Process-wide tracer used by every instrumented module
+tracer = Tracer()
+span = tracer.span
+traced = tracer.traced
+
+
+def _enable_from_environment():
+    value = os.environ.get(TRACE_ENV, "")
+    if not value or value == "0":
+        return
+    tracer.enable()
+    # Any value other than a plain switch names the file to export on exit
+    if value.lower() not in ("1", "true", "yes", "on"):
+        atexit.register(tracer.export_chrome, value)
+
+
+_enable_from_environment()
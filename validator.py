@@ -0,0 +1,320 @@
+# validator.py
+
+"""
+Headless batch validation of workflows against the constraints in
+modules/*.json.
+
+Values are gathered column by column, one column per module parameter,
+into flat arrays. Each column is checked with a single min()/max() pass
+and only scanned value by value when a bound is actually crossed. Module
+dicts shared between workflows (as in a sweep, where unswept modules are
+shared) are gathered once. Every violation is reported, not just the
+first.
+
+Usage:
+    python validator.py workflows/*.jsonl [--sweep] [--json]
+"""
+
+import argparse
+import itertools
+import json
+import sys
+from array import array
+from operator import itemgetter
+
+from model import isotope_list, load_isotope_table, parameter_index
+
+NUMERIC_TYPES = ("int", "float", "multi")
+
+_name = itemgetter("name")
+_cards = itemgetter("cards")
+_parameters = itemgetter("parameters")
+
+
+class Violation:
+    """One constraint violation of one parameter of one module."""
+
+    __slots__ = ("workflow", "position", "module", "parameter", "value", "message")
+
+    def __init__(self, workflow, position, module, parameter, value, message):
+        self.workflow = workflow
+        self.position = position
+        self.module = module
+        self.parameter = parameter
+        self.value = value
+        self.message = message
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __str__(self):
+        return f"workflow {self.workflow}: {self.module}[{self.position}].{self.parameter}: {self.message}"
+
+
+class Column:
+    """Numeric values of one parameter across every gathered module."""
+
+    __slots__ = ("spec", "values", "owners")
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.values = array('d')
+        # Gathered-module slot of each value
+        self.owners = array('i')
+
+
+class BatchValidator:
+    """
+    Gathers modules from many workflows, then checks them all at once.
+
+    Call add_workflow for every workflow, then violations() once.
+    """
+
+    def __init__(self, isotopes=None):
+        self.isotopes = isotopes if isotopes is not None else load_isotope_table()
+        self.columns = {}
+        self.plans = {}
+        # Distinct module contents, indexed by slot
+        self.modules = []
+        # (name, id(cards), parameter names, parameter values) -> slot
+        self.contents = {}
+        # Module slots of every workflow, in chain order
+        self.workflow_ids = []
+        self.workflow_slots = []
+        # Non-numeric findings made while gathering: slot -> [(parameter, value, message)]
+        self.problems = {}
+        self.symbols = []
+        self.symbol_owners = []
+
+    def problem(self, slot, p_name, value, message):
+        self.problems.setdefault(slot, []).append((p_name, value, message))
+
+    def add_workflow(self, workflow_id, modules):
+        """
+        Add one workflow (a list of module dicts).
+
+        Modules are looked up by content, never by identity, so dicts that
+        are edited in place between calls (as the GUI edits its chain) are
+        checked as they are now. The keys are built and looked up with
+        map()/zip() over the whole chain, without a Python-level call per
+        module; only modules with new contents are gathered.
+        """
+        try:
+            parameters = list(map(_parameters, modules))
+            keys = list(zip(map(_name, modules), map(id, map(_cards, modules)),
+                            map(tuple, parameters), map(tuple, map(dict.values, parameters))))
+            slots = list(map(self.contents.get, keys))
+        except (KeyError, TypeError):
+            # No cards, or unhashable values (material lists): key each module alone
+            keys = [None] * len(modules)
+            slots = keys[:]
+        if None in slots:
+            for position, slot in enumerate(slots):
+                if slot is None:
+                    slots[position] = self.content_slot(modules[position], keys[position])
+        self.workflow_ids.append(workflow_id)
+        self.workflow_slots.append(slots)
+
+    def content_slot(self, mod, key=None):
+        """
+        Return the slot of a module not found by its key, gathering it if new.
+
+        Equal modules from different files (every MODER 20 -30 of an
+        imported archive) share one slot and are gathered once.
+        """
+        try:
+            if key is None:
+                p = mod["parameters"]
+                key = (mod["name"], id(mod.get("cards")), tuple(p), tuple(p.values()))
+            slot = self.contents.get(key)
+        except TypeError:
+            # Unhashable values (material lists); gather this module on its own
+            key = None
+            slot = None
+        if slot is None:
+            slot = len(self.modules)
+            self.modules.append(mod)
+            if key is not None:
+                self.contents[key] = slot
+            self.gather(slot, mod)
+        return slot
+
+    def plan(self, mod):
+        """
+        Return the (parameter, spec, column) checks for a module's schema.
+
+        Plans are built once per schema, so gathering a module does no
+        index lookups or type dispatch beyond its own values.
+        """
+        cards = mod.get("cards")
+        key = (mod["name"], id(cards))
+        plan = self.plans.get(key)
+        if plan is None:
+            plan = []
+            for p_name, spec in parameter_index(mod["name"], cards).items():
+                if spec.type == "auto":
+                    continue
+                column = None
+                if spec.type in NUMERIC_TYPES and (spec.min is not None or spec.max is not None
+                                                   or spec.type == "int"):
+                    column = self.columns.get(spec)
+                    if column is None:
+                        column = self.columns[spec] = Column(spec)
+                elif spec.type in NUMERIC_TYPES:
+                    continue
+                plan.append((p_name, spec, column))
+            # Keep the cards alive so their id is not reused by another schema
+            self.plans[key] = plan = (cards, plan)
+        return plan[1]
+
+    def gather(self, slot, mod):
+        parameters = mod["parameters"]
+        for p_name, spec, column in self.plan(mod):
+            value = parameters.get(p_name)
+            if value is None or value == "":
+                if spec.mandatory and not spec.has_default:
+                    self.problem(slot, p_name, value, f"{p_name} is required")
+                continue
+
+            if column is not None:
+                if spec.type == "multi":
+                    tokens = str(value).split()
+                elif isinstance(value, (int, float)):
+                    # Common case: already a number from the workflow file
+                    if spec.type == "int" and isinstance(value, float) and not value.is_integer():
+                        self.problem(slot, p_name, value, f"{p_name} must be an integer")
+                        continue
+                    column.values.append(value)
+                    column.owners.append(slot)
+                    continue
+                else:
+                    tokens = (value,)
+                for token in tokens:
+                    try:
+                        number = float(token)
+                    except (TypeError, ValueError):
+                        self.problem(slot, p_name, value, f"{p_name} is not a number: {token!r}")
+                        continue
+                    if spec.type == "int" and not number.is_integer():
+                        self.problem(slot, p_name, value, f"{p_name} must be an integer")
+                        continue
+                    column.values.append(number)
+                    column.owners.append(slot)
+
+            elif spec.type == "isotope":
+                for symbol in isotope_list(value):
+                    self.symbols.append(symbol)
+                    self.symbol_owners.append((slot, p_name))
+
+            elif spec.type == "option":
+                if spec.options and str(value) not in spec.options:
+                    self.problem(slot, p_name, value,
+                                 f"{p_name} must be one of {', '.join(spec.options)}")
+
+    def check_columns(self):
+        for column in self.columns.values():
+            spec = column.spec
+            values = column.values
+            if not values:
+                continue
+            # Fast path: one C-level pass per bound; scan only when crossed
+            low = spec.min is not None and min(values) < spec.min
+            high = spec.max is not None and max(values) > spec.max
+            if not (low or high):
+                continue
+            for value, slot in zip(values, column.owners):
+                message = spec.check_range(value)
+                if message:
+                    self.problem(slot, spec.name, value, message)
+
+    def check_isotopes(self):
+        _, unknown = self.isotopes.resolve(self.symbols)
+        if not unknown:
+            return
+        unknown = set(unknown)
+        for symbol, (slot, p_name) in zip(self.symbols, self.symbol_owners):
+            if symbol in unknown:
+                self.problem(slot, p_name, symbol, f"unknown isotope '{symbol}'")
+
+    def violations(self):
+        """Check everything gathered and return the list of Violations."""
+        self.check_columns()
+        self.check_isotopes()
+        if not self.problems:
+            return []
+
+        problems = self.problems
+        report = []
+        for workflow_id, slots in zip(self.workflow_ids, self.workflow_slots):
+            if problems.keys().isdisjoint(slots):
+                continue
+            for position, slot in enumerate(slots):
+                found = problems.get(slot)
+                if found:
+                    name = self.modules[slot]["name"]
+                    for p_name, value, message in found:
+                        report.append(Violation(workflow_id, position, name, p_name, value, message))
+        return report
+
+
+def validate_workflows(workflows, isotopes=None):
+    """
+    Validate an iterable of workflows (module lists) in one batch.
+
+    Workflows are identified by their position in the iterable. Returns
+    the list of Violations, empty when everything is valid.
+    """
+    validator = BatchValidator(isotopes)
+    for workflow_id, modules in enumerate(workflows):
+        validator.add_workflow(workflow_id, modules)
+    return validator.violations()
+
+
+def iter_sweep_workflows(modules, axes):
+    """Yield (assignment, modules) for every point of a sweep, without rendering."""
+    from sweep import apply_assignment
+
+    for choice in itertools.product(*(range(len(axis)) for axis in axes)):
+        case_modules, assignment = apply_assignment(modules, axes, choice)
+        yield assignment, case_modules
+
+
+def main(argv=None):
+    from sweep import load_sweep
+    from workflow import load_workflow
+
+    parser = argparse.ArgumentParser(description="Validate workflows against the module constraints.")
+    parser.add_argument("workflows", nargs="+", help="Workflow files")
+    parser.add_argument("--sweep", action="store_true",
+                        help="Validate every point of each workflow's sweep")
+    parser.add_argument("--json", action="store_true", help="Print violations as JSON lines")
+    args = parser.parse_args(argv)
+
+    validator = BatchValidator()
+    labels = []
+    for filepath in args.workflows:
+        if args.sweep:
+            modules, axes = load_sweep(filepath)
+            if axes:
+                for assignment, case_modules in iter_sweep_workflows(modules, axes):
+                    validator.add_workflow(len(labels), case_modules)
+                    labels.append(f"{filepath} {json.dumps(assignment)}")
+                continue
+        validator.add_workflow(len(labels), load_workflow(filepath))
+        labels.append(filepath)
+
+    violations = validator.violations()
+    for violation in violations:
+        if args.json:
+            record = violation.as_dict()
+            record["workflow"] = labels[violation.workflow]
+            print(json.dumps(record, default=str))
+        else:
+            print(f"{labels[violation.workflow]}: {violation.module}[{violation.position}]."
+                  f"{violation.parameter}: {violation.message}")
+    print(f"{len(labels)} workflows checked, {len(violations)} violations", file=sys.stderr)
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
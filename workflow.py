@@ -0,0 +1,172 @@
+# workflow.py
+
+"""
+Reading and writing workflow files.
+
+The compact format is JSON Lines, optionally gzip-compressed:
+
+    {"format": "njoygui-workflow", "version": 1, ...}
+    {"name": "RECONR", "schema": "3f2a9c0d1b4e", "parameters": {"mat": "U238"}}
+    ...
+
+The first line is a header; any extra keys in it (e.g. "sweep") are kept.
+Every following line is one module holding only the parameters that
+differ from the module defaults, plus the hash of the cards it was saved
+against. Files are read one line at a time, and loaded modules share the
+registry's cards and description instead of carrying their own copies.
+
+Legacy files written by earlier versions ({"modules": [...]} with the
+full schema in every module) are still read.
+"""
+
+import gzip
+import json
+
+from fileio import atomic_open
+from model import create_module, default_parameters, load_module
+from tracing import span
+
+FORMAT = "njoygui-workflow"
+VERSION = 1
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Extensions offered by the GUI file dialogs
+FILE_FILTER = "Workflow Files (*.jsonl *.jsonl.gz *.json);;All Files (*.*)"
+
+
+class WorkflowFormatError(ValueError):
+    """Raised when a file is not a workflow this version can read."""
+
+
+def is_gzip(filepath):
+    with open(filepath, 'rb') as f:
+        return f.read(2) == GZIP_MAGIC
+
+
+def open_text(filepath, mode='r', compress=False):
+    """Open a workflow file as text, transparently handling gzip."""
+    if 'r' in mode:
+        compress = is_gzip(filepath)
+    if compress:
+        return gzip.open(filepath, mode + 't', encoding='utf-8')
+    return open(filepath, mode, encoding='utf-8')
+
+
+def parameter_delta(mod):
+    """Return the parameters of a module dict that differ from its defaults."""
+    defaults = default_parameters(load_module(mod["name"]))
+    return {
+        p_name: value
+        for p_name, value in mod["parameters"].items()
+        if p_name not in defaults or defaults[p_name] != value
+    }
+
+
+def compact_module(mod):
+    return {
+        "name": mod["name"],
+        "schema": load_module(mod["name"]).schema_version,
+        "parameters": parameter_delta(mod),
+    }
+
+
+def link_module(record, warnings=None):
+    """
+    Rebuild a full module dict from a saved record.
+
+    The result shares the registry's cards; a record saved against other
+    cards is still loaded, with a note appended to warnings.
+    """
+    mod = create_module(record["name"], record.get("parameters"))
+    saved_version = record.get("schema")
+    if warnings is not None and saved_version:
+        current_version = load_module(record["name"]).schema_version
+        if saved_version != current_version:
+            warnings.append(f"{mod['name']}: saved against schema {saved_version}, "
+                            f"now {current_version}")
+    return mod
+
+
+def save_workflow(filepath, modules, compress=None, progress=None, **header):
+    """
+    Write modules in the compact format.
+
+    compress defaults to gzip for names ending in '.gz'. Extra keyword
+    arguments are stored in the header line. The file is written
+    atomically; progress(done, total) is called after each module and
+    may raise fileio.OperationCancelled to abandon the save.
+    """
+    if compress is None:
+        compress = filepath.endswith(".gz")
+    total = len(modules)
+    with span("save_workflow", "io", modules=total), atomic_open(filepath, compress) as f:
+        f.write(json.dumps({"format": FORMAT, "version": VERSION, **header}) + "\n")
+        for done, mod in enumerate(modules, 1):
+            f.write(json.dumps(compact_module(mod)) + "\n")
+            if progress is not None:
+                progress(done, total)
+
+
+def iter_records(f):
+    """
+    Yield the header dict, then one record per module, from an open file.
+
+    Compact files are streamed line by line; legacy files are parsed whole.
+    """
+    first_line = f.readline()
+    try:
+        first = json.loads(first_line)
+    except json.JSONDecodeError:
+        first = None
+
+    if isinstance(first, dict) and first.get("format") == FORMAT:
+        if first.get("version", 0) > VERSION:
+            raise WorkflowFormatError(f"workflow format version {first['version']} is newer "
+                                      f"than this program supports ({VERSION})")
+        yield first
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+        return
+
+    # Legacy {"modules": [...]} document, possibly spread over many lines
+    if first is None:
+        first = json.loads(first_line + f.read())
+    if not isinstance(first, dict) or "modules" not in first:
+        raise WorkflowFormatError("not a workflow file")
+    modules = first.pop("modules")
+    yield first
+    for mod in modules:
+        yield mod
+
+
+def iter_workflow(filepath, warnings=None, progress=None):
+    """
+    Yield the linked module dicts of a workflow file one at a time.
+
+    progress(done, None) is called after each module; the total is not
+    known while streaming.
+    """
+    with open_text(filepath) as f:
+        records = iter_records(f)
+        next(records)
+        for done, record in enumerate(records, 1):
+            yield link_module(record, warnings)
+            if progress is not None:
+                progress(done, None)
+
+
+def read_workflow(filepath, warnings=None):
+    """Return (header, modules) for a workflow file."""
+    with span("read_workflow", "io"), open_text(filepath) as f:
+        records = iter_records(f)
+        header = next(records)
+        modules = [link_module(record, warnings) for record in records]
+    return header, modules
+
+
+def load_workflow(filepath, warnings=None, progress=None):
+    """Return the module list of a workflow file in either format."""
+    with span("load_workflow", "io"):
+        return list(iter_workflow(filepath, warnings, progress))